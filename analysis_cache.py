@@ -0,0 +1,84 @@
+"""
+Analysis Cache
+
+Keeps the parsed resume, analyzed JD and computed stages of recent
+/api/analyze calls, so callers that asked for a few stages (e.g. only the
+score) can fetch the rest later without uploading the resume again.
+
+Entries live in SQLite so every worker process sees them, and expire after
+ANALYSIS_CACHE_TTL_HOURS (default 24). The database defaults to
+data/analysis_cache.db; override it with ANALYSIS_CACHE_DB.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+from profiles import to_plain
+
+
+class AnalysisCache:
+    """Short-lived store of per-analysis inputs and stage results"""
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS analyses (
+            id TEXT PRIMARY KEY,
+            created_at REAL NOT NULL,
+            resume_data TEXT NOT NULL,
+            jd_data TEXT NOT NULL,
+            results TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses(created_at);
+    """
+    
+    def __init__(self, db_file: Optional[str] = None, ttl_hours: Optional[float] = None):
+        if db_file is None:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            db_file = os.environ.get('ANALYSIS_CACHE_DB') or os.path.join(base_dir, 'data', 'analysis_cache.db')
+        if ttl_hours is None:
+            ttl_hours = float(os.environ.get('ANALYSIS_CACHE_TTL_HOURS', 24))
+        self.db_file = db_file
+        self.ttl = ttl_hours * 3600
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_file)), exist_ok=True)
+        
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+    
+    def put(self, resume_data: Dict, jd_data: Dict, results: Dict) -> str:
+        """Store a new analysis (and drop expired ones); returns its id"""
+        analysis_id = uuid.uuid4().hex
+        now = time.time()
+        with self.lock:
+            self.conn.execute("DELETE FROM analyses WHERE created_at < ?", (now - self.ttl,))
+            self.conn.execute(
+                "INSERT INTO analyses (id, created_at, resume_data, jd_data, results) VALUES (?, ?, ?, ?, ?)",
+                (analysis_id, now, json.dumps(to_plain(resume_data)), json.dumps(to_plain(jd_data)), json.dumps(results))
+            )
+        return analysis_id
+    
+    def get(self, analysis_id: str) -> Optional[Dict]:
+        """{'resume_data', 'jd_data', 'results'} of an unexpired analysis, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT resume_data, jd_data, results FROM analyses WHERE id = ? AND created_at >= ?",
+                (analysis_id, time.time() - self.ttl)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            'resume_data': json.loads(row[0]),
+            'jd_data': json.loads(row[1]),
+            'results': json.loads(row[2]),
+        }
+    
+    def update_results(self, analysis_id: str, results: Dict):
+        """Remember stages computed on a later request"""
+        with self.lock:
+            self.conn.execute("UPDATE analyses SET results = ? WHERE id = ?", (json.dumps(results), analysis_id))
@@ -5,10 +5,11 @@ A beautiful, modern web interface for the ATS Resume Scoring Engine
 Built with Flask for the backend and vanilla HTML/CSS/JS for the frontend
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file, g
 from werkzeug.utils import secure_filename
 import os
 import re
+import sqlite3
 import urllib.parse
 try:
     import requests
@@ -16,8 +17,11 @@ except ImportError:
     requests = None
 import tempfile
 import json
+import time
+import uuid
 from datetime import datetime
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
@@ -34,13 +38,13 @@ def send_shortlist_notification(candidate_email, candidate_name):
     if "your-company-email" in SMTP_EMAIL:
         print(f"[MOCK EMAIL] To: {candidate_email}\nSubject: Shortlisted\nBody: Dear {candidate_name}, You have been shortlisted! (Configure SMTP in app.py to send real emails)")
         return True
-
+    
     try:
         msg = MIMEMultipart()
         msg['From'] = SMTP_EMAIL
         msg['To'] = candidate_email
         msg['Subject'] = "Update on your Application: Shortlisted"
-
+        
         body = f"""
 Dear {candidate_name},
 
@@ -54,7 +58,7 @@ Talent Acquisition Team
 (Sent via ATS Optimizer)
         """
         msg.attach(MIMEText(body, 'plain'))
-
+        
         # Connect to server
         server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
         server.starttls()
@@ -73,10 +77,28 @@ Talent Acquisition Team
         return False
 
 
+def send_shortlist_notifications_async(recipients):
+    """Send notifications for (email, name) pairs on a background thread"""
+    def run():
+        for candidate_email, candidate_name in recipients:
+            send_shortlist_notification(candidate_email, candidate_name)
+    
+    threading.Thread(target=run, daemon=True).start()
+
+
 from ats_engine import ATSEngine
 from document_parser import DocumentParser
 from pdf_generator import PDFGenerator
 from shortlist_manager import ShortlistManager
+from talent_pool import TalentPool
+from feature_store import FeatureStore
+from analysis_cache import AnalysisCache
+from dedupe import MinHasher
+from stage_timing import StageTimer, set_stage_observer, stage
+from profiling import RequestProfiler
+from workload import CAPTURED_ENDPOINTS, WorkloadRecorder
+import metrics
+from profiles import JDProfile, ResumeProfile, to_plain
 
 
 app = Flask(__name__)
@@ -86,18 +108,244 @@ app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
 # Initialize ATS components
 ats_engine = ATSEngine()
 doc_parser = DocumentParser()
+minhasher = MinHasher()
 pdf_generator = PDFGenerator()
 shortlist_manager = ShortlistManager()
+talent_pool = TalentPool(ats_engine)
+feature_store = FeatureStore()
+analysis_cache = AnalysisCache()
+request_profiler = RequestProfiler()
+workload_recorder = WorkloadRecorder()
 
 
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
 
+# Outputs /api/analyze can return: the engine's stages plus its inputs
+ANALYSIS_OUTPUTS = tuple(ATSEngine.STAGES) + ('resume_data', 'jd_data')
+
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+# Stage timing: STAGE_TIMING=1 times every request; otherwise a request opts
+# in with timings=true, which also adds a 'timings' field to JSON responses
+STAGE_TIMING = os.environ.get('STAGE_TIMING', '').lower() in ('1', 'true', 'yes')
+
+
+def timings_requested():
+    """Whether the request asked for a 'timings' field"""
+    value = request.values.get('timings')
+    if value is None and request.is_json:
+        data = request.get_json(silent=True)
+        # Any JSON body reaches this hook, not only objects
+        if isinstance(data, dict):
+            value = data.get('timings')
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+@app.before_request
+def start_stage_timer():
+    if STAGE_TIMING or timings_requested():
+        g.stage_timer = StageTimer().start()
+
+
+@app.after_request
+def add_server_timing(response):
+    """Report stage durations as a Server-Timing header (and 'timings' field if asked)"""
+    timer = g.pop('stage_timer', None)
+    if timer is None:
+        return response
+    timer.stop()
+    response.headers['Server-Timing'] = timer.server_timing()
+    if timings_requested() and response.is_json:
+        data = response.get_json(silent=True)
+        if isinstance(data, dict):
+            data['timings'] = timer.summary()
+            response.set_data(app.json.dumps(data))
+    return response
+
+
+@app.teardown_request
+def stop_stage_timer(error):
+    # The view raised before after_request ran
+    timer = g.pop('stage_timer', None)
+    if timer is not None:
+        timer.stop()
+
+
+# Request and stage metrics for /metrics. Under gunicorn set METRICS_DIR to a
+# directory shared by the workers so every worker reports the totals.
+set_stage_observer(lambda name, seconds: metrics.STAGE_LATENCY.observe(seconds, stage=name))
+
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # The URL rule, not the path, so IDs in URLs don't create new series
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.HTTP_LATENCY.observe(time.perf_counter() - started, route=route, method=request.method)
+        metrics.HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    return response
+
+
+# On-demand profiling of the analysis routes: X-Profile-Token (matching
+# PROFILE_TOKEN) or PROFILE_SAMPLE_RATE; profiles are kept under a
+# server-generated ID, returned in X-Profile-Id
+PROFILED_ENDPOINTS = {'analyze_resume', 'bulk_analyze_resumes'}
+
+
+@app.before_request
+def start_request_profile():
+    request_id = request.headers.get('X-Request-ID', '')
+    g.request_id = request_id if request_profiler.store.valid_id(request_id) else uuid.uuid4().hex
+    if request.endpoint not in PROFILED_ENDPOINTS:
+        return
+    reason = request_profiler.should_profile(request.headers.get('X-Profile-Token'))
+    if reason:
+        g.profile_id = request_profiler.store.new_id()
+        g.profile_reason = reason
+        g.profile_started = time.perf_counter()
+        g.profiler = request_profiler.start()
+
+
+@app.after_request
+def save_request_profile(response):
+    response.headers['X-Request-ID'] = g.get('request_id', '')
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    profiler.disable()
+    try:
+        request_profiler.store.save(g.profile_id, profiler, {
+            'request_id': g.request_id,
+            'route': request.url_rule.rule if request.url_rule is not None else request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'reason': g.profile_reason,
+            'duration_ms': round((time.perf_counter() - g.profile_started) * 1000, 2),
+            # Describe the inputs without storing them
+            'files': [request_profiler.describe_upload(f) for _, f in request.files.items(multi=True) if f.filename],
+            'jd_chars': len(request.form.get('jd_text', '')),
+            'form': {key: request.form[key] for key in ('stages', 'screening_pages', 'add_to_pool', 'dedupe')
+                     if key in request.form},
+        })
+        response.headers['X-Profile-Id'] = g.profile_id
+    except (OSError, TypeError, ValueError, RuntimeError) as e:
+        print(f"Could not save profile {g.profile_id}: {e}")
+    return response
+
+
+@app.teardown_request
+def stop_request_profile(error):
+    # The view raised before after_request ran
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+
+
+# Workload capture for load-test replay (WORKLOAD_LOG); shapes only, no content
+@app.before_request
+def start_workload_capture():
+    if workload_recorder.enabled and request.endpoint in CAPTURED_ENDPOINTS:
+        g.workload_started = time.perf_counter()
+
+
+@app.after_request
+def record_workload(response):
+    started = g.pop('workload_started', None)
+    if started is None:
+        return response
+    try:
+        entry = workload_recorder.describe_request(request, request.endpoint)
+        entry.update(ts=round(time.time(), 3), status=response.status_code,
+                     duration_ms=round((time.perf_counter() - started) * 1000, 2))
+        workload_recorder.record(entry)
+    except (OSError, ValueError) as e:
+        print(f"Could not record workload entry: {e}")
+    return response
+
+
+@app.route('/api/profiles', methods=['GET'])
+def list_profiles():
+    """Stored request profiles, newest first (requires X-Profile-Token)"""
+    if not request_profiler.authorized(request.headers.get('X-Profile-Token')):
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify({'profiles': request_profiler.store.list()})
+
+
+@app.route('/api/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """
+    One request profile (requires X-Profile-Token)
+    
+    Query parameters:
+    - format: 'json' (default: metadata, top functions and a pstats text
+      report) or 'pstats' (the raw file for python -m pstats / snakeviz)
+    - sort: pstats sort key for the text report (default: cumulative)
+    """
+    if not request_profiler.authorized(request.headers.get('X-Profile-Token')):
+        return jsonify({'error': 'Not found'}), 404
+    info = request_profiler.store.get(profile_id)
+    if info is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    if request.args.get('format') == 'pstats':
+        return send_file(request_profiler.store.stats_path(profile_id), mimetype='application/octet-stream',
+                         as_attachment=True, download_name=f'{profile_id}.pstats')
+    try:
+        info['report'] = request_profiler.store.report(profile_id, sort=request.args.get('sort', 'cumulative'))
+    except KeyError:
+        return jsonify({'error': 'Invalid sort key'}), 400
+    return jsonify(info)
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Counters and histograms in the Prometheus text format"""
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
+def requested_outputs(value):
+    """
+    Parse a comma-separated `stages` value (all outputs when empty)
+    
+    Raises:
+        ValueError: for an unknown output name
+    """
+    if not value or not value.strip():
+        return list(ANALYSIS_OUTPUTS)
+    outputs = []
+    for name in value.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in ANALYSIS_OUTPUTS:
+            raise ValueError(f"Unknown stage: {name}. Use one of {', '.join(ANALYSIS_OUTPUTS)}")
+        if name not in outputs:
+            outputs.append(name)
+    return outputs
+
+
+def analysis_response(analysis_id, outputs, resume_data, jd_data, results):
+    """Response body holding only the requested outputs"""
+    response = {
+        'success': True,
+        'timestamp': datetime.now().isoformat(),
+        'analysis_id': analysis_id
+    }
+    available = dict(results, resume_data=to_plain(resume_data), jd_data=to_plain(jd_data))
+    for name in outputs:
+        response[name] = available[name]
+    return response
+
+
 @app.context_processor
 def inject_user():
     """Inject user identity from headers or query params for portal integration"""
@@ -132,6 +380,11 @@ def analyze_resume():
     Expected form data:
     - resume_file: Resume file (PDF/DOCX/TXT)
     - jd_text: Job description text
+    - stages (optional): Comma-separated outputs to compute and return, from
+      score, suitability, gaps, improvements, optimized_resume, resume_data
+      and jd_data (default: all). Stages a requested one depends on are
+      computed but not returned; the rest can be fetched later from
+      /api/analyze/<analysis_id>.
     """
     try:
         # Validate inputs
@@ -153,6 +406,14 @@ def analyze_resume():
         if not jd_text.strip():
             return jsonify({'error': 'Job description cannot be empty'}), 400
         
+        try:
+            outputs = requested_outputs(request.form.get('stages') or request.args.get('stages'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Canonicalize JD text the same way extracted resume text is
+        jd_text = doc_parser.parse_text(jd_text)
+        
         # Save uploaded file temporarily
         filename = secure_filename(resume_file.filename)
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
@@ -160,7 +421,12 @@ def analyze_resume():
         
         try:
             # Parse resume
-            resume_text = doc_parser.parse_file(filepath)
+            try:
+                resume_text = doc_parser.parse_file(filepath)
+            except Exception:
+                metrics.PARSE_FAILURES.inc(file_type=metrics.file_type(filename))
+                raise
+            metrics.DOCUMENTS_PARSED.inc(file_type=metrics.file_type(filename))
             
             # Parse resume data
             resume_data = ats_engine.parse_resume(resume_text)
@@ -168,35 +434,11 @@ def analyze_resume():
             # Analyze job description
             jd_data = ats_engine.analyze_job_description(jd_text)
             
-            # Calculate score
-            score_data = ats_engine.calculate_ats_score(resume_data, jd_data)
-            
-            # Perform gap analysis
-            gaps = ats_engine.perform_gap_analysis(resume_data, jd_data)
+            # Score, suitability, gaps, improvements, optimized resume - as requested
+            results = ats_engine.run_stages(resume_data, jd_data, [o for o in outputs if o in ATSEngine.STAGES])
+            analysis_id = analysis_cache.put(resume_data, jd_data, results)
             
-            # Calculate suitability for HR
-            suitability = ats_engine.calculate_suitability(score_data, resume_data, jd_data)
-            
-            # Generate improvements
-            improvements = ats_engine.generate_improvements(resume_data, jd_data, gaps)
-            
-            # Generate optimized resume
-            optimized_resume = ats_engine.optimize_resume(resume_data, jd_data, improvements)
-            
-            # Prepare response
-            response = {
-                'success': True,
-                'timestamp': datetime.now().isoformat(),
-                'score': score_data,
-                'suitability': suitability,
-                'resume_data': resume_data,
-                'jd_data': jd_data,
-                'gaps': gaps,
-                'improvements': improvements,
-                'optimized_resume': optimized_resume
-            }
-            
-            return jsonify(response)
+            return jsonify(analysis_response(analysis_id, outputs, resume_data, jd_data, results))
         
         finally:
             # Clean up temporary file
@@ -207,6 +449,38 @@ def analyze_resume():
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
 
+@app.route('/api/analyze/<analysis_id>', methods=['GET'])
+def analyze_resume_stages(analysis_id):
+    """
+    Fetch more stages of an earlier /api/analyze call without re-uploading
+    
+    Query parameters:
+    - stages: Comma-separated outputs, as for /api/analyze (default: all)
+    """
+    try:
+        outputs = requested_outputs(request.args.get('stages'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        analysis = analysis_cache.get(analysis_id)
+        metrics.CACHE_REQUESTS.inc(cache='analysis', result='miss' if analysis is None else 'hit')
+        if analysis is None:
+            return jsonify({'error': 'Analysis not found or expired; run /api/analyze again'}), 404
+        
+        resume_data = ResumeProfile.coerce(analysis['resume_data'])
+        jd_data = JDProfile.coerce(analysis['jd_data'])
+        results = ats_engine.run_stages(resume_data, jd_data, [o for o in outputs if o in ATSEngine.STAGES],
+                                        results=analysis['results'])
+        if len(results) > len(analysis['results']):
+            analysis_cache.update_results(analysis_id, results)
+        
+        return jsonify(analysis_response(analysis_id, outputs, resume_data, jd_data, results))
+    
+    except Exception as e:
+        return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
+
+
 @app.route('/api/download-resume', methods=['POST'])
 def download_resume():
     """Download optimized resume as PDF"""
@@ -259,9 +533,17 @@ def bulk_analyze_resumes():
     Expected form data:
     - resume_files: Multiple resume files (PDF/DOCX/TXT)
     - jd_text: Job description text
+    - screening_pages (optional): Score PDFs on their first N pages only;
+      later pages are extracted only if a section is missing from them
+    - add_to_pool (optional): 'true' to keep the parsed resumes in the
+      talent pool for later searches
+    - dedupe (optional): 'false' to score near-duplicate resumes separately
     
     Returns:
-    - Ranked list of candidates with scores and comparisons
+    - Ranked list of candidates with scores and comparisons. Near-duplicate
+      uploads are scored once: the first copy is ranked (with the others in
+      its 'duplicates') and the rest are listed under 'duplicates' with the
+      scores they share.
     """
     try:
         # Validate inputs
@@ -273,6 +555,9 @@ def bulk_analyze_resumes():
         
         resume_files = request.files.getlist('resume_files')
         jd_text = request.form['jd_text']
+        screening_pages = request.form.get('screening_pages', type=int)
+        add_to_pool = request.form.get('add_to_pool', '').lower() in ('1', 'true', 'yes')
+        dedupe = request.form.get('dedupe', 'true').lower() not in ('0', 'false', 'no')
         
         if not resume_files or len(resume_files) == 0:
             return jsonify({'error': 'No resume files selected'}), 400
@@ -280,16 +565,22 @@ def bulk_analyze_resumes():
         if not jd_text.strip():
             return jsonify({'error': 'Job description cannot be empty'}), 400
         
+        # Canonicalize JD text the same way extracted resume text is
+        jd_text = doc_parser.parse_text(jd_text)
+        
         # Analyze job description once (same for all candidates)
         jd_data = ats_engine.analyze_job_description(jd_text)
         jd_experience = ats_engine.extract_years_of_experience(jd_text)
         
-        # Process each resume
+        metrics.BULK_BATCH_SIZE.observe(len(resume_files))
+        
+        # Parse each resume
         results = []
+        parsed = []
         for idx, resume_file in enumerate(resume_files):
             if resume_file.filename == '':
                 continue
-                
+            
             if not allowed_file(resume_file.filename):
                 results.append({
                     'filename': resume_file.filename,
@@ -305,14 +596,83 @@ def bulk_analyze_resumes():
                 resume_file.save(filepath)
                 
                 # Parse resume
-                resume_text = doc_parser.parse_file(filepath)
+                if screening_pages and screening_pages > 0:
+                    resume_doc = doc_parser.parse_screening(filepath, pages=screening_pages)
+                    resume_text = resume_doc.text
+                else:
+                    resume_doc = resume_text = doc_parser.parse_file(filepath)
                 resume_experience = ats_engine.extract_years_of_experience(resume_text[:2000]) # Scan first 2000 chars for summary
-                resume_data = ats_engine.parse_resume(resume_text)
+                resume_data = ats_engine.parse_resume(resume_doc)
+                parsed.append((resume_file.filename, filename, resume_data, resume_experience))
+                metrics.DOCUMENTS_PARSED.inc(file_type=metrics.file_type(filename))
                 
-                # Calculate scores
-                score_data = ats_engine.calculate_ats_score(resume_data, jd_data)
-                suitability = ats_engine.calculate_suitability(score_data, resume_data, jd_data)
-                gaps = ats_engine.perform_gap_analysis(resume_data, jd_data)
+                # Clean up temp file
+                try:
+                    os.remove(filepath)
+                except:
+                    pass
+            
+            except Exception as e:
+                metrics.PARSE_FAILURES.inc(file_type=metrics.file_type(resume_file.filename))
+                results.append({
+                    'filename': resume_file.filename,
+                    'error': str(e),
+                    'status': 'failed'
+                })
+        
+        # Group near-duplicate uploads and look for copies already in the
+        # pool (before this batch is added to it)
+        duplicate_of = [None] * len(parsed)
+        pool_matches = {}
+        if dedupe and parsed:
+            with stage('dedupe'):
+                signatures = [minhasher.signature(item[2]) for item in parsed]
+                duplicate_of = minhasher.group(signatures)
+                pool_matches = {
+                    index: talent_pool.find_near_duplicate(signature)
+                    for index, signature in enumerate(signatures)
+                    if duplicate_of[index] is None and signature
+                }
+        
+        if add_to_pool and parsed:
+            with stage('talent_pool_add'):
+                talent_pool.add_many([(item[2], item[1]) for item in parsed])
+        
+        # Only representatives are scored; each keeps the copies it stands for
+        copies = {}
+        for index, match in enumerate(duplicate_of):
+            if match is not None:
+                copies.setdefault(match[0], []).append((index, match[1]))
+        scored = [(index, *parsed[index]) for index, match in enumerate(duplicate_of) if match is None]
+        
+        # Score every distinct resume against the JD in one vectorized pass
+        all_scores, features = ats_engine.score_features([item[3] for item in scored], jd_data)
+        
+        # Keep the component scores so the requisition can be re-ranked later
+        with stage('feature_store'):
+            try:
+                requisition_id = feature_store.save(features, [
+                    {
+                        'filename': filename,
+                        'candidate_name': resume_data['contact_info']['name'],
+                        'email': resume_data['contact_info']['email'],
+                        'phone': resume_data['contact_info']['phone'],
+                        'missing_skills': score_data['visibility_status']['missing_mandatory'],
+                    }
+                    for (_, _, filename, resume_data, _), score_data in zip(scored, all_scores)
+                ], job={'mandatory_skills': jd_data['mandatory_skills'], 'experience_required': jd_data['experience_required']},
+                   resumes=[item[3] for item in scored], jd_data=jd_data)
+            except (sqlite3.Error, OSError) as e:
+                # Re-ranking is optional; the scores are still returned
+                print(f"Could not store requisition features: {e}")
+                requisition_id = None
+        
+        duplicates = []
+        for (index, original_name, filename, resume_data, resume_experience), score_data in zip(scored, all_scores):
+            try:
+                # Suitability and gaps in one pass, reusing the batch score
+                analysis = ats_engine.analyze(resume_data, jd_data, score_data=score_data)
+                suitability = analysis['suitability']
                 
                 # Compile result
                 results.append({
@@ -336,21 +696,41 @@ def bulk_analyze_resumes():
                     'breakdown': score_data['breakdown'],
                     'jd_experience': jd_experience,
                     'resume_experience': resume_experience,
+                    'duplicates': [parsed[copy][1] for copy, _ in copies.get(index, [])],
+                    'pool_duplicate_of': pool_matches.get(index),
                     'status': 'success'
                 })
                 
-                # Clean up temp file
-                try:
-                    os.remove(filepath)
-                except:
-                    pass
-                    
+                # Copies reuse the representative's scores instead of being ranked again
+                for copy, similarity in copies.get(index, []):
+                    _, copy_filename, copy_data, copy_experience = parsed[copy]
+                    duplicates.append({
+                        'filename': copy_filename,
+                        'candidate_name': copy_data['contact_info']['name'],
+                        'email': copy_data['contact_info']['email'],
+                        'phone': copy_data['contact_info']['phone'],
+                        'duplicate_of': filename,
+                        'similarity': similarity,
+                        'total_score': score_data['total_score'],
+                        'verdict': suitability['verdict'],
+                        'visibility_status': score_data['visibility_status'],
+                        'breakdown': score_data['breakdown'],
+                        'resume_experience': copy_experience,
+                        'status': 'duplicate'
+                    })
+            
             except Exception as e:
                 results.append({
-                    'filename': resume_file.filename,
+                    'filename': original_name,
                     'error': str(e),
                     'status': 'failed'
                 })
+                for copy, _ in copies.get(index, []):
+                    results.append({
+                        'filename': parsed[copy][0],
+                        'error': str(e),
+                        'status': 'failed'
+                    })
         
         # Sort by score (highest first)
         successful_results = [r for r in results if r['status'] == 'success']
@@ -367,6 +747,8 @@ def bulk_analyze_resumes():
             'total_processed': len(resume_files),
             'successful': len(successful_results),
             'failed': len(failed_results),
+            'requisition_id': requisition_id,
+            'duplicates': duplicates,
             'jd_data': {
                 'mandatory_skills': jd_data['mandatory_skills'],
                 'preferred_skills': jd_data['preferred_skills'],
@@ -377,7 +759,7 @@ def bulk_analyze_resumes():
             'candidates': successful_results,
             'failed_files': failed_results
         })
-        
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -385,7 +767,179 @@ def bulk_analyze_resumes():
         }), 500
 
 
+@app.route('/api/requisitions/<requisition_id>/rerank', methods=['POST'])
+def rerank_requisition(requisition_id):
+    """
+    Re-rank a bulk analysis with new weights or visibility thresholds
+    
+    Uses the component scores stored when /api/bulk-analyze ran, so no
+    resume is parsed or scored again.
+    
+    Expected JSON data (all optional):
+    - weights: {component: weight} for domain, keyword, formatting, skills,
+      experience, education, certifications (rescaled to sum to 1)
+    - thresholds: {perfect, potential, experience} gate scores
+    - limit: Number of candidates to return
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        limit = data.get('limit')
+        result = feature_store.rerank(
+            ats_engine,
+            requisition_id,
+            weights=data.get('weights'),
+            thresholds=data.get('thresholds'),
+            limit=int(limit) if limit is not None else None
+        )
+        if result is None:
+            return jsonify({'success': False, 'error': 'Requisition not found or expired'}), 404
+        return jsonify({'success': True, **result})
+    
+    except (ValueError, TypeError, AttributeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/requisitions/<requisition_id>/jd', methods=['POST'])
+def update_requisition_jd(requisition_id):
+    """
+    Apply an edited job description to a bulk analysis
+    
+    Only the score components the edit affects are recomputed for the
+    stored candidates (e.g. an added mandatory skill touches the skills
+    match and the gates, not the keyword scan); the requisition is updated
+    in place and returned re-ranked.
+    
+    Expected JSON (or form) data:
+    - jd_text: The edited job description
+    - limit (optional): Number of candidates to return
+    """
+    try:
+        data = request.get_json(silent=True) or request.form
+        jd_text = data.get('jd_text', '')
+        if not jd_text.strip():
+            return jsonify({'success': False, 'error': 'Job description cannot be empty'}), 400
+        
+        jd_data = ats_engine.analyze_job_description(doc_parser.parse_text(jd_text))
+        update = feature_store.rescore(
+            ats_engine, requisition_id, jd_data,
+            job={'mandatory_skills': jd_data['mandatory_skills'], 'experience_required': jd_data['experience_required']}
+        )
+        if update is None:
+            return jsonify({'success': False, 'error': 'Requisition not found or expired'}), 404
+        
+        limit = data.get('limit')
+        result = feature_store.rerank(ats_engine, requisition_id, limit=int(limit) if limit is not None else None)
+        return jsonify({
+            'success': True,
+            **result,
+            'recomputed_components': update['recomputed'],
+            'jd_data': {
+                'mandatory_skills': jd_data['mandatory_skills'],
+                'preferred_skills': jd_data['preferred_skills'],
+                'experience_required': jd_data['experience_required'],
+                'required_certifications': jd_data['required_certifications'],
+                'education_required': jd_data['education_required']
+            },
+        })
+    
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# Talent Pool Endpoints
+@app.route('/api/talent-pool/search', methods=['POST'])
+def search_talent_pool():
+    """
+    Rank stored resumes against a job description without re-uploading them
+    
+    Expected JSON (or form) data:
+    - jd_text: Job description text
+    - limit (optional): Number of candidates to return (default 50)
+    - min_matched (optional): Mandatory skills a resume must share to be scored (default 1)
+    """
+    try:
+        data = request.get_json(silent=True) or request.form
+        jd_text = data.get('jd_text', '')
+        if not jd_text.strip():
+            return jsonify({'error': 'Job description cannot be empty'}), 400
+        
+        jd_data = ats_engine.analyze_job_description(doc_parser.parse_text(jd_text))
+        result = talent_pool.search(
+            jd_data,
+            limit=int(data.get('limit', 50)),
+            min_matched=int(data.get('min_matched', 1))
+        )
+        return jsonify({'success': True, **result})
+    
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/talent-pool/add', methods=['POST'])
+def add_to_talent_pool():
+    """
+    Parse resume files and store them in the talent pool
+    
+    Expected form data:
+    - resume_files: One or more resume files (PDF/DOCX/TXT)
+    """
+    try:
+        resume_files = request.files.getlist('resume_files')
+        if not resume_files:
+            return jsonify({'error': 'No resume files provided'}), 400
+        
+        results = []
+        for idx, resume_file in enumerate(resume_files):
+            if not allowed_file(resume_file.filename):
+                results.append({'filename': resume_file.filename, 'status': 'failed',
+                                'error': f'Invalid file type. Allowed: {", ".join(ALLOWED_EXTENSIONS)}'})
+                continue
+            filename = secure_filename(resume_file.filename)
+            filepath = os.path.join(app.config['UPLOAD_FOLDER'], f'pool_{idx}_{filename}')
+            try:
+                resume_file.save(filepath)
+                resume_data = ats_engine.parse_resume(doc_parser.parse_file(filepath))
+                stored = talent_pool.add(resume_data, source=filename)
+                results.append({'filename': filename, 'status': 'success',
+                                'pool_id': stored['id'], 'added': stored['added']})
+            except Exception as e:
+                results.append({'filename': resume_file.filename, 'status': 'failed', 'error': str(e)})
+            finally:
+                try:
+                    os.remove(filepath)
+                except OSError:
+                    pass
+        
+        return jsonify({'success': True, 'results': results, 'pool_size': talent_pool.count()})
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 # Shortlist Management Endpoints
+def shortlist_response(revision, build):
+    """
+    JSON response validated by the shortlist revision
+    
+    Clients that send back the ETag get a 304 until the shortlist changes;
+    `build` is only called when the body is actually needed.
+    """
+    etag = f'shortlist-{revision}'
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
 @app.route('/api/shortlist/add', methods=['POST'])
 def add_to_shortlist():
     """Add a candidate to the shortlist and send notification email"""
@@ -405,7 +959,7 @@ def add_to_shortlist():
                     result['message'] += " (Email sent to candidate)"
             else:
                  result['message'] += " (No email found for notification)"
-                 
+        
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -423,16 +977,120 @@ def remove_from_shortlist():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def batch_response(results):
+    """Per-item batch results plus success/failure counts"""
+    succeeded = sum(1 for result in results if result.get('success'))
+    return jsonify({
+        'success': True,
+        'results': results,
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded
+    })
+
+
+@app.route('/api/shortlist/batch/add', methods=['POST'])
+def batch_add_to_shortlist():
+    """
+    Add many candidates in one transaction
+    
+    Body: {"candidates": [...]}. Notification emails are sent in the
+    background after the shortlist is saved.
+    """
+    try:
+        candidates = (request.get_json() or {}).get('candidates', [])
+        results = shortlist_manager.add_candidates(candidates)
+        
+        recipients = []
+        for candidate, result in zip(candidates, results):
+            if not result.get('success'):
+                continue
+            email = candidate.get('email')
+            result['email_queued'] = bool(email)
+            if email:
+                recipients.append((email, candidate.get('candidate_name', 'Candidate')))
+        if recipients:
+            send_shortlist_notifications_async(recipients)
+        
+        return batch_response(results)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/shortlist/batch/remove', methods=['POST'])
+def batch_remove_from_shortlist():
+    """Remove many candidates in one transaction. Body: {"emails": [...]}"""
+    try:
+        emails = (request.get_json() or {}).get('emails', [])
+        return batch_response(shortlist_manager.remove_candidates(emails))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/shortlist/batch/update-status', methods=['POST'])
+def batch_update_shortlist_status():
+    """Update many statuses in one transaction. Body: {"updates": [{"email", "status"}, ...]}"""
+    try:
+        updates = (request.get_json() or {}).get('updates', [])
+        return batch_response(shortlist_manager.update_statuses(updates))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/shortlist/batch/add-note', methods=['POST'])
+def batch_add_shortlist_notes():
+    """Add many notes in one transaction. Body: {"notes": [{"email", "note"}, ...]}"""
+    try:
+        notes = (request.get_json() or {}).get('notes', [])
+        return batch_response(shortlist_manager.add_notes(notes))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/shortlist/all', methods=['GET'])
 def get_all_shortlisted():
-    """Get all shortlisted candidates"""
-    try:
-        candidates = shortlist_manager.get_all_shortlisted()
-        return jsonify({
+    """
+    Get shortlisted candidates
+    
+    Optional query parameters: status, recruiter, job_title, min_score,
+    max_score, sort (shortlisted_at, total_score or candidate_name; prefix
+    '-' for descending), limit and cursor (next_cursor from the previous
+    page). Without limit every matching candidate is returned.
+    
+    Responses carry an ETag tied to the shortlist revision.
+    """
+    def build():
+        page = shortlist_manager.get_shortlist_page(
+            status=request.args.get('status') or None,
+            recruiter=request.args.get('recruiter') or None,
+            job_title=request.args.get('job_title') or None,
+            min_score=request.args.get('min_score', type=float),
+            max_score=request.args.get('max_score', type=float),
+            sort=request.args.get('sort') or 'shortlisted_at',
+            cursor=request.args.get('cursor') or None,
+            limit=request.args.get('limit')
+        )
+        return {
             'success': True,
-            'candidates': candidates,
-            'total': len(candidates)
-        })
+            'candidates': page['candidates'],
+            'total': page['total'],
+            'next_cursor': page['next_cursor'],
+            'revision': revision
+        }
+    
+    try:
+        # Revision is read before the rows, so a concurrent write can only make the ETag stale
+        revision = shortlist_manager.get_revision()
+        return shortlist_response(revision, build)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -481,15 +1139,29 @@ def add_shortlist_note():
 def get_shortlist_statistics():
     """Get shortlist statistics"""
     try:
-        stats = shortlist_manager.get_statistics()
-        return jsonify({
+        revision = shortlist_manager.get_revision()
+        return shortlist_response(revision, lambda: {
             'success': True,
-            'statistics': stats
+            'statistics': shortlist_manager.get_statistics()
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/shortlist/changes', methods=['GET'])
+def get_shortlist_changes():
+    """Get candidates added, updated or removed after ?since=<revision>"""
+    try:
+        since = request.args.get('since', type=int)
+        if since is None:
+            return jsonify({'success': False, 'error': 'since must be a revision number'}), 400
+        
+        changes = shortlist_manager.get_changes(since)
+        return jsonify({'success': True, **changes})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/shortlist')
 def view_shortlist():
     """Render shortlist page"""
@@ -529,7 +1201,7 @@ def generate_sourcing():
         
         if not unique_keywords:
             unique_keywords = ['Developer', 'Engineer', 'Software']
-            
+        
         keyword_str = " ".join([f'"{k}"' for k in unique_keywords])
         
         links = []
@@ -545,7 +1217,7 @@ def generate_sourcing():
         for p, q in platforms:
             url = f"https://www.google.com/search?q={urllib.parse.quote(q)}"
             links.append({'platform': p, 'query': q, 'url': url})
-            
+        
         # Real Search via Google API (if keys provided)
         api_key = data.get('api_key')
         cx_id = data.get('cx_id')
@@ -570,7 +1242,7 @@ def generate_sourcing():
                             link = item.get('link', '')
                             if not link or 'linkedin.com/feed' in link or 'linkedin.com/login' in link or 'linkedin.com/pub' in link or 'linkedin.com/jobs' in link:
                                 continue
-
+                            
                             title = item.get('title', 'Unknown Professional')
                             # Clean title: "Name - Role - Company | LinkedIn"
                             parts = title.split(' - ')
@@ -594,7 +1266,7 @@ def generate_sourcing():
                                 candidate_skills = unique_keywords[:3]
                             else:
                                 candidate_skills = list(set(candidate_skills))[:5]
-
+                            
                             candidates_list.append({
                                 'name': name,
                                 'title': role,
@@ -609,7 +1281,7 @@ def generate_sourcing():
                     print(f"Google API Exception: {str(e)}")
             else:
                 print("Warning: 'requests' module not installed. Skipping Google API call.")
-
+        
         return jsonify({'success': True, 'links': links, 'mock_candidates': candidates_list})
     except Exception as e:
         import traceback
@@ -90,7 +90,7 @@ Examples:
             print(f"ERROR: Failed to parse job description file: {e}", file=sys.stderr)
             return 1
     else:
-        jd_text = args.jd
+        jd_text = doc_parser.parse_text(args.jd)
         if args.verbose:
             print(f"  ✓ Using provided job description text ({len(jd_text)} characters)")
     
@@ -131,7 +131,9 @@ Examples:
         print("STEP 3: CALCULATING ATS SCORE")
         print("=" * 80)
     
-    score_data = ats_engine.calculate_ats_score(resume_data, jd_data)
+    # Score and gap analysis share one pass over the resume
+    analysis = ats_engine.analyze(resume_data, jd_data)
+    score_data = analysis['score']
     
     print(f"\n{'=' * 80}")
     print(f"ATS COMPATIBILITY SCORE: {score_data['total_score']}/100")
@@ -147,7 +149,7 @@ Examples:
         print("STEP 4: GAP ANALYSIS")
         print("=" * 80)
     
-    gaps = ats_engine.perform_gap_analysis(resume_data, jd_data)
+    gaps = analysis['gaps']
     
     if args.verbose:
         critical_count = sum(len(items) for items in gaps['critical'].values())
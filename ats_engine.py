@@ -14,16 +14,157 @@ Features:
 
 import re
 import os
+import bisect
+import hashlib
 from typing import Dict, List, Tuple, Set
 from collections import Counter
+from itertools import chain
 import json
 from datetime import datetime
 
+from profiles import JDProfile, ResumeProfile, to_plain
+from stage_timing import timed
+
+try:
+    import numpy as np
+except ImportError:
+    # score_batch falls back to scoring one resume at a time
+    np = None
+
+# Byte table blanking everything but lowercase ASCII letters, so that
+# encode().translate().split() yields a text's letter runs (see _membership_matrix)
+_LETTERS_ONLY = bytes(b if 97 <= b <= 122 else 32 for b in range(256))
+
+
+def _rows_containing(joined: bytes, ends: List[int], term: bytes):
+    """
+    Indices of the NUL-joined texts that contain term, each once
+    
+    Args:
+        joined: Texts joined with NUL (which no term contains)
+        ends: Offset of the NUL after each text (the last one: len(joined))
+        term: Non-empty term
+    """
+    position = joined.find(term)
+    while position >= 0:
+        row = bisect.bisect_right(ends, position)
+        yield row
+        # Skip the rest of this text
+        position = joined.find(term, ends[row] + 1)
+
+
+class _AnalysisContext:
+    """
+    Intermediates shared by the score, suitability and gap analysis of one
+    resume/JD pair, so ATSEngine.analyze computes each of them once
+    """
+    
+    __slots__ = ('engine', 'resume', 'jd', 'resume_skills', 'mandatory_skills', 'missing_mandatory',
+                 'matched_mandatory', '_certifications', '_education_text', '_education_levels')
+    
+    def __init__(self, engine, resume_data, jd_data):
+        self.engine = engine
+        self.resume = ResumeProfile.coerce(resume_data)
+        self.jd = JDProfile.coerce(jd_data)
+        
+        # Normalized skill sets (built in the same order everywhere, so the
+        # lists made from them keep their order)
+        normalize = engine._normalize_skill
+        self.resume_skills = set(normalize(s) for s in self.resume.skills)
+        self.mandatory_skills = set(normalize(s) for s in self.jd.mandatory_skills)
+        self.missing_mandatory = self.mandatory_skills - self.resume_skills
+        self.matched_mandatory = self.resume_skills & self.mandatory_skills
+        
+        self._certifications = {}
+        self._education_text = None
+        self._education_levels = {}
+    
+    def certification_matched(self, cert: str) -> bool:
+        """Whether a required certification appears in one of the resume's certifications"""
+        key = cert.lower()
+        if key not in self._certifications:
+            self._certifications[key] = any(key in rc.lower() for rc in self.resume.certifications)
+        return self._certifications[key]
+    
+    def education_level_matched(self, level: str) -> bool:
+        """Whether the resume's education mentions a degree level of ATSEngine.education_levels"""
+        if level not in self._education_levels:
+            if self._education_text is None:
+                self._education_text = " ".join(self.resume.education).lower()
+            self._education_levels[level] = self.engine._education_matches_level(self._education_text, level)
+        return self._education_levels[level]
+
 
 class ATSEngine:
     """Main ATS Engine for resume scoring and optimization"""
     
-    def __init__(self):
+    # Keyword scoring modes: 'weighted' (1.0 / 1.5 per JD keyword, presence only)
+    # or 'bm25' (IDF from corpus statistics, saturated term frequency)
+    KEYWORD_SCORING_MODES = ('weighted', 'bm25')
+    
+    # BM25 term-frequency saturation and length normalization
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    
+    # Component scores mixed into the total, in summation order
+    SCORE_COMPONENTS = ('domain', 'keyword', 'formatting', 'skills', 'experience', 'education', 'certifications')
+    
+    # JD fields each component score reads (see rescore_features)
+    JD_DEPENDENCIES = {
+        'domain': ('domain_keywords',),
+        'keyword': ('weighted_keywords', 'keyword_idf', 'average_length'),
+        'formatting': (),
+        'skills': ('mandatory_skills',),
+        'experience': ('domain_keywords',),
+        'education': ('education_required',),
+        'certifications': ('required_certifications',),
+    }
+    
+    # Visibility gates: total score for a perfect / potential match, and the
+    # experience score a perfect match needs when the JD asks for experience
+    GATE_THRESHOLDS = {'perfect': 85, 'potential': 70, 'experience': 60}
+    
+    # Analysis stages and the stages each one needs first (see run_stages)
+    STAGES = {
+        'score': (),
+        'suitability': ('score',),
+        'gaps': (),
+        'improvements': ('gaps',),
+        'optimized_resume': ('improvements',),
+    }
+    
+    # Header keywords of the sections extracted from resumes; a section with
+    # several lists is looked up with each in turn until one matches
+    SECTION_HEADERS = {
+        'experience': (['experience', 'work experience', 'employment'],),
+        'education': (
+            ['education', 'academic background', 'academic history', 'academic qualification',
+             'educational qualification', 'tertiary education', 'professional qualifications',
+             'university', 'academic record', 'academics', 'degrees', 'educational profile'],
+            ['education', 'academic'],
+        ),
+        'certifications': (['certification', 'certificates', 'licenses'],),
+        'projects': (['projects', 'personal projects', 'key projects'],),
+    }
+    
+    def __init__(self, keyword_scoring: str = None, corpus_stats=None):
+        """
+        Args:
+            keyword_scoring: 'weighted' or 'bm25'; defaults to ATS_KEYWORD_SCORING
+                or 'weighted'
+            corpus_stats: CorpusStatistics for BM25 mode (the default artifact
+                is loaded when omitted)
+        """
+        if keyword_scoring is None:
+            keyword_scoring = os.environ.get('ATS_KEYWORD_SCORING', 'weighted')
+        self.keyword_scoring = keyword_scoring.lower()
+        if self.keyword_scoring not in self.KEYWORD_SCORING_MODES:
+            raise ValueError(f"Unsupported keyword scoring mode: {keyword_scoring}. Use 'weighted' or 'bm25'")
+        if self.keyword_scoring == 'bm25' and corpus_stats is None:
+            from corpus_stats import CorpusStatistics
+            corpus_stats = CorpusStatistics()
+        self.corpus_stats = corpus_stats
+        
         self.stop_words = {
             'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
             'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
@@ -178,30 +319,68 @@ class ATSEngine:
             return self.synonym_map[skill_lower]
         return skill_lower
         
+    @timed('parse_resume')
     def parse_resume(self, resume_text: str) -> Dict:
         """
         Extract structured data from resume text
         
         Args:
-            resume_text: Raw resume text
+            resume_text: Raw resume text, or a screening document (anything
+                with `text`, `full_text` and `is_complete`, e.g. from
+                DocumentParser.parse_screening). Screening documents are
+                scored on their eager pages; sections missing from those
+                pages, or running to their end, are read from the full text,
+                which is only then extracted.
             
         Returns:
-            Dictionary containing parsed resume components
+            ResumeProfile with the parsed resume components
         """
+        document = None if isinstance(resume_text, str) else resume_text
+        if document is not None:
+            resume_text = document.text
+            if document.is_complete:
+                document = None
+        
         resume_data = {
             'contact_info': self._extract_contact_info(resume_text),
             'summary': self._extract_summary(resume_text),
             'skills': self._extract_skills(resume_text),
-            'experience': self._extract_experience(resume_text),
-            'education': self._extract_education(resume_text),
-            'certifications': self._extract_certifications(resume_text),
-            'projects': self._extract_projects(resume_text),
+            'experience': self._extract_from_document(self._extract_experience, resume_text, document, 'experience'),
+            'education': self._extract_from_document(self._extract_education, resume_text, document, 'education'),
+            'certifications': self._extract_from_document(self._extract_certifications, resume_text, document, 'certifications'),
+            'projects': self._extract_from_document(self._extract_projects, resume_text, document, 'projects'),
             'keywords': self._extract_keywords(resume_text),
             'formatting_issues': self._detect_formatting_issues(resume_text)
         }
+        if self.keyword_scoring == 'bm25':
+            # Cached so BM25 scoring (and the talent pool) never re-tokenizes the text
+            resume_data['keyword_tf'] = self.term_frequencies(resume_text)
+        
+        return ResumeProfile.coerce(resume_data)
+    
+    def _extract_from_document(self, extractor, text: str, document=None, section: str = None):
+        """
+        Run a section extractor on the screening text, falling back to the full document
         
-        return resume_data
+        The full text is used when the section is missing from the screening
+        pages or runs to their end, since it may continue on a later page.
+        """
+        if document is None:
+            return extractor(text)
+        result = extractor(text)
+        if not result or (section and self._section_reaches_end(text, self.SECTION_HEADERS[section])):
+            result = extractor(document.full_text)
+        return result
+    
+    def _section_reaches_end(self, text: str, header_lists) -> bool:
+        """Whether the section found with header_lists is still open at the end of text"""
+        for keywords in header_lists:
+            section, reaches_end = self._find_section(text, keywords)
+            if section:
+                return reaches_end
+        return False
     
+    @timed('analyze_jd')
     def analyze_job_description(self, jd_text: str) -> Dict:
         """
         Extract and classify job description requirements
@@ -210,7 +389,7 @@ class ATSEngine:
             jd_text: Job description text
             
         Returns:
-            Dictionary containing JD analysis
+            JDProfile with the JD analysis
         """
         jd_data = {
             'mandatory_skills': self._extract_mandatory_skills(jd_text),
@@ -224,8 +403,111 @@ class ATSEngine:
             'action_verbs': self._extract_action_verbs_from_jd(jd_text),
             'weighted_keywords': self._assign_keyword_weights(jd_text)
         }
+        if self.keyword_scoring == 'bm25':
+            jd_tf = self.term_frequencies(jd_text)
+            self.corpus_stats.add_document(jd_tf, key=hashlib.sha1(jd_text.encode('utf-8')).hexdigest())
+            jd_data['keyword_idf'] = self._keyword_idf(jd_data['weighted_keywords'])
+            jd_data['average_length'] = self.corpus_stats.average_length()
+        
+        return JDProfile.coerce(jd_data)
+    
+    def term_frequencies(self, text: str) -> Dict[str, int]:
+        """Occurrences of each normalized keyword (as _extract_keywords finds them) in a text"""
+        words = re.findall(r'\b[a-z]{2,}(?:[-/][a-z]{2,})*\b', text.lower())
+        counts = Counter(self._normalize_skill(w) for w in words if w not in self.stop_words)
+        # Skills the word regex cannot see (C++, C#, .NET) count once
+        for skill in self._extract_skills(text):
+            norm = self._normalize_skill(skill)
+            if norm not in counts:
+                counts[norm] = 1
+        return dict(counts)
+    
+    def _keyword_idf(self, jd_weighted: Dict[str, float]) -> Dict[str, float]:
+        """IDF-scaled weight per normalized JD keyword (position boost kept)"""
+        keyword_idf = {}
+        for kw, weight in jd_weighted.items():
+            norm_kw = self._normalize_skill(kw)
+            value = weight * self.corpus_stats.idf(norm_kw)
+            keyword_idf[norm_kw] = max(keyword_idf.get(norm_kw, 0), value)
+        return keyword_idf
+    
+    def resolve_stages(self, stages: List[str]) -> List[str]:
+        """
+        Requested stages plus their dependencies, in execution order
+        
+        Raises:
+            ValueError: for an unknown stage name
+        """
+        order = []
+        
+        def visit(stage):
+            if stage not in self.STAGES:
+                raise ValueError(f"Unknown stage: {stage}. Use one of {', '.join(self.STAGES)}")
+            for dependency in self.STAGES[stage]:
+                visit(dependency)
+            if stage not in order:
+                order.append(stage)
+        
+        for stage in stages:
+            visit(stage)
+        return order
+    
+    def run_stages(self, resume_data: Dict, jd_data: Dict, stages: List[str],
+                   results: Dict = None) -> Dict:
+        """
+        Compute only the requested analysis stages and what they depend on
+        
+        Args:
+            resume_data: Parsed resume data
+            jd_data: Analyzed JD data
+            stages: Stage names from STAGES (score, suitability, gaps,
+                improvements, optimized_resume)
+            results: Stages computed earlier for the same resume and JD;
+                they are reused rather than recomputed
+            
+        Returns:
+            Dictionary of stage name -> output, including earlier results and
+            dependencies
+        """
+        results = dict(results or {})
+        context = None
+        for stage in self.resolve_stages(stages):
+            if stage in results:
+                continue
+            if stage in ('score', 'suitability', 'gaps') and context is None:
+                context = _AnalysisContext(self, resume_data, jd_data)
+            if stage == 'score':
+                results[stage] = self._score(context)
+            elif stage == 'suitability':
+                results[stage] = self._suitability(results['score'], resume_data, jd_data, context)
+            elif stage == 'gaps':
+                results[stage] = self._gap_analysis(resume_data, jd_data, context)
+            elif stage == 'improvements':
+                results[stage] = self.generate_improvements(resume_data, jd_data, results['gaps'])
+            elif stage == 'optimized_resume':
+                results[stage] = self.optimize_resume(resume_data, jd_data, results['improvements'])
+        return results
+    
+    def analyze(self, resume_data: Dict, jd_data: Dict, score_data: Dict = None) -> Dict:
+        """
+        Score, suitability and gap analysis of one resume in a single pass
+        
+        The normalized skill sets, certification matches and education
+        level matches are computed once and shared by the three stages;
+        the outputs are identical to calling calculate_ats_score,
+        calculate_suitability and perform_gap_analysis one after another.
         
-        return jd_data
+        Args:
+            resume_data: Parsed resume data
+            jd_data: Analyzed job description data
+            score_data: Score already computed for this pair (e.g. by
+                score_batch); reused instead of scoring again
+            
+        Returns:
+            Dictionary with 'score', 'suitability' and 'gaps'
+        """
+        results = {'score': score_data} if score_data is not None else None
+        return self.run_stages(resume_data, jd_data, ['score', 'suitability', 'gaps'], results=results)
     
     def calculate_suitability(self, score_data: Dict, resume_data: Dict, jd_data: Dict) -> Dict:
         """
@@ -239,6 +521,10 @@ class ATSEngine:
         Returns:
             Dictionary with HR-specific suitability metrics
         """
+        return self._suitability(score_data, resume_data, jd_data, _AnalysisContext(self, resume_data, jd_data))
+    
+    @timed('suitability')
+    def _suitability(self, score_data: Dict, resume_data: Dict, jd_data: Dict, context: _AnalysisContext) -> Dict:
         score = score_data['total_score']
         
         # Determine verdict based on STRICT visibility rules
@@ -280,7 +566,7 @@ class ATSEngine:
             
         # 3. Soft Skill Detection
         soft_skills = ['leadership', 'collaboration', 'communication', 'problem-solving', 'teamwork', 'agile']
-        found_soft = [s for s in soft_skills if s in ' '.join(resume_data['skills'] + [resume_data['summary']]).lower()]
+        found_soft = [s for s in soft_skills if s in ' '.join(list(resume_data['skills']) + [resume_data['summary']]).lower()]
         if found_soft:
             insights.append(f"Soft Skills Found: {', '.join(found_soft)}.")
         else:
@@ -288,25 +574,20 @@ class ATSEngine:
             
         # 4. Certification Check
         req_certs = jd_data.get('required_certifications', [])
-        resume_certs = resume_data.get('certifications', [])
         matched_certs = []
         if req_certs:
             for rc in req_certs:
-                if any(rc.lower() in c.lower() for c in resume_certs):
+                if context.certification_matched(rc):
                     matched_certs.append(rc)
             insights.append(f"Certifications: {len(matched_certs)}/{len(req_certs)} required certificates found.")
             
         # 5. Education Check
         req_edu = jd_data.get('education_required', 'Not specified')
-        resume_edu = " ".join(resume_data.get('education', [])).lower()
         edu_match = False
         if req_edu != 'Not specified':
             # Check if any variant of the required level is in resume
-            for level, keywords in self.education_levels.items():
-                if level == req_edu.lower():
-                    if any(re.search(r'\b' + re.escape(kw) + r'\b', resume_edu) for kw in keywords):
-                        edu_match = True
-                        break
+            if req_edu.lower() in self.education_levels:
+                edu_match = context.education_level_matched(req_edu.lower())
             insights.append(f"Education: {'Matches' if edu_match else 'Does not explicitly match'} ({req_edu} required).")
         else:
             insights.append("Education: No specific degree requirement detected in JD.")
@@ -323,7 +604,7 @@ class ATSEngine:
             'matched_skills': list(matched),
             'missing_skills': list(mandatory - matched),
             'experience_summary': self._extract_relevant_experience_snippets(resume_data, jd_data),
-            'work_history': resume_data.get('experience', []),  # Full history for HR
+            'work_history': to_plain(resume_data.get('experience', [])),  # Full history for HR
             'matched_certifications': matched_certs,
             'missing_certifications': list(set(req_certs) - set(matched_certs)),
             'education_match': edu_match,
@@ -347,26 +628,261 @@ class ATSEngine:
         Returns:
             Dictionary containing score and breakdown
         """
-        # Determine what's actually required in the JD
-        has_cert_requirements = bool(jd_data.get('certifications_required'))
-        has_edu_requirements = jd_data.get('education_required', 'Not specified') != 'Not specified'
-        has_skills_requirements = bool(jd_data.get('mandatory_skills') or jd_data.get('preferred_skills'))
-        has_experience_requirements = bool(jd_data.get('experience_required'))
-        
+        return self._score(_AnalysisContext(self, resume_data, jd_data))
+    
+    @timed('score')
+    def _score(self, context: _AnalysisContext) -> Dict:
+        resume_data, jd_data = context.resume, context.jd
+        required, weights = self._score_plan(jd_data)
+        scores = self._component_scores(resume_data, jd_data, required, context)
+        return self._assemble_score(scores, resume_data, jd_data, required, weights, context)
+    
+    def _component_scores(self, resume_data: ResumeProfile, jd_data: JDProfile, required: Dict,
+                          context: _AnalysisContext = None) -> Dict:
+        """Raw (unweighted) component scores of one resume; 0 for criteria the JD does not require"""
         # Calculate individual scores
-        keyword_score = self._calculate_keyword_match(resume_data, jd_data)
-        skills_score = self._calculate_skills_match(resume_data, jd_data) if has_skills_requirements else 0
-        experience_score = self._calculate_experience_alignment(resume_data, jd_data) if has_experience_requirements else 0
-        domain_score = self._calculate_domain_similarity(resume_data, jd_data)
-        formatting_score = self._calculate_formatting_score(resume_data)
-        
-        # Only calculate these if required in JD
-        cert_score = self._calculate_certifications_match(resume_data, jd_data) if has_cert_requirements else 0
-        edu_score = 0
-        if has_edu_requirements:
-            req_edu = jd_data.get('education_required', 'Not specified')
-            resume_edu_list = resume_data.get('education', [])
-            edu_score = self._calculate_education_match(resume_edu_list, req_edu)
+        scores = {
+            'keyword': self._calculate_keyword_match(resume_data, jd_data),
+            'skills': self._calculate_skills_match(resume_data, jd_data, context) if required['skills'] else 0,
+            'experience': self._calculate_experience_alignment(resume_data, jd_data) if required['experience'] else 0,
+            'domain': self._calculate_domain_similarity(resume_data, jd_data),
+            'formatting': self._calculate_formatting_score(resume_data),
+            # Only calculate these if required in JD
+            'certifications': self._calculate_certifications_match(resume_data, jd_data, context) if required['certifications'] else 0,
+            'education': 0,
+        }
+        if required['education']:
+            req_edu = jd_data.education_required
+            resume_edu_list = resume_data.education
+            scores['education'] = self._calculate_education_match(resume_edu_list, req_edu, context)
+        
+        return scores
+    
+    def score_batch(self, resumes: List[Dict], jd_data: Dict) -> List[Dict]:
+        """
+        Score many parsed resumes against one job description
+        
+        Resumes are encoded as boolean matrices over the JD's vocabulary
+        (weighted keywords, mandatory skills, domain keywords, certifications)
+        and each component is computed for all candidates at once with NumPy.
+        Weighting, gates and breakdown are shared with calculate_ats_score,
+        so every result is identical to scoring the resumes one by one.
+        
+        Args:
+            resumes: Parsed resume data dictionaries
+            jd_data: Analyzed job description data
+            
+        Returns:
+            One score dictionary per resume, in the same order
+        """
+        return self.score_features(resumes, jd_data)[0]
+    
+    @timed('score_batch')
+    def score_features(self, resumes: List[Dict], jd_data: Dict) -> Tuple[List[Dict], Dict]:
+        """
+        score_batch, plus the feature vectors needed to re-rank without rescoring
+        
+        Args:
+            resumes: Parsed resume data dictionaries
+            jd_data: Analyzed job description data
+            
+        Returns:
+            (score dictionaries, features) where features holds the JD's
+            'weights' and 'required' criteria, the raw per-resume 'components'
+            (component name -> list of scores) and the 'has_all_mandatory'
+            gate input, all in resume order
+        """
+        resumes = [ResumeProfile.coerce(resume_data) for resume_data in resumes]
+        jd_data = JDProfile.coerce(jd_data)
+        required, weights = self._score_plan(jd_data)
+        all_scores = self._batch_component_scores(resumes, jd_data, required)
+        results = [self._assemble_score(scores, resume_data, jd_data, required, weights)
+                   for scores, resume_data in zip(all_scores, resumes)]
+        features = {
+            'weights': weights,
+            'required': required,
+            'components': {name: [float(scores[name]) for scores in all_scores] for name in self.SCORE_COMPONENTS},
+            'has_all_mandatory': [not result['visibility_status']['missing_mandatory'] for result in results],
+        }
+        return results, features
+    
+    @timed('rerank')
+    def rerank(self, features: Dict, weights: Dict = None, thresholds: Dict = None) -> Dict:
+        """
+        Re-apply weights and visibility gates to stored feature vectors
+        
+        Nothing is re-parsed or re-scored: the new total is the weighted sum
+        of the stored component scores, so thousands of candidates take
+        milliseconds. With no overrides the totals and gates are exactly
+        those of calculate_ats_score.
+        
+        Args:
+            features: Features from score_features (lists or arrays)
+            weights: Optional {component: weight} overrides; criteria the JD
+                did not require stay unweighted, and the weights are
+                rescaled to sum to 1
+            thresholds: Optional overrides of GATE_THRESHOLDS
+            
+        Returns:
+            Dictionary with the applied 'weights' and 'thresholds', per-resume
+            'total_score' (rounded), 'is_perfect_match', 'is_potential_match'
+            and 'is_hidden' lists, and 'order' (resume indices, best first)
+        """
+        if np is None:
+            raise RuntimeError("Re-ranking needs NumPy (pip install numpy)")
+        
+        applied = dict(features['weights'])
+        if weights:
+            for name, value in weights.items():
+                if name not in self.SCORE_COMPONENTS:
+                    raise ValueError(f"Unknown score component: {name}. Use one of {', '.join(self.SCORE_COMPONENTS)}")
+                if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                    raise ValueError(f"Weight for {name} must be a non-negative number")
+                if name in applied:
+                    applied[name] = float(value)
+            weight_sum = sum(applied.values())
+            if weight_sum <= 0:
+                raise ValueError("At least one scored component needs a positive weight")
+            applied = {name: value / weight_sum for name, value in applied.items()}
+        
+        gates = dict(self.GATE_THRESHOLDS)
+        for name, value in (thresholds or {}).items():
+            if name not in gates:
+                raise ValueError(f"Unknown threshold: {name}. Use one of {', '.join(gates)}")
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise ValueError(f"Threshold {name} must be a number")
+            gates[name] = value
+        
+        # Same summation order as _assemble_score, so default weights reproduce the totals bit for bit
+        components = features['components']
+        total = None
+        for name in self.SCORE_COMPONENTS:
+            term = np.asarray(components[name], dtype=np.float64) * applied.get(name, 0)
+            total = term if total is None else total + term
+        
+        has_all_mandatory = np.asarray(features['has_all_mandatory'], dtype=bool)
+        if features['required']['experience']:
+            experience_ok = np.asarray(components['experience'], dtype=np.float64) >= gates['experience']
+        else:
+            experience_ok = True
+        is_perfect = (total >= gates['perfect']) & has_all_mandatory & experience_ok
+        is_potential = ((gates['potential'] <= total) & (total < gates['perfect'])) | ((total >= gates['perfect']) & ~is_perfect)
+        
+        rounded = [round(value, 2) for value in total.tolist()]
+        order = np.argsort(-np.array(rounded), kind='stable')
+        
+        return {
+            'weights': applied,
+            'thresholds': gates,
+            'total_score': rounded,
+            'is_perfect_match': is_perfect.tolist(),
+            'is_potential_match': is_potential.tolist(),
+            'is_hidden': (total < gates['potential']).tolist(),
+            'order': order.tolist(),
+        }
+    
+    @timed('rescore')
+    def rescore_features(self, resumes: List[Dict], old_jd: Dict, new_jd: Dict,
+                         features: Dict) -> Tuple[Dict, List[str]]:
+        """
+        Update score_features output after the JD was edited
+        
+        Only components whose JD inputs changed (see JD_DEPENDENCIES), or
+        that the edit newly requires, are recomputed; the others are kept.
+        The result equals score_features(resumes, new_jd) features.
+        
+        Args:
+            resumes: The parsed resumes the features were computed from, same order
+            old_jd: Analyzed job description the features were computed for
+            new_jd: Analyzed edited job description
+            features: Features from score_features (lists or arrays)
+            
+        Returns:
+            (features for new_jd, names of the recomputed components)
+        """
+        resumes = [ResumeProfile.coerce(resume_data) for resume_data in resumes]
+        old_jd = JDProfile.coerce(old_jd)
+        new_jd = JDProfile.coerce(new_jd)
+        required, weights = self._score_plan(new_jd)
+        changed = set(field for field in JDProfile.FIELDS if getattr(old_jd, field) != getattr(new_jd, field))
+        
+        components = {}
+        recomputed = []
+        for name in self.SCORE_COMPONENTS:
+            if name in required and not required[name]:
+                components[name] = [0.0] * len(resumes)
+            elif changed.intersection(self.JD_DEPENDENCIES[name]) or not features['required'].get(name, True):
+                components[name] = [float(value) for value in self._component_column(name, resumes, new_jd)]
+                recomputed.append(name)
+            else:
+                components[name] = [float(value) for value in features['components'][name]]
+        
+        if 'mandatory_skills' in changed:
+            mandatory = set(self._normalize_skill(s) for s in new_jd.mandatory_skills)
+            has_all_mandatory = [mandatory <= set(self._normalize_skill(s) for s in resume_data.skills)
+                                 for resume_data in resumes]
+        else:
+            has_all_mandatory = [bool(value) for value in features['has_all_mandatory']]
+        
+        return {
+            'weights': weights,
+            'required': required,
+            'components': components,
+            'has_all_mandatory': has_all_mandatory,
+        }, recomputed
+    
+    def _component_column(self, name: str, resumes: List[ResumeProfile], jd_data: JDProfile):
+        """One raw component score for every resume (vectorized when NumPy is available)"""
+        if np is None:
+            scorers = {
+                'domain': lambda r: self._calculate_domain_similarity(r, jd_data),
+                'keyword': lambda r: self._calculate_keyword_match(r, jd_data),
+                'formatting': self._calculate_formatting_score,
+                'skills': lambda r: self._calculate_skills_match(r, jd_data),
+                'experience': lambda r: self._calculate_experience_alignment(r, jd_data),
+                'education': lambda r: self._calculate_education_match(r.education, jd_data.education_required),
+                'certifications': lambda r: self._calculate_certifications_match(r, jd_data),
+            }
+            return [scorers[name](resume_data) for resume_data in resumes]
+        if not resumes:
+            return []
+        if name == 'formatting':
+            return self._batch_formatting_score(resumes)
+        batch_scorers = {
+            'domain': self._batch_domain_similarity,
+            'keyword': self._batch_keyword_match,
+            'skills': self._batch_skills_match,
+            'experience': self._batch_experience_alignment,
+            'education': self._batch_education_match,
+            'certifications': self._batch_certifications_match,
+        }
+        return batch_scorers[name](resumes, jd_data)
+    
+    def _batch_component_scores(self, resumes: List[ResumeProfile], jd_data: JDProfile, required: Dict) -> List[Dict]:
+        """_component_scores for many resumes, vectorized when NumPy is available"""
+        if np is None or not resumes:
+            return [self._component_scores(resume_data, jd_data, required) for resume_data in resumes]
+        
+        columns = {
+            'keyword': self._batch_keyword_match(resumes, jd_data),
+            'skills': self._batch_skills_match(resumes, jd_data) if required['skills'] else None,
+            'experience': self._batch_experience_alignment(resumes, jd_data) if required['experience'] else None,
+            'domain': self._batch_domain_similarity(resumes, jd_data),
+            'formatting': self._batch_formatting_score(resumes),
+            'certifications': self._batch_certifications_match(resumes, jd_data) if required['certifications'] else None,
+            'education': self._batch_education_match(resumes, jd_data) if required['education'] else None,
+        }
+        
+        return [{name: float(values[i]) if values is not None else 0 for name, values in columns.items()}
+                for i in range(len(resumes))]
+    
+    def _score_plan(self, jd_data: JDProfile) -> Tuple[Dict, Dict]:
+        """Which optional criteria the JD requires, and the resulting weights"""
+        # Determine what's actually required in the JD
+        has_cert_requirements = bool(jd_data.certifications_required)
+        has_edu_requirements = jd_data.education_required != 'Not specified'
+        has_skills_requirements = bool(jd_data.mandatory_skills or jd_data.preferred_skills)
+        has_experience_requirements = bool(jd_data.experience_required)
         
         # DYNAMIC WEIGHTING based on what's required
         # Base weights for always-present criteria
@@ -400,6 +916,31 @@ class ATSEngine:
             weights['keyword'] += 0.15
             weights['formatting'] += 0.05
         
+        required = {
+            'skills': has_skills_requirements,
+            'experience': has_experience_requirements,
+            'education': has_edu_requirements,
+            'certifications': has_cert_requirements,
+        }
+        return required, weights
+    
+    def _assemble_score(self, scores: Dict, resume_data: ResumeProfile, jd_data: JDProfile,
+                        required: Dict, weights: Dict, context: _AnalysisContext = None) -> Dict:
+        """Weighted total, visibility gates and breakdown from the component scores"""
+        if context is None:
+            context = _AnalysisContext(self, resume_data, jd_data)
+        domain_score = scores['domain']
+        keyword_score = scores['keyword']
+        formatting_score = scores['formatting']
+        skills_score = scores['skills']
+        experience_score = scores['experience']
+        edu_score = scores['education']
+        cert_score = scores['certifications']
+        has_skills_requirements = required['skills']
+        has_experience_requirements = required['experience']
+        has_edu_requirements = required['education']
+        has_cert_requirements = required['certifications']
+        
         # Calculate weighted total
         total_score = (
             domain_score * weights['domain'] +
@@ -413,22 +954,21 @@ class ATSEngine:
         
         # --- Multi-Gate Visibility Logic ---
         # 1. Mandatory Skills Check
-        resume_skills_norm = set(self._normalize_skill(s) for s in resume_data['skills'])
-        mandatory_skills_norm = set(self._normalize_skill(s) for s in jd_data['mandatory_skills'])
-        missing_mandatory = mandatory_skills_norm - resume_skills_norm
+        missing_mandatory = context.missing_mandatory
         has_all_mandatory = len(missing_mandatory) == 0
 
         # 2. Gate Conditions
+        gates = self.GATE_THRESHOLDS
         # Perfect Match Requirements: >= 85 Score AND All Mandatory Skills AND Decent Experience
-        is_perfect_match = (total_score >= 85) and has_all_mandatory and (experience_score >= 60 if has_experience_requirements else True)
+        is_perfect_match = (total_score >= gates['perfect']) and has_all_mandatory and (experience_score >= gates['experience'] if has_experience_requirements else True)
         
         # Potential Match: 70-84 OR High Score but missing mandatory skills
-        is_potential_match = (70 <= total_score < 85) or (total_score >= 85 and not is_perfect_match)
+        is_potential_match = (gates['potential'] <= total_score < gates['perfect']) or (total_score >= gates['perfect'] and not is_perfect_match)
 
         visibility_status = {
             'is_recruiter_visible': is_perfect_match or is_potential_match, # Visible but maybe limited
             'is_limited_visibility': is_potential_match,
-            'is_hidden': total_score < 70,
+            'is_hidden': total_score < gates['potential'],
             'contact_details_unlocked': is_perfect_match, # STRICT UNLOCK
             'missing_mandatory': list(missing_mandatory)
         }
@@ -458,7 +998,7 @@ class ATSEngine:
                 'score': round(skills_score, 2), 
                 'weight': f"{int(weights.get('skills', 0) * 100)}%",
                 'required': True,
-                'matched': list(resume_skills_norm & mandatory_skills_norm),
+                'matched': list(context.matched_mandatory),
                 'missing': list(missing_mandatory)
             }
         
@@ -501,15 +1041,18 @@ class ATSEngine:
         Returns:
             Dictionary containing gap analysis
         """
+        return self._gap_analysis(resume_data, jd_data, _AnalysisContext(self, resume_data, jd_data))
+    
+    @timed('gaps')
+    def _gap_analysis(self, resume_data: Dict, jd_data: Dict, context: _AnalysisContext) -> Dict:
         resume_keywords = set(resume_data['keywords'])
-        resume_skills = set(self._normalize_skill(s) for s in resume_data['skills'])
+        resume_skills = context.resume_skills
         
         # Find missing elements with normalization support
-        mandatory_jd = set(self._normalize_skill(s) for s in jd_data['mandatory_skills'])
         preferred_jd = set(self._normalize_skill(s) for s in jd_data['preferred_skills'])
         tools_jd = set(self._normalize_skill(s) for s in jd_data['tools_technologies'])
 
-        missing_mandatory = mandatory_jd - resume_skills
+        missing_mandatory = context.missing_mandatory
         missing_preferred = preferred_jd - resume_skills
         missing_tools = tools_jd - resume_skills
         missing_keywords = set(jd_data['domain_keywords']) - resume_keywords
@@ -533,6 +1076,7 @@ class ATSEngine:
         
         return gaps
     
+    @timed('improvements')
     def generate_improvements(self, resume_data: Dict, jd_data: Dict, gaps: Dict) -> Dict:
         """
         Generate actionable improvement suggestions
@@ -556,6 +1100,7 @@ class ATSEngine:
         
         return improvements
     
+    @timed('optimize_resume')
     def optimize_resume(self, resume_data: Dict, jd_data: Dict, improvements: Dict) -> str:
         """
         Generate ATS-optimized resume
@@ -736,7 +1281,7 @@ class ATSEngine:
     
     def _extract_experience(self, text: str) -> List[Dict]:
         """Extract work experience"""
-        experience_section = self._extract_section(text, ['experience', 'work experience', 'employment'])
+        experience_section = self._extract_section(text, self.SECTION_HEADERS['experience'][0])
         
         if not experience_section:
             return []
@@ -773,17 +1318,13 @@ class ATSEngine:
         Extract education information with improved robustness.
         We look for common education headers and capture the content until the next header.
         """
-        education_headers = [
-            'education', 'academic background', 'academic history', 'academic qualification', 
-            'educational qualification', 'tertiary education', 'professional qualifications', 
-            'university', 'academic record', 'academics', 'degrees', 'educational profile'
-        ]
+        education_headers, fallback_headers = self.SECTION_HEADERS['education']
         
         education_section = self._extract_section(text, education_headers)
         
         if not education_section:
             # Fallback: check for standalone "Education" header in a more aggressive way
-            education_section = self._extract_section(text, ['education', 'academic'])
+            education_section = self._extract_section(text, fallback_headers)
             
         if not education_section:
             return []
@@ -803,7 +1344,7 @@ class ATSEngine:
     
     def _extract_certifications(self, text: str) -> List[str]:
         """Extract certifications"""
-        cert_section = self._extract_section(text, ['certification', 'certificates', 'licenses'])
+        cert_section = self._extract_section(text, self.SECTION_HEADERS['certifications'][0])
         
         if not cert_section:
             return []
@@ -812,7 +1353,7 @@ class ATSEngine:
     
     def _extract_projects(self, text: str) -> List[Dict]:
         """Extract projects"""
-        project_section = self._extract_section(text, ['projects', 'personal projects', 'key projects'])
+        project_section = self._extract_section(text, self.SECTION_HEADERS['projects'][0])
         
         if not project_section:
             return []
@@ -879,6 +1420,15 @@ class ATSEngine:
     
     def _extract_section(self, text: str, keywords: List[str]) -> str:
         """Extract a specific section from resume with improved header detection"""
+        return self._find_section(text, keywords)[0]
+    
+    def _find_section(self, text: str, keywords: List[str]) -> Tuple[str, bool]:
+        """
+        Section under the first header matching keywords
+        
+        Returns:
+            (section text, whether the section runs to the end of text)
+        """
         lines = text.split('\n')
         section_lines = []
         in_section = False
@@ -904,10 +1454,10 @@ class ATSEngine:
             if in_section:
                 # Exit condition: another header detected
                 if self._is_section_header(line) and not any(k in line_lower for k in keywords):
-                    break
+                    return '\n'.join(section_lines), False
                 section_lines.append(line_strip)
         
-        return '\n'.join(section_lines)
+        return '\n'.join(section_lines), in_section
     
     def _is_section_header(self, line: str) -> bool:
         """Check if line is a section header"""
@@ -1057,12 +1607,15 @@ class ATSEngine:
         # Reuse the skills extraction logic
         return self._extract_skills(text)
     
-    def _calculate_keyword_match(self, resume_data: Dict, jd_data: Dict) -> float:
+    def _calculate_keyword_match(self, resume_data: ResumeProfile, jd_data: JDProfile) -> float:
         """Calculate weighted keyword match score with normalization"""
+        if jd_data.keyword_idf is not None:
+            return self._calculate_bm25_keyword_match(resume_data, jd_data)
+        
         # Normalize resume keywords
-        resume_keywords = set(self._normalize_skill(k) for k in resume_data.get('keywords', []))
+        resume_keywords = set(self._normalize_skill(k) for k in resume_data.keywords)
         
-        jd_weighted = jd_data.get('weighted_keywords', {})
+        jd_weighted = jd_data.weighted_keywords
         if not jd_weighted:
             return 100.0
         
@@ -1080,76 +1633,117 @@ class ATSEngine:
         score = (current_score / max_score) * 100
         return min(score, 100.0)
 
+    def _calculate_bm25_keyword_match(self, resume_data: ResumeProfile, jd_data: JDProfile) -> float:
+        """
+        BM25 keyword score, normalized to 0-100
+        
+        Each JD keyword contributes its IDF-scaled weight times a saturated
+        term frequency; the total is divided by what a resume containing
+        every keyword many times would get.
+        """
+        keyword_idf = jd_data.keyword_idf
+        max_score = sum(keyword_idf.values())
+        if max_score == 0:
+            return 100.0
+        
+        term_counts = resume_data.keyword_tf
+        if term_counts is None:
+            # Parsed without term frequencies (e.g. in weighted mode): presence only
+            term_counts = {self._normalize_skill(k): 1 for k in resume_data.keywords}
+        
+        k1, b = self.BM25_K1, self.BM25_B
+        average_length = jd_data.average_length or 0.0
+        length_ratio = sum(term_counts.values()) / average_length if average_length else 1.0
+        norm = k1 * (1 - b + b * length_ratio)
+        
+        current_score = 0.0
+        for kw, weight in keyword_idf.items():
+            tf = term_counts.get(kw, 0)
+            if tf:
+                current_score += weight * tf * (k1 + 1) / (tf + norm)
+        
+        score = (current_score / (max_score * (k1 + 1))) * 100
+        return min(score, 100.0)
+    
     def _normalize_skill(self, skill: str) -> str:
         """Normalize skill names using synonym map"""
         s = skill.lower().strip()
         return self.synonym_map.get(s, s)
 
-    def _calculate_skills_match(self, resume_data: Dict, jd_data: Dict) -> float:
+    def _calculate_skills_match(self, resume_data: ResumeProfile, jd_data: JDProfile,
+                                context: _AnalysisContext = None) -> float:
         """Calculate skills match score (Normalized)"""
-        resume_skills = set(self._normalize_skill(s) for s in resume_data['skills'])
-        mandatory_skills = set(self._normalize_skill(s) for s in jd_data['mandatory_skills'])
+        if context is None:
+            context = _AnalysisContext(self, resume_data, jd_data)
+        mandatory_skills = context.mandatory_skills
         
         if not mandatory_skills:
             return 100.0
             
-        matched = resume_skills & mandatory_skills
+        matched = context.matched_mandatory
         return (len(matched) / len(mandatory_skills)) * 100
 
-    def _calculate_certifications_match(self, resume_data: Dict, jd_data: Dict) -> float:
+    def _calculate_certifications_match(self, resume_data: ResumeProfile, jd_data: JDProfile,
+                                        context: _AnalysisContext = None) -> float:
         """Calculate certifications match score"""
-        required_certs = set(cert.lower() for cert in jd_data.get('required_certifications', []))
+        required_certs = set(cert.lower() for cert in jd_data.required_certifications)
         if not required_certs:
             return 100.0
-            
-        resume_certs = set(cert.lower() for cert in resume_data.get('certifications', []))
+        if context is None:
+            context = _AnalysisContext(self, resume_data, jd_data)
         
         # Check for matches (flexible match check)
         matched_count = 0
         for required in required_certs:
-            if any(required in rc.lower() for rc in resume_certs):
+            if context.certification_matched(required):
                 matched_count += 1
                 
         return (matched_count / len(required_certs)) * 100
 
-    def _calculate_education_match(self, resume_edu: List[str], req_edu: str) -> float:
+    def _calculate_education_match(self, resume_edu: List[str], req_edu: str,
+                                   context: _AnalysisContext = None) -> float:
         """Calculate score based on how well resume education matches JD requirements"""
         if req_edu == 'Not specified':
             return 100.0
             
-        resume_edu_text = " ".join(resume_edu).lower()
+        if context is not None:
+            level_matched = context.education_level_matched
+        else:
+            resume_edu_text = " ".join(resume_edu).lower()
+            level_matched = lambda level: self._education_matches_level(resume_edu_text, level)
         req_level = req_edu.lower()
         
         # Check for specific degree level matches
-        for level, keywords in self.education_levels.items():
-            if level == req_level:
-                if any(re.search(r'\b' + re.escape(kw) + r'\b', resume_edu_text) for kw in keywords):
-                    return 100.0
+        if req_level in self.education_levels and level_matched(req_level):
+            return 100.0
                     
         # Check for partial/higher matches (e.g. PhD matches Master requirement)
         hierarchy = ['bachelor', 'master', 'phd']
         try:
             req_idx = hierarchy.index(req_level)
             for level in hierarchy[req_idx:]:
-                keywords = self.education_levels[level]
-                if any(re.search(r'\b' + re.escape(kw) + r'\b', resume_edu_text) for kw in keywords):
+                if level_matched(level):
                     return 100.0
         except ValueError:
             pass
             
         return 0.0
+    
+    def _education_matches_level(self, resume_edu_text: str, level: str) -> bool:
+        """Whether lowercased education text mentions any keyword of a degree level"""
+        return any(re.search(r'\b' + re.escape(kw) + r'\b', resume_edu_text) for kw in self.education_levels[level])
 
-    def _calculate_experience_alignment(self, resume_data: Dict, jd_data: Dict) -> float:
+    def _calculate_experience_alignment(self, resume_data: ResumeProfile, jd_data: JDProfile) -> float:
         """Calculate experience alignment based on duration and context"""
-        if not resume_data['experience']:
+        if not resume_data.experience:
             return 20.0 # Partial credit for implicit experience in other sections
 
         # Context match
-        exp_text = ' '.join([str(exp.get('header', '')) + ' ' + ' '.join(exp.get('bullets', [])) 
-                            for exp in resume_data['experience']]).lower()
+        exp_text = ' '.join([str(exp.header) + ' ' + ' '.join(exp.bullets) 
+                            for exp in resume_data.experience]).lower()
         
         # Use normalized skill matching in experience text too
-        jd_keywords = set(self._normalize_skill(jw) for jw in jd_data['domain_keywords'][:25])
+        jd_keywords = set(self._normalize_skill(jw) for jw in jd_data.domain_keywords[:25])
         
         matched_count = 0
         for kw in jd_keywords:
@@ -1173,12 +1767,12 @@ class ATSEngine:
         
         return min((context_score * 0.7) + (verb_score * 0.3), 100.0)
 
-    def _calculate_domain_similarity(self, resume_data: Dict, jd_data: Dict) -> float:
+    def _calculate_domain_similarity(self, resume_data: ResumeProfile, jd_data: JDProfile) -> float:
         """Calculate semantic domain similarity"""
-        resume_text = (resume_data.get('summary', '') + ' ' + 
-                      ' '.join([exp.get('header', '') for exp in resume_data['experience']])).lower()
+        resume_text = (resume_data.summary + ' ' + 
+                      ' '.join([exp.header for exp in resume_data.experience])).lower()
         
-        jd_keywords = set(jd_data['domain_keywords'])
+        jd_keywords = set(jd_data.domain_keywords)
         if not jd_keywords:
             return 100.0
             
@@ -1194,15 +1788,181 @@ class ATSEngine:
         
         return min(score, 100.0)
     
-    def _calculate_formatting_score(self, resume_data: Dict) -> float:
+    def _calculate_formatting_score(self, resume_data: ResumeProfile) -> float:
         """Calculate formatting score"""
-        issues = resume_data['formatting_issues']
+        issues = resume_data.formatting_issues
         
         # Deduct points for each issue
         score = 100.0 - (len(issues) * 15)
         
         return max(score, 0.0)
     
+    # Batch (vectorized) component scores used by score_batch. Each mirrors the
+    # per-resume method above and must produce bit-identical values.
+    
+    @staticmethod
+    def _membership_matrix(texts: List, terms: List[str]):
+        """
+        Boolean matrix: rows are resumes, columns are terms contained in that resume's text or set
+        
+        Args:
+            texts: One string (substring test) or one set (membership test) per resume
+            terms: Terms; distinct for the membership test
+        """
+        matrix = np.zeros((len(texts), len(terms)), dtype=bool)
+        if not texts or not terms:
+            return matrix
+        
+        if not isinstance(texts[0], str):
+            # Sets: intersect each with the vocabulary, then map terms to columns
+            column = {term: j for j, term in enumerate(terms)}
+            vocabulary = column.keys()
+            hits = [vocabulary & items for items in texts]
+            counts = np.fromiter((len(h) for h in hits), dtype=np.intp, count=len(hits))
+            rows = np.repeat(np.arange(len(hits)), counts)
+            cols = np.fromiter(map(column.__getitem__, chain.from_iterable(hits)), dtype=np.intp, count=int(counts.sum()))
+            matrix[rows, cols] = True
+            return matrix
+        
+        # Strings. A term of lowercase ASCII letters occurs inside one run of them, so
+        # it is in a text exactly when it is in one of the text's words: test
+        # each distinct word once, then OR the incidence rows of the words hit.
+        word_sets = [set(text.encode('utf-8', 'replace').translate(_LETTERS_ONLY).split()) for text in texts]
+        words = list(set().union(*word_sets))
+        word_id = {word: k for k, word in enumerate(words)}
+        counts = np.fromiter((len(w) for w in word_sets), dtype=np.intp, count=len(word_sets))
+        incidence = np.zeros((len(words), len(texts)), dtype=bool)
+        incidence[np.fromiter(map(word_id.__getitem__, chain.from_iterable(word_sets)), dtype=np.intp, count=int(counts.sum())),
+                  np.repeat(np.arange(len(texts)), counts)] = True
+        
+        vocabulary = b'\0'.join(words)
+        word_ends = (np.cumsum(np.fromiter((len(w) + 1 for w in words), dtype=np.intp, count=len(words))) - 1).tolist()
+        for j, term in enumerate(terms):
+            if term.isascii() and term.isalpha() and term.islower():
+                hit_words = list(_rows_containing(vocabulary, word_ends, term.encode('ascii')))
+                if hit_words:
+                    matrix[:, j] = incidence[hit_words].any(axis=0)
+            else:
+                matrix[:, j] = [term in text for text in texts]
+        return matrix
+    
+    def _normalized_sets(self, lists: List[List[str]]) -> List[Set[str]]:
+        """set(_normalize_skill(x) for x in items) for each list, normalizing each distinct term once"""
+        normalized = {term: self._normalize_skill(term) for term in set().union(*lists)}
+        return [set(map(normalized.__getitem__, items)) for items in lists]
+    
+    def _batch_keyword_match(self, resumes: List[ResumeProfile], jd_data: JDProfile):
+        """Vectorized _calculate_keyword_match"""
+        if jd_data.keyword_idf is not None:
+            # BM25 is already a handful of dictionary lookups per resume
+            return np.array([self._calculate_bm25_keyword_match(r, jd_data) for r in resumes], dtype=np.float64)
+        
+        jd_weighted = jd_data.weighted_keywords
+        if not jd_weighted:
+            return np.full(len(resumes), 100.0)
+        
+        normalized_weights = {}
+        for kw, weight in jd_weighted.items():
+            norm_kw = self._normalize_skill(kw)
+            normalized_weights[norm_kw] = max(normalized_weights.get(norm_kw, 0), weight)
+        
+        max_score = sum(normalized_weights.values())
+        if max_score == 0:
+            return np.full(len(resumes), 100.0)
+        
+        terms = list(normalized_weights)
+        weight_list = [normalized_weights[kw] for kw in terms]
+        resume_keywords = self._normalized_sets([r.keywords for r in resumes])
+        hits = self._membership_matrix(resume_keywords, terms)
+        
+        # A matrix product sums in a different order than the per-resume loop;
+        # that is only exact when every weight is a small dyadic rational
+        # (the default 1.0 / 1.5 weights are).
+        if all(float(w * 1024).is_integer() and abs(w) < 2 ** 20 for w in weight_list):
+            current = hits.astype(np.float64) @ np.array(weight_list, dtype=np.float64)
+        else:
+            current = np.array([sum(w for w, hit in zip(weight_list, row) if hit) for row in hits],
+                               dtype=np.float64)
+        
+        return np.minimum((current / max_score) * 100, 100.0)
+    
+    def _batch_skills_match(self, resumes: List[ResumeProfile], jd_data: JDProfile):
+        """Vectorized _calculate_skills_match"""
+        mandatory_skills = list(set(self._normalize_skill(s) for s in jd_data.mandatory_skills))
+        if not mandatory_skills:
+            return np.full(len(resumes), 100.0)
+        
+        resume_skills = self._normalized_sets([r.skills for r in resumes])
+        matched = self._membership_matrix(resume_skills, mandatory_skills).sum(axis=1)
+        return (matched / len(mandatory_skills)) * 100
+    
+    def _batch_certifications_match(self, resumes: List[ResumeProfile], jd_data: JDProfile):
+        """Vectorized _calculate_certifications_match"""
+        required_certs = list(set(cert.lower() for cert in jd_data.required_certifications))
+        if not required_certs:
+            return np.full(len(resumes), 100.0)
+        
+        # A required cert is in some resume cert exactly when it is in their
+        # NUL-joined text (certs never contain NUL)
+        cert_texts = ['\0'.join(cert.lower() for cert in r.certifications) for r in resumes]
+        matrix = self._membership_matrix(cert_texts, required_certs)
+        
+        return (matrix.sum(axis=1) / len(required_certs)) * 100
+    
+    def _batch_education_match(self, resumes: List[ResumeProfile], jd_data: JDProfile):
+        """Education match per resume; identical education sections are matched once"""
+        req_edu = jd_data.education_required
+        memo = {}
+        values = np.empty(len(resumes))
+        for i, resume_data in enumerate(resumes):
+            resume_edu_list = resume_data.education
+            key = " ".join(resume_edu_list).lower()
+            if key not in memo:
+                memo[key] = self._calculate_education_match(resume_edu_list, req_edu)
+            values[i] = memo[key]
+        return values
+    
+    def _batch_experience_alignment(self, resumes: List[ResumeProfile], jd_data: JDProfile):
+        """Vectorized _calculate_experience_alignment"""
+        exp_texts = [' '.join([str(exp.header) + ' ' + ' '.join(exp.bullets)
+                               for exp in r.experience]).lower() for r in resumes]
+        has_experience = np.array([bool(r.experience) for r in resumes])
+        
+        jd_keywords = list(set(self._normalize_skill(jw) for jw in jd_data.domain_keywords[:25]))
+        # One pass over the texts for the JD keywords and the action verbs
+        hits = self._membership_matrix(exp_texts, jd_keywords + list(self.action_verbs))
+        if not jd_keywords:
+            context_score = np.full(len(resumes), 100.0)
+        else:
+            ratio = hits[:, :len(jd_keywords)].sum(axis=1) / len(jd_keywords)
+            context_score = np.where(ratio > 0.6, 100.0,
+                                     np.where(ratio > 0.3, 85.0, 50 + (ratio * 100)))
+        
+        verb_counts = hits[:, len(jd_keywords):].sum(axis=1)
+        verb_score = np.minimum((verb_counts / 10) * 100, 100.0)
+        
+        scores = np.minimum((context_score * 0.7) + (verb_score * 0.3), 100.0)
+        return np.where(has_experience, scores, 20.0)
+    
+    def _batch_domain_similarity(self, resumes: List[ResumeProfile], jd_data: JDProfile):
+        """Vectorized _calculate_domain_similarity"""
+        jd_keywords = list(set(jd_data.domain_keywords))
+        if not jd_keywords:
+            return np.full(len(resumes), 100.0)
+        
+        resume_texts = [(r.summary + ' ' +
+                         ' '.join([exp.header for exp in r.experience])).lower()
+                        for r in resumes]
+        norm_keywords = [self._normalize_skill(kw) for kw in jd_keywords]
+        hits = self._membership_matrix(resume_texts, jd_keywords + norm_keywords)
+        found = (hits[:, :len(jd_keywords)] | hits[:, len(jd_keywords):]).sum(axis=1)
+        return np.minimum((found / len(jd_keywords)) * 100, 100.0)
+    
+    def _batch_formatting_score(self, resumes: List[ResumeProfile]):
+        """Vectorized _calculate_formatting_score"""
+        issues = np.array([len(r.formatting_issues) for r in resumes])
+        return np.maximum(100.0 - (issues * 15), 0.0)
+    
     def _find_weak_action_verbs(self, resume_data: Dict, jd_data: Dict) -> List[str]:
         """Find weak action verbs in resume"""
         weak_verbs = ['responsible for', 'worked on', 'helped with', 'assisted in']
@@ -1432,6 +2192,7 @@ class ATSEngine:
                 formatted += f"• {desc}\n"
         return formatted
     
+    @timed('report')
     def generate_report(self, resume_data: Dict, jd_data: Dict, score_data: Dict, 
                        gaps: Dict, improvements: Dict, optimized_resume: str,
                        suitability_data: Dict = None) -> str:
@@ -0,0 +1,24 @@
+"""
+ATS Benchmarks
+
+Throughput benchmarks for the engine, document parser and bulk pipeline,
+run on a deterministic synthetic corpus:
+
+    python -m benchmarks run                              # micro + bulk, print results
+    python -m benchmarks run --save-baseline benchmarks/results/baseline.json
+    python -m benchmarks run --baseline benchmarks/results/baseline.json   # exit 1 on regression
+    python -m benchmarks generate --output-dir /tmp/corpus --count 100
+    python -m benchmarks golden-snapshot --output /tmp/golden.json.gz  # before a refactor
+    python -m benchmarks golden-compare --snapshot /tmp/golden.json.gz # after it
+    python -m benchmarks replay --workload data/workload/workload.jsonl --concurrency 8
+
+Modules:
+- corpus: CorpusGenerator, synthetic TXT/DOCX/PDF resumes and JDs
+- micro: per-call timings of the hot engine and parser entry points
+- bulk: end-to-end /api/bulk-analyze throughput
+- baseline: results files, thresholds and regression comparison
+- golden: output snapshots of a fixed corpus and field-by-field
+  equivalence checks of a candidate engine, with per-stage speedups
+- replay: load tests from a recorded workload (workload.py), reporting
+  throughput, latency percentiles and error rates
+"""
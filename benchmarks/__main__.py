@@ -0,0 +1,212 @@
+"""
+Benchmark command line
+
+Usage:
+    python -m benchmarks run [--suite micro|bulk|all] [--baseline FILE] [--save-baseline FILE]
+    python -m benchmarks generate --output-dir DIR [--count N]
+    python -m benchmarks golden-snapshot --output FILE [--engine module:Class]
+    python -m benchmarks golden-compare --snapshot FILE [--candidate module:Class] [--score-tolerance X]
+    python -m benchmarks replay --workload FILE [FILE ...] [--url URL] [--concurrency N] [--pace]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmarks import baseline
+from benchmarks.corpus import FORMATS, SIZES, CorpusGenerator
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def _formats(value):
+    formats = tuple(item.strip().lower() for item in value.split(',') if item.strip())
+    unknown = [item for item in formats if item not in FORMATS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(f"formats must be from {', '.join(FORMATS)}")
+    return formats
+
+
+def print_results(results):
+    print(f"{'benchmark':<28} {'calls':>7} {'median ms':>11} {'p95 ms':>10} {'ops/s':>10}")
+    for name, result in results.items():
+        calls = result.get('calls', result.get('requests'))
+        p95 = result.get('p95_ms')
+        ops = result.get('ops_per_sec', result.get('resumes_per_sec'))
+        print(f"{name:<28} {calls:>7} {result['median_ms']:>11.3f} "
+              f"{(f'{p95:.3f}' if p95 is not None else '-'):>10} {(ops if ops is not None else '-'):>10}")
+
+
+def run(args) -> int:
+    config = {
+        'suite': args.suite, 'count': args.count, 'size': args.size, 'rounds': args.rounds,
+        'batch_sizes': args.batch_sizes, 'formats': list(args.formats), 'seed': args.seed,
+    }
+    progress = None if args.quiet else (lambda name: print(f"  running {name}...", file=sys.stderr))
+    results = {}
+    if args.suite in ('micro', 'all'):
+        from benchmarks import micro
+        results.update(micro.run(args.count, args.size, args.rounds, args.seed, args.formats, progress=progress))
+    if args.suite in ('bulk', 'all'):
+        from benchmarks import bulk
+        results.update(bulk.run(args.batch_sizes, args.size, args.rounds, args.seed, args.formats, progress=progress))
+    
+    report = baseline.make_report(results, config)
+    print_results(results)
+    if args.output:
+        baseline.save(report, args.output)
+        print(f"\nResults saved to {args.output}")
+    if args.save_baseline:
+        baseline.save(report, args.save_baseline)
+        print(f"Baseline saved to {args.save_baseline}")
+    
+    if args.baseline:
+        reference = baseline.load(args.baseline)
+        settings = {key: value for key, value in config.items() if key != 'suite'}
+        recorded = {key: value for key, value in reference['meta'].get('config', {}).items() if key != 'suite'}
+        if recorded != settings:
+            print("\nWarning: baseline was recorded with different settings; comparison may be misleading")
+        rows = baseline.compare(report, reference, baseline.load_thresholds(args.thresholds))
+        print()
+        print(baseline.format_comparison(rows))
+        regressions = [row['name'] for row in rows if row['status'] == 'regression']
+        if regressions:
+            print(f"\nRegression in: {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+def generate(args) -> int:
+    corpus = CorpusGenerator(args.seed)
+    paths = corpus.write_corpus(os.path.join(args.output_dir, 'resumes'), args.count, args.formats, args.size)
+    jd_dir = os.path.join(args.output_dir, 'jds')
+    os.makedirs(jd_dir, exist_ok=True)
+    for index in range(args.jds):
+        with open(os.path.join(jd_dir, f"jd_{index:04d}.txt"), 'w', encoding='utf-8') as f:
+            f.write(corpus.jd_text(index))
+    print(f"Wrote {len(paths)} resumes and {args.jds} job descriptions to {args.output_dir}")
+    return 0
+
+
+def golden_snapshot(args) -> int:
+    from benchmarks import golden
+    data = golden.snapshot(args.engine, args.resumes, args.jds, args.seed, args.rounds)
+    golden.save(data, args.output)
+    cases = len(data['outputs']['cases'])
+    print(f"Snapshot of {cases} resume/JD pairs from {args.engine} saved to {args.output}")
+    return 0
+
+
+def golden_compare(args) -> int:
+    from benchmarks import golden
+    reference = golden.load(args.snapshot)
+    if reference['meta'].get('hash_seed') != os.environ.get('PYTHONHASHSEED'):
+        print("Warning: snapshot was recorded under a different PYTHONHASHSEED; set-derived fields may differ")
+    result = golden.compare(reference, args.candidate, args.score_tolerance, args.rounds, args.retime)
+    print(golden.format_comparison(result))
+    return 0 if result['equivalent'] else 1
+
+
+def replay(args) -> int:
+    from benchmarks import replay as workload_replay
+    entries = workload_replay.load_workload(args.workload, args.limit)
+    if not entries:
+        print("No workload entries found")
+        return 1
+    progress = None if args.quiet else (lambda message: print(f"  {message}...", file=sys.stderr))
+    report = workload_replay.replay(entries, args.url, args.concurrency, args.pace, args.speed,
+                                    args.timeout, args.seed, progress)
+    print(workload_replay.format_report(report))
+    if args.output:
+        baseline.save(report, args.output)
+        print(f"\nResults saved to {args.output}")
+    if args.max_error_rate is not None and report['error_rate'] > args.max_error_rate:
+        print(f"\nError rate {report['error_rate']:.2%} is above {args.max_error_rate:.2%}")
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='ATS engine benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--size', choices=sorted(SIZES), default='medium', help='Resume size preset (default: medium)')
+    common.add_argument('--formats', type=_formats, default=FORMATS, help='Comma-separated file formats (default: txt,docx,pdf)')
+    common.add_argument('--seed', type=int, default=42, help='Corpus seed (default: 42)')
+    
+    run_parser = commands.add_parser('run', parents=[common], help='Run benchmarks')
+    run_parser.add_argument('--suite', choices=['micro', 'bulk', 'all'], default='all')
+    run_parser.add_argument('--count', type=int, default=50, help='Resumes per microbenchmark (default: 50)')
+    run_parser.add_argument('--rounds', type=int, default=3, help='Timed passes per benchmark (default: 3)')
+    run_parser.add_argument('--batch-sizes', type=_int_list, default=[10, 50],
+                            help='Comma-separated bulk batch sizes (default: 10,50)')
+    run_parser.add_argument('--output', help='Save results to this JSON file')
+    run_parser.add_argument('--save-baseline', help='Save results as the baseline JSON file')
+    run_parser.add_argument('--baseline', help='Compare against this baseline; exit 1 on regression')
+    run_parser.add_argument('--thresholds', help='Thresholds JSON (default: benchmarks/thresholds.json)')
+    run_parser.add_argument('--quiet', action='store_true', help='No progress messages')
+    run_parser.set_defaults(func=run)
+    
+    generate_parser = commands.add_parser('generate', parents=[common], help='Write a synthetic corpus to disk')
+    generate_parser.add_argument('--output-dir', required=True)
+    generate_parser.add_argument('--count', type=int, default=100, help='Resumes to write (default: 100)')
+    generate_parser.add_argument('--jds', type=int, default=10, help='Job descriptions to write (default: 10)')
+    generate_parser.set_defaults(func=generate)
+    
+    snapshot_parser = commands.add_parser('golden-snapshot', help='Record reference outputs of the golden corpus')
+    snapshot_parser.add_argument('--output', required=True, help='Snapshot file (.json or .json.gz)')
+    snapshot_parser.add_argument('--engine', default='ats_engine:ATSEngine',
+                                 help='Reference engine as module:Class or file.py:Class (default: ats_engine:ATSEngine)')
+    snapshot_parser.add_argument('--resumes', type=int, default=40, help='Resumes in the corpus (default: 40)')
+    snapshot_parser.add_argument('--jds', type=int, default=4, help='Job descriptions in the corpus (default: 4)')
+    snapshot_parser.add_argument('--seed', type=int, default=2024, help='Corpus seed (default: 2024)')
+    snapshot_parser.add_argument('--rounds', type=int, default=1, help='Timed passes (default: 1)')
+    snapshot_parser.set_defaults(func=golden_snapshot)
+    
+    compare_parser = commands.add_parser('golden-compare', help='Diff a candidate engine against a golden snapshot')
+    compare_parser.add_argument('--snapshot', required=True)
+    compare_parser.add_argument('--candidate', default='ats_engine:ATSEngine',
+                                help='Engine to check as module:Class or file.py:Class (default: ats_engine:ATSEngine)')
+    compare_parser.add_argument('--score-tolerance', type=float, default=0.0,
+                                help='Allowed absolute total_score difference (default: 0)')
+    compare_parser.add_argument('--rounds', type=int, default=1, help='Timed passes (default: 1)')
+    compare_parser.add_argument('--retime', metavar='ENGINE',
+                                help='Time this engine now for the speedup instead of using the snapshot timings')
+    compare_parser.set_defaults(func=golden_compare)
+    
+    replay_parser = commands.add_parser('replay', help='Replay a recorded workload (WORKLOAD_LOG) for load testing')
+    replay_parser.add_argument('--workload', nargs='+', required=True,
+                               help='Workload log files, oldest first (e.g. workload.jsonl.1 workload.jsonl)')
+    replay_parser.add_argument('--url', help='Base URL of a running server (default: the app in-process)')
+    replay_parser.add_argument('--concurrency', type=int, default=4, help='Requests in flight (default: 4)')
+    replay_parser.add_argument('--limit', type=int, help='Replay at most this many requests')
+    replay_parser.add_argument('--pace', action='store_true', help='Keep the recorded gaps between requests')
+    replay_parser.add_argument('--speed', type=float, default=1.0, help='Pace multiplier (default: 1.0)')
+    replay_parser.add_argument('--timeout', type=float, default=300.0, help='Per-request timeout in seconds (default: 300)')
+    replay_parser.add_argument('--seed', type=int, default=42, help='Seed of the stand-in documents (default: 42)')
+    replay_parser.add_argument('--max-error-rate', type=float, help='Exit 1 when the error rate is above this (0-1)')
+    replay_parser.add_argument('--output', help='Save the report to this JSON file')
+    replay_parser.add_argument('--quiet', action='store_true', help='No progress messages')
+    replay_parser.set_defaults(func=replay)
+    
+    args = parser.parse_args(argv)
+    if args.func in (golden_snapshot, golden_compare) and os.environ.get('PYTHONHASHSEED') != _golden_hash_seed():
+        # Set iteration order depends on string hashing; pin it and start over
+        env = dict(os.environ, PYTHONHASHSEED=_golden_hash_seed())
+        argv = sys.argv[1:] if argv is None else list(argv)
+        return subprocess.call([sys.executable, '-m', 'benchmarks'] + argv, env=env)
+    return args.func(args)
+
+
+def _golden_hash_seed() -> str:
+    from benchmarks.golden import HASH_SEED
+    return HASH_SEED
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Benchmark Results, Baselines and Regression Checks
+
+A results file is JSON: {'meta': {...}, 'results': {benchmark: {...}}}.
+Every benchmark reports 'median_ms' (per call for microbenchmarks, per
+resume for bulk runs) and that is what is compared: a benchmark regresses
+when it is slower than the baseline by more than its threshold.
+
+Thresholds are fractions of the baseline time, e.g. {"default": 0.25,
+"parse_file_pdf": 0.5}. Timings only compare on the same machine, so keep
+one baseline per machine (or CI runner type).
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_THRESHOLDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thresholds.json')
+DEFAULT_THRESHOLD = 0.25
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def make_report(results: Dict[str, Dict], config: Dict) -> Dict:
+    """Results with the metadata needed to judge whether two runs are comparable"""
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'numpy': 'numpy' in sys.modules,
+            'config': config,
+        },
+        'results': results,
+    }
+
+
+def save(report: Dict, path: str):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    if not isinstance(report, dict) or not isinstance(report.get('results'), dict):
+        raise ValueError(f"{path} is not a benchmark results file")
+    return report
+
+
+def load_thresholds(path: Optional[str] = None) -> Dict[str, float]:
+    """Thresholds from `path` (default: benchmarks/thresholds.json), with a 'default' entry"""
+    path = path or DEFAULT_THRESHOLDS_FILE
+    thresholds = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            thresholds = {key: float(value) for key, value in json.load(f).items() if not key.startswith('_')}
+    thresholds.setdefault('default', DEFAULT_THRESHOLD)
+    return thresholds
+
+
+def compare(current: Dict, baseline: Dict, thresholds: Dict[str, float]) -> List[Dict]:
+    """
+    Compare two results files benchmark by benchmark
+    
+    Args:
+        current: Results of this run
+        baseline: Results to compare against
+        thresholds: {benchmark or 'default': allowed slowdown as a fraction}
+    
+    Returns:
+        Rows {'name', 'baseline_ms', 'current_ms', 'change', 'threshold',
+        'status'}; status is 'ok', 'improved', 'regression', 'new' (no
+        baseline) or 'missing' (not run this time)
+    """
+    rows = []
+    current_results, baseline_results = current['results'], baseline['results']
+    for name in list(baseline_results) + [name for name in current_results if name not in baseline_results]:
+        threshold = thresholds.get(name, thresholds['default'])
+        before = baseline_results.get(name, {}).get('median_ms')
+        after = current_results.get(name, {}).get('median_ms')
+        row = {'name': name, 'baseline_ms': before, 'current_ms': after, 'change': None, 'threshold': threshold}
+        if after is None:
+            row['status'] = 'missing'
+        elif not before:
+            row['status'] = 'new'
+        else:
+            row['change'] = round(after / before - 1, 4)
+            if row['change'] > threshold:
+                row['status'] = 'regression'
+            elif row['change'] < -threshold:
+                row['status'] = 'improved'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    """Comparison rows as a text table"""
+    lines = [f"{'benchmark':<28} {'baseline ms':>12} {'current ms':>12} {'change':>9} {'limit':>7}  status"]
+    for row in rows:
+        change = f"{row['change']:+.1%}" if row['change'] is not None else '-'
+        before = f"{row['baseline_ms']:.3f}" if row['baseline_ms'] is not None else '-'
+        after = f"{row['current_ms']:.3f}" if row['current_ms'] is not None else '-'
+        lines.append(f"{row['name']:<28} {before:>12} {after:>12} {change:>9} {row['threshold']:>+7.0%}  {row['status']}")
+    return '\n'.join(lines)
@@ -0,0 +1,97 @@
+"""
+End-to-End Bulk Throughput
+
+Posts generated resumes to /api/bulk-analyze through Flask's test client,
+so a run covers upload handling, text extraction, parsing, near-duplicate
+detection, scoring, the feature store and JSON serialization - everything
+but the network.
+
+The app's SQLite stores are pointed at a temporary directory (unless
+FEATURE_STORE_DB, TALENT_POOL_DB and ANALYSIS_CACHE_DB are already set) so
+benchmark runs never write to data/. That only works if app has not been
+imported yet in this process.
+"""
+
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.corpus import FORMATS, CorpusGenerator
+
+
+def _load_app(directory: str):
+    if 'app' not in sys.modules:
+        for variable, filename in (('FEATURE_STORE_DB', 'feature_store.db'),
+                                   ('TALENT_POOL_DB', 'talent_pool.db'),
+                                   ('ANALYSIS_CACHE_DB', 'analysis_cache.db')):
+            os.environ.setdefault(variable, os.path.join(directory, filename))
+    import app
+    return app.app
+
+
+def run(batch_sizes: List[int] = (10, 50), size: str = 'medium', rounds: int = 3, seed: int = 42,
+        formats=FORMATS, progress: Optional[Callable[[str], None]] = print) -> Dict[str, Dict]:
+    """
+    Time bulk analyses of each batch size
+    
+    Args:
+        batch_sizes: Resumes per request
+        size: Resume size preset
+        rounds: Timed requests per batch size (after one warm-up request)
+        seed: Corpus seed
+        formats: File formats, cycled through within a batch
+        progress: Called with each benchmark's name before it runs (None for quiet)
+    
+    Returns:
+        {'bulk_<n>': {'resumes', 'requests', 'median_s', 'min_s',
+        'resumes_per_sec', 'median_ms'}}, where median_ms is per resume
+    """
+    directory = tempfile.mkdtemp(prefix='ats_bench_')
+    client = _load_app(directory).test_client()
+    corpus = CorpusGenerator(seed)
+    jd_text = corpus.jd_text(0)
+    
+    results = {}
+    for batch_size in batch_sizes:
+        name = f"bulk_{batch_size}"
+        if progress:
+            progress(name)
+        batch_dir = os.path.join(directory, name)
+        files = []
+        for path in corpus.write_corpus(batch_dir, batch_size, formats, size):
+            with open(path, 'rb') as f:
+                files.append((f.read(), os.path.basename(path)))
+        
+        durations = []
+        for attempt in range(rounds + 1):
+            data = {
+                'jd_text': jd_text,
+                # Generated resumes are all distinct, but don't let dedupe hide work
+                'dedupe': 'false',
+                'resume_files': [(io.BytesIO(content), filename) for content, filename in files],
+            }
+            start = time.perf_counter()
+            response = client.post('/api/bulk-analyze', data=data, content_type='multipart/form-data')
+            elapsed = time.perf_counter() - start
+            if response.status_code != 200:
+                raise RuntimeError(f"{name}: /api/bulk-analyze returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+            body = response.get_json()
+            if body.get('failed'):
+                raise RuntimeError(f"{name}: {body['failed']} of {batch_size} resumes failed")
+            if attempt:
+                durations.append(elapsed)
+        
+        median = statistics.median(durations)
+        results[name] = {
+            'resumes': batch_size,
+            'requests': len(durations),
+            'median_s': round(median, 4),
+            'min_s': round(min(durations), 4),
+            'resumes_per_sec': round(batch_size / median, 2),
+            'median_ms': round(median * 1000 / batch_size, 4),
+        }
+    return results
@@ -0,0 +1,253 @@
+"""
+Synthetic Resume and JD Corpus
+
+Deterministic generator of realistic resumes (TXT, DOCX or PDF) and job
+descriptions for benchmarks. Skills come from the engine's own
+vocabulary - ATSEngine.skill_categories, which already includes
+data/universal_skills.json - so generated documents exercise the same
+matching paths real uploads do.
+
+The same seed, index and size always give the same document text.
+"""
+
+import os
+import random
+from typing import List, Optional
+
+# Resume size presets (small is about half a page, large about three pages)
+SIZES = {
+    'small': {'roles': 1, 'bullets': 3, 'skills': 8, 'projects': 0, 'summary_sentences': 1},
+    'medium': {'roles': 3, 'bullets': 5, 'skills': 15, 'projects': 2, 'summary_sentences': 2},
+    'large': {'roles': 6, 'bullets': 8, 'skills': 30, 'projects': 4, 'summary_sentences': 4},
+}
+
+FORMATS = ('txt', 'docx', 'pdf')
+
+_FIRST_NAMES = ['Avery', 'Jordan', 'Priya', 'Mateo', 'Chen', 'Fatima', 'Liam', 'Sofia', 'Kwame', 'Hana',
+                'Diego', 'Amara', 'Noah', 'Ingrid', 'Ravi', 'Yusuf', 'Elena', 'Tomasz', 'Mei', 'Olivia']
+_LAST_NAMES = ['Nguyen', 'Okafor', 'Schmidt', 'Patel', 'Garcia', 'Kowalski', 'Haddad', 'Tanaka', 'Silva',
+               'Johansson', 'Mensah', 'Rossi', 'Kim', 'Murphy', 'Ibrahim', 'Novak', 'Costa', 'Lee']
+_COMPANIES = ['Northwind', 'Contoso', 'Globex', 'Initech', 'Umbrella Health', 'Stark Industries', 'Wayne Logistics',
+              'Acme Corp', 'Hooli', 'Vandelay Industries', 'Soylent Foods', 'Cyberdyne Systems']
+_LEVELS = ['Junior', 'Associate', '', 'Senior', 'Lead', 'Principal']
+_OUTCOMES = ['reducing costs by {n}%', 'improving throughput by {n}%', 'cutting turnaround time by {n}%',
+             'serving {n}k users', 'saving {n} hours per week', 'increasing accuracy by {n}%']
+_DEGREES = ["Bachelor of Science in {field}", "Master of Science in {field}", "MBA", "PhD in {field}",
+            "Bachelor of Arts in {field}", "Associate Degree in {field}"]
+_CERTIFICATIONS = ['PMP', 'AWS Certified Solutions Architect', 'CKA', 'Six Sigma Green Belt', 'CPA', 'SHRM-CP',
+                   'CCNA', 'Scrum Master (CSM)', 'ITIL Foundation', 'CISSP']
+
+
+class CorpusGenerator:
+    """Deterministic resumes and job descriptions drawn from the engine's skill vocabulary"""
+    
+    def __init__(self, seed: int = 42, engine=None):
+        """
+        Args:
+            seed: Base seed; each document is seeded from it and its index
+            engine: ATSEngine whose skill_categories and action_verbs are
+                used (a new one by default)
+        """
+        if engine is None:
+            from ats_engine import ATSEngine
+            engine = ATSEngine()
+        self.seed = seed
+        # Sorted so the vocabulary order never depends on dict or JSON order
+        self.categories = {}
+        for category, skills in sorted(engine.skill_categories.items()):
+            skills = sorted({skill for skill in skills if isinstance(skill, str) and skill.strip()})
+            if len(skills) >= 5:
+                self.categories[category] = skills
+        self.category_names = sorted(self.categories)
+        self.soft_skills = self.categories.get('professional', ['communication', 'leadership', 'teamwork'])
+        self.action_verbs = sorted(engine.action_verbs)
+    
+    def _rng(self, kind: str, index: int) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}:{index}")
+    
+    def _category(self, rng: random.Random, category: Optional[str]) -> str:
+        return category if category in self.categories else rng.choice(self.category_names)
+    
+    def resume_text(self, index: int, size: str = 'medium', category: Optional[str] = None) -> str:
+        """
+        Plain-text resume
+        
+        Args:
+            index: Document number (different index, different resume)
+            size: 'small', 'medium' or 'large'
+            category: Skill category to draw from (random if None)
+        
+        Returns:
+            Resume text with the usual sections
+        """
+        if size not in SIZES:
+            raise ValueError(f"Unknown size: {size}. Choose from {', '.join(SIZES)}")
+        shape = SIZES[size]
+        rng = self._rng('resume', index)
+        category = self._category(rng, category)
+        domain = self.categories[category]
+        # Mostly in-domain skills with a few from a neighbouring category
+        other = self.categories[rng.choice(self.category_names)]
+        skills = rng.sample(domain, min(len(domain), shape['skills'] * 3 // 4))
+        skills += [skill for skill in rng.sample(other, min(len(other), shape['skills'] // 4)) if skill not in skills]
+        field = category.replace('_', ' ').title()
+        name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+        years = rng.randint(1, 20)
+        
+        lines = [
+            name,
+            f"{name.lower().replace(' ', '.')}{index}@example.com | (555) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
+            f" | linkedin.com/in/{name.lower().replace(' ', '-')}-{index}",
+            '',
+            'PROFESSIONAL SUMMARY',
+        ]
+        summary = [f"{field} professional with {years} years of experience in "
+                   f"{', '.join(skills[:3])}."]
+        for _ in range(shape['summary_sentences'] - 1):
+            summary.append(f"Known for {rng.choice(self.soft_skills)} and {rng.choice(self.soft_skills)}, "
+                           f"with a track record of {rng.choice(_OUTCOMES).format(n=rng.randint(10, 60))}.")
+        lines.append(' '.join(summary))
+        
+        lines += ['', 'SKILLS', ', '.join(skills)]
+        
+        lines += ['', 'EXPERIENCE']
+        end_year = 2024
+        for role in range(shape['roles']):
+            start_year = end_year - rng.randint(1, 4)
+            level = rng.choice(_LEVELS)
+            title = f"{level} {field} Specialist".strip() if rng.random() < 0.5 else f"{level} {field} Engineer".strip()
+            end = 'Present' if role == 0 else str(end_year)
+            lines.append(f"{title} - {rng.choice(_COMPANIES)} | {start_year} - {end}")
+            for _ in range(shape['bullets']):
+                verb = rng.choice(self.action_verbs).capitalize()
+                used = rng.sample(skills, min(2, len(skills)))
+                lines.append(f"• {verb} {' and '.join(used)} solutions, "
+                             f"{rng.choice(_OUTCOMES).format(n=rng.randint(5, 80))}")
+            end_year = start_year
+        
+        lines += ['', 'EDUCATION', f"{rng.choice(_DEGREES).format(field=field)} - State University, {end_year - rng.randint(0, 3)}"]
+        
+        certifications = rng.sample(_CERTIFICATIONS, rng.randint(0, 2))
+        if certifications:
+            lines += ['', 'CERTIFICATIONS'] + certifications
+        
+        if shape['projects']:
+            lines += ['', 'PROJECTS']
+            for project in range(shape['projects']):
+                used = rng.sample(skills, min(3, len(skills)))
+                lines.append(f"{field} Project {project + 1}")
+                lines.append(f"• {rng.choice(self.action_verbs).capitalize()} a prototype using "
+                             f"{', '.join(used)}")
+        
+        return '\n'.join(lines) + '\n'
+    
+    def jd_text(self, index: int, category: Optional[str] = None) -> str:
+        """
+        Job description with mandatory and preferred skills, experience,
+        education and responsibilities
+        
+        Args:
+            index: Document number
+            category: Skill category to draw from (random if None)
+        """
+        rng = self._rng('jd', index)
+        category = self._category(rng, category)
+        domain = self.categories[category]
+        field = category.replace('_', ' ').title()
+        mandatory = rng.sample(domain, min(len(domain), rng.randint(4, 8)))
+        preferred = [skill for skill in rng.sample(domain, min(len(domain), 6)) if skill not in mandatory][:4]
+        
+        lines = [
+            f"{rng.choice(_LEVELS[2:]) or 'Senior'} {field} Engineer - {rng.choice(_COMPANIES)}",
+            '',
+            f"We are looking for a {field.lower()} engineer to join a growing team.",
+            '',
+            'Requirements:',
+            f"- Must have: {', '.join(mandatory)}",
+            f"- {rng.randint(2, 10)}+ years of experience",
+            f"- {rng.choice(['Bachelor', 'Master'])}'s degree in {field} or a related field",
+            f"- Strong {rng.choice(self.soft_skills)} skills",
+            '',
+            f"Preferred: {', '.join(preferred)}",
+        ]
+        if rng.random() < 0.5:
+            lines.append(f"{rng.choice(_CERTIFICATIONS)} certification preferred")
+        lines += ['', 'Responsibilities:']
+        for _ in range(rng.randint(4, 7)):
+            used = rng.sample(mandatory, min(2, len(mandatory)))
+            lines.append(f"- {rng.choice(self.action_verbs).capitalize()} {' and '.join(used)} workstreams")
+        return '\n'.join(lines) + '\n'
+    
+    def write_resume(self, path: str, index: int, size: str = 'medium', category: Optional[str] = None) -> str:
+        """
+        Write a resume as TXT, DOCX or PDF, chosen by the extension of `path`
+        
+        Returns:
+            path
+        """
+        text = self.resume_text(index, size, category)
+        extension = os.path.splitext(path)[1].lower().lstrip('.')
+        if extension == 'txt':
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        elif extension == 'docx':
+            _write_docx(path, text)
+        elif extension == 'pdf':
+            _write_pdf(path, text)
+        else:
+            raise ValueError(f"Unsupported format: {extension}. Choose from {', '.join(FORMATS)}")
+        return path
+    
+    def write_corpus(self, directory: str, count: int, formats=FORMATS, size: str = 'medium') -> List[str]:
+        """
+        Write `count` resumes to `directory`, cycling through `formats`
+        
+        Returns:
+            File paths in index order
+        """
+        os.makedirs(directory, exist_ok=True)
+        return [
+            self.write_resume(os.path.join(directory, f"resume_{index:05d}.{formats[index % len(formats)]}"), index, size)
+            for index in range(count)
+        ]
+
+
+def _write_docx(path: str, text: str):
+    try:
+        from docx import Document
+    except ImportError:
+        raise RuntimeError("python-docx is required to generate DOCX resumes. Install with: pip install python-docx")
+    from datetime import datetime
+    document = Document()
+    for line in text.splitlines():
+        if line.isupper() and line.strip():
+            document.add_heading(line.title(), level=2)
+        else:
+            document.add_paragraph(line)
+    # Fixed metadata so the same text gives the same file
+    document.core_properties.created = document.core_properties.modified = datetime(2024, 1, 1)
+    document.save(path)
+
+
+def _write_pdf(path: str, text: str):
+    try:
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
+    except ImportError:
+        raise RuntimeError("reportlab is required to generate PDF resumes. Install with: pip install reportlab")
+    from reportlab.lib.utils import simpleSplit
+    width, height = letter
+    margin = 54
+    pdf = canvas.Canvas(path, pagesize=letter, invariant=1)
+    y = height - margin
+    for line in text.splitlines():
+        heading = line.isupper() and line.strip()
+        font, font_size = ('Helvetica-Bold', 12) if heading else ('Helvetica', 10)
+        for part in simpleSplit(line, font, font_size, width - 2 * margin) or ['']:
+            if y < margin:
+                pdf.showPage()
+                y = height - margin
+            pdf.setFont(font, font_size)
+            pdf.drawString(margin, y, part)
+            y -= font_size + 4
+    pdf.save()
@@ -0,0 +1,366 @@
+"""
+Golden-Corpus Equivalence
+
+Proves a refactored engine still produces today's outputs. A snapshot runs
+a fixed corpus (generated resumes and JDs, stored in the snapshot itself)
+through the reference ATSEngine and records every output: parse_resume,
+analyze_job_description, score, suitability, gaps, improvements,
+optimized resume, report and score_batch, plus the time spent per stage.
+A comparison runs the same corpus through a candidate engine, diffs every
+field and reports the speedup per stage. Engines without score_batch (the
+engine before batch scoring) skip that stage, and only outputs present in
+both the snapshot and the candidate's run are compared.
+
+Several engine outputs are built from Python sets, so their order (and,
+where a set is truncated, their content) depends on string hashing. The
+harness therefore runs with a fixed PYTHONHASHSEED, and the list fields in
+UNORDERED_FIELDS are compared as multisets.
+"""
+
+import gzip
+import importlib
+import importlib.util
+import json
+import math
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.corpus import SIZES, CorpusGenerator
+
+# The hash seed snapshots are recorded and compared under
+HASH_SEED = '0'
+
+# List fields whose order comes from set iteration
+UNORDERED_FIELDS = frozenset({
+    'keywords', 'formatting_issues', 'mandatory_skills', 'preferred_skills', 'domain_keywords',
+    'action_verbs', 'required_certifications', 'matched', 'missing', 'missing_mandatory',
+    'missing_key_tools', 'missing_mandatory_skills', 'missing_domain_keywords', 'missing_preferred_skills',
+    'matched_skills', 'missing_skills', 'missing_certifications', 'experience_summary',
+    'keyword_insertions', 'mandatory', 'preferred',
+    'Core Technical Skills', 'Additional Technical Skills', 'Other Competencies',
+})
+
+STAGE_ORDER = ('parse_resume', 'analyze_jd', 'score', 'suitability', 'gaps', 'improvements',
+               'optimize_resume', 'report', 'score_batch')
+
+_REPORT_TIMESTAMP = re.compile(r'^Generated: .*$', re.MULTILINE)
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+def load_engine(spec: str = 'ats_engine:ATSEngine'):
+    """
+    Instantiate an engine class from 'module:Class' or 'path/to/file.py:Class'
+    
+    A file path lets a candidate (e.g. ats_engine.py in a git worktree of
+    another branch) be compared without replacing the working tree. The
+    engine loads data/universal_skills.json relative to its own file, so
+    the file needs a data/ folder next to it.
+    """
+    target, _, class_name = spec.rpartition(':')
+    if not target or not class_name:
+        raise ValueError(f"Engine must be given as module:Class or file.py:Class, got {spec!r}")
+    if target.endswith('.py'):
+        name = 'golden_candidate_' + re.sub(r'\W', '_', os.path.abspath(target))
+        module_spec = importlib.util.spec_from_file_location(name, target)
+        if module_spec is None:
+            raise ValueError(f"Cannot load {target}")
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(target)
+    return getattr(module, class_name)()
+
+
+def normalize(value, key: Optional[str] = None):
+    """
+    Engine output as plain JSON data, with set-ordered lists sorted
+    
+    Args:
+        value: Output of an engine method (records, dicts, lists, scalars)
+        key: Field name the value is stored under
+    """
+    from profiles import to_plain
+    value = to_plain(value)
+    if isinstance(value, dict):
+        return {str(k): normalize(v, str(k)) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [normalize(item) for item in value]
+        if key in UNORDERED_FIELDS:
+            items.sort(key=lambda item: json.dumps(item, sort_keys=True))
+        return items
+    if isinstance(value, float) and not math.isfinite(value):
+        return repr(value)
+    return value
+
+
+def build_corpus(resumes: int = 40, jds: int = 4, seed: int = 2024) -> Dict:
+    """
+    Resume and JD texts for a snapshot
+    
+    Resumes cycle through the size presets; half of them are drawn from a
+    JD's own skill category so strong matches are covered as well as weak
+    ones.
+    """
+    generator = CorpusGenerator(seed)
+    categories = [generator.category_names[(index * 7) % len(generator.category_names)] for index in range(jds)]
+    sizes = sorted(SIZES)
+    return {
+        'jds': [generator.jd_text(index, categories[index]) for index in range(jds)],
+        'resumes': [
+            generator.resume_text(index, sizes[index % len(sizes)], categories[index % jds] if index % 2 else None)
+            for index in range(resumes)
+        ],
+    }
+
+
+class _StageClock:
+    """Seconds and calls per stage"""
+    
+    def __init__(self):
+        self.stages = {}
+    
+    def call(self, stage: str, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        entry = self.stages.setdefault(stage, [0.0, 0])
+        entry[0] += elapsed
+        entry[1] += 1
+        return result
+
+
+def run_pipeline(engine, corpus: Dict, rounds: int = 1) -> Tuple[Dict, Dict]:
+    """
+    Run every resume against every JD through the engine
+    
+    Args:
+        engine: ATSEngine (or a drop-in replacement)
+        corpus: {'resumes': [text], 'jds': [text]}
+        rounds: Timed passes; outputs come from the first, each stage's
+            time is its fastest pass
+    
+    Returns:
+        (outputs, timings) where timings is {stage: {'ms', 'calls'}}
+    """
+    best = {}
+    outputs = None
+    score_batch = getattr(engine, 'score_batch', None)
+    for attempt in range(max(1, rounds)):
+        clock = _StageClock()
+        parsed = [clock.call('parse_resume', engine.parse_resume, text) for text in corpus['resumes']]
+        analyzed = [clock.call('analyze_jd', engine.analyze_job_description, text) for text in corpus['jds']]
+        cases = []
+        batches = []
+        for jd_index, jd_data in enumerate(analyzed):
+            for resume_index, resume_data in enumerate(parsed):
+                score = clock.call('score', engine.calculate_ats_score, resume_data, jd_data)
+                suitability = clock.call('suitability', engine.calculate_suitability, score, resume_data, jd_data)
+                gaps = clock.call('gaps', engine.perform_gap_analysis, resume_data, jd_data)
+                improvements = clock.call('improvements', engine.generate_improvements, resume_data, jd_data, gaps)
+                optimized = clock.call('optimize_resume', engine.optimize_resume, resume_data, jd_data, improvements)
+                report = clock.call('report', engine.generate_report, resume_data, jd_data, score, gaps,
+                                    improvements, optimized, suitability)
+                if attempt == 0:
+                    cases.append({
+                        'resume': resume_index,
+                        'jd': jd_index,
+                        'score': normalize(score),
+                        'suitability': normalize(suitability),
+                        'gaps': normalize(gaps),
+                        'improvements': normalize(improvements),
+                        'optimized_resume': optimized,
+                        'report': _REPORT_TIMESTAMP.sub('Generated: <timestamp>', report),
+                    })
+            if score_batch is not None:
+                batch = clock.call('score_batch', score_batch, parsed, jd_data)
+                if attempt == 0:
+                    batches.append(normalize(batch))
+        if attempt == 0:
+            outputs = {
+                'resumes': [normalize(item) for item in parsed],
+                'jds': [normalize(item) for item in analyzed],
+                'cases': cases,
+            }
+            if score_batch is not None:
+                outputs['score_batch'] = batches
+        for stage, (seconds, calls) in clock.stages.items():
+            if stage not in best or seconds < best[stage][0]:
+                best[stage] = (seconds, calls)
+    timings = {stage: {'ms': round(seconds * 1000, 3), 'calls': calls} for stage, (seconds, calls) in best.items()}
+    return outputs, timings
+
+
+def snapshot(engine_spec: str = 'ats_engine:ATSEngine', resumes: int = 40, jds: int = 4, seed: int = 2024,
+             rounds: int = 1) -> Dict:
+    """
+    Record the reference outputs of a fixed corpus
+    
+    Returns:
+        {'meta', 'corpus', 'outputs', 'timings'}
+    """
+    corpus = build_corpus(resumes, jds, seed)
+    outputs, timings = run_pipeline(load_engine(engine_spec), corpus, rounds)
+    return {
+        'meta': {
+            'engine': engine_spec,
+            'hash_seed': os.environ.get('PYTHONHASHSEED'),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'config': {'resumes': resumes, 'jds': jds, 'seed': seed, 'rounds': rounds},
+        },
+        'corpus': corpus,
+        'outputs': outputs,
+        'timings': timings,
+    }
+
+
+def save(data: Dict, path: str):
+    """Write a snapshot (gzip-compressed if the path ends in .gz)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, sort_keys=True, separators=(',', ':'))
+
+
+def load(path: str) -> Dict:
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or 'outputs' not in data or 'corpus' not in data:
+        raise ValueError(f"{path} is not a golden snapshot")
+    return data
+
+
+def diff(expected, actual, score_tolerance: float = 0.0, path: str = '') -> List[Tuple[str, object, object]]:
+    """
+    Field-by-field differences between two normalized outputs
+    
+    Args:
+        expected: Reference output
+        actual: Candidate output
+        score_tolerance: Allowed absolute difference of total_score fields
+        path: Path of this value, for the report
+    
+    Returns:
+        [(path, expected, actual)]; list indices are written as [i]
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        differences = []
+        for key in list(expected) + [key for key in actual if key not in expected]:
+            child = f"{path}.{key}" if path else key
+            if key not in actual:
+                differences.append((child, expected[key], '<missing>'))
+            elif key not in expected:
+                differences.append((child, '<missing>', actual[key]))
+            else:
+                differences.extend(diff(expected[key], actual[key], score_tolerance, child))
+        return differences
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [(f"{path}.length", len(expected), len(actual))]
+        differences = []
+        for index, (left, right) in enumerate(zip(expected, actual)):
+            differences.extend(diff(left, right, score_tolerance, f"{path}[{index}]"))
+        return differences
+    numeric = (int, float)
+    if isinstance(expected, numeric) and isinstance(actual, numeric) and not isinstance(expected, bool) \
+            and not isinstance(actual, bool):
+        tolerance = score_tolerance if path.endswith('total_score') else 0.0
+        if abs(expected - actual) <= max(tolerance, 1e-9 * max(abs(expected), abs(actual))):
+            return []
+        return [(path, expected, actual)]
+    if isinstance(expected, str) and isinstance(actual, str) and expected != actual and '\n' in expected:
+        return _diff_text(expected, actual, score_tolerance if path.endswith('.report') else 0.0, path)
+    return [] if expected == actual else [(path, expected, actual)]
+
+
+def _diff_text(expected: str, actual: str, tolerance: float, path: str) -> List[Tuple[str, object, object]]:
+    """First differing line of two texts; with a tolerance, numbers within it count as equal"""
+    expected_lines, actual_lines = expected.split('\n'), actual.split('\n')
+    for number, (left, right) in enumerate(zip(expected_lines, actual_lines), 1):
+        if left == right:
+            continue
+        if tolerance and _NUMBER.sub('#', left) == _NUMBER.sub('#', right) and all(
+                abs(float(x) - float(y)) <= tolerance for x, y in zip(_NUMBER.findall(left), _NUMBER.findall(right))):
+            continue
+        return [(f"{path}:line {number}", left, right)]
+    if len(expected_lines) != len(actual_lines):
+        return [(f"{path}.lines", len(expected_lines), len(actual_lines))]
+    return []
+
+
+def compare(reference: Dict, candidate_spec: str = 'ats_engine:ATSEngine', score_tolerance: float = 0.0,
+            rounds: int = 1, retime_spec: Optional[str] = None) -> Dict:
+    """
+    Run a candidate engine on a snapshot's corpus and diff it against the snapshot
+    
+    Args:
+        reference: Snapshot from snapshot() / load()
+        candidate_spec: Engine to check, as for load_engine
+        score_tolerance: Allowed absolute total_score difference
+        rounds: Timed passes per engine
+        retime_spec: Engine to time again now, for speedups measured on
+            this machine (default: use the snapshot's timings)
+    
+    Returns:
+        {'equivalent', 'differences': [(path, expected, actual)],
+        'by_field': {field: count}, 'not_compared': [output], 'speedup': {stage: {...}}}
+    """
+    outputs, timings = run_pipeline(load_engine(candidate_spec), reference['corpus'], rounds)
+    # Outputs only one side produces (e.g. score_batch of an older engine) cannot be compared
+    shared = [key for key in reference['outputs'] if key in outputs]
+    not_compared = sorted(set(reference['outputs']).symmetric_difference(outputs))
+    differences = diff({key: reference['outputs'][key] for key in shared},
+                       {key: outputs[key] for key in shared}, score_tolerance)
+    
+    by_field = {}
+    for path, _, _ in differences:
+        field = re.sub(r'\[\d+\]', '[]', path.split(':line ')[0])
+        by_field[field] = by_field.get(field, 0) + 1
+    
+    reference_timings = reference.get('timings', {})
+    if retime_spec:
+        _, reference_timings = run_pipeline(load_engine(retime_spec), reference['corpus'], rounds)
+    speedup = {}
+    for stage in STAGE_ORDER:
+        before, after = reference_timings.get(stage, {}).get('ms'), timings.get(stage, {}).get('ms')
+        if before is None or after is None:
+            continue
+        speedup[stage] = {'reference_ms': before, 'candidate_ms': after,
+                          'speedup': round(before / after, 3) if after else None}
+    return {
+        'equivalent': not differences,
+        'differences': differences,
+        'by_field': dict(sorted(by_field.items(), key=lambda item: -item[1])),
+        'not_compared': not_compared,
+        'speedup': speedup,
+    }
+
+
+def format_comparison(result: Dict, limit: int = 20) -> str:
+    """Comparison result as text: verdict, differing fields, examples and speedups"""
+    lines = []
+    if result['equivalent']:
+        lines.append("EQUIVALENT: every compared output field matches the snapshot")
+    else:
+        lines.append(f"DIFFERENT: {len(result['differences'])} field differences")
+        lines.append('')
+        lines.append(f"{'field':<70} {'cases':>6}")
+        for field, count in list(result['by_field'].items())[:limit]:
+            lines.append(f"{field[:70]:<70} {count:>6}")
+        lines.append('')
+        lines.append('Examples:')
+        for path, expected, actual in result['differences'][:min(limit, 10)]:
+            lines.append(f"  {path}")
+            lines.append(f"    expected: {json.dumps(expected)[:150]}")
+            lines.append(f"    actual:   {json.dumps(actual)[:150]}")
+    if result.get('not_compared'):
+        lines.append(f"Not compared (produced by only one engine): {', '.join(result['not_compared'])}")
+    if result['speedup']:
+        lines.append('')
+        lines.append(f"{'stage':<18} {'reference ms':>13} {'candidate ms':>13} {'speedup':>9}")
+        for stage, row in result['speedup'].items():
+            speedup = f"{row['speedup']:.2f}x" if row['speedup'] else '-'
+            lines.append(f"{stage:<18} {row['reference_ms']:>13.1f} {row['candidate_ms']:>13.1f} {speedup:>9}")
+    return '\n'.join(lines)
@@ -0,0 +1,107 @@
+"""
+Microbenchmarks
+
+Times the hot engine and parser entry points one call at a time over a
+generated corpus: _extract_skills, parse_resume, analyze_job_description,
+calculate_ats_score, and DocumentParser.parse_file per file format.
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.corpus import FORMATS, CorpusGenerator
+
+
+def measure(func: Callable, inputs: List, rounds: int = 3, warmup: int = 1) -> Dict:
+    """
+    Time func(item) for every item, `rounds` times over the inputs
+    
+    Args:
+        func: Callable taking one input
+        inputs: Inputs, each timed separately
+        rounds: Timed passes over the inputs
+        warmup: Untimed passes first (caches, lazy imports)
+    
+    Returns:
+        {'calls', 'mean_ms', 'median_ms', 'p95_ms', 'min_ms', 'ops_per_sec'}
+    """
+    if not inputs:
+        raise ValueError("No inputs to benchmark")
+    for _ in range(warmup):
+        for item in inputs:
+            func(item)
+    samples = []
+    perf_counter = time.perf_counter
+    for _ in range(rounds):
+        for item in inputs:
+            start = perf_counter()
+            func(item)
+            samples.append(perf_counter() - start)
+    samples.sort()
+    mean = statistics.fmean(samples)
+    return {
+        'calls': len(samples),
+        'mean_ms': round(mean * 1000, 4),
+        'median_ms': round(statistics.median(samples) * 1000, 4),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 4),
+        'min_ms': round(samples[0] * 1000, 4),
+        'ops_per_sec': round(1 / mean, 1) if mean else None,
+    }
+
+
+def run(count: int = 50, size: str = 'medium', rounds: int = 3, seed: int = 42,
+        formats=FORMATS, engine=None, progress: Optional[Callable[[str], None]] = print) -> Dict[str, Dict]:
+    """
+    Run every microbenchmark
+    
+    Args:
+        count: Resumes (and a fifth as many JDs) to generate
+        size: Resume size preset
+        rounds: Timed passes over the corpus per benchmark
+        seed: Corpus seed
+        formats: File formats for the document parsing benchmarks
+        engine: ATSEngine to benchmark (a new one by default)
+        progress: Called with each benchmark's name before it runs (None for quiet)
+    
+    Returns:
+        {benchmark name: measure() result}
+    """
+    from ats_engine import ATSEngine
+    from document_parser import DocumentParser
+    engine = engine or ATSEngine()
+    parser = DocumentParser()
+    corpus = CorpusGenerator(seed, engine)
+    
+    resume_texts = [corpus.resume_text(index, size) for index in range(count)]
+    jd_texts = [corpus.jd_text(index) for index in range(max(1, count // 5))]
+    resumes = [engine.parse_resume(text) for text in resume_texts]
+    jds = [engine.analyze_job_description(text) for text in jd_texts]
+    pairs = [(resume, jds[index % len(jds)]) for index, resume in enumerate(resumes)]
+    
+    benchmarks = [
+        ('extract_skills', engine._extract_skills, resume_texts),
+        ('parse_resume', engine.parse_resume, resume_texts),
+        ('analyze_job_description', engine.analyze_job_description, jd_texts),
+        ('calculate_ats_score', lambda pair: engine.calculate_ats_score(*pair), pairs),
+    ]
+    
+    results = {}
+    for name, func, inputs in benchmarks:
+        if progress:
+            progress(name)
+        results[name] = measure(func, inputs, rounds)
+    
+    with tempfile.TemporaryDirectory(prefix='ats_bench_') as directory:
+        for file_format in formats:
+            name = f"parse_file_{file_format}"
+            if progress:
+                progress(name)
+            paths = [
+                corpus.write_resume(os.path.join(directory, f"resume_{index:05d}.{file_format}"), index, size)
+                for index in range(count)
+            ]
+            results[name] = measure(parser.parse_file, paths, rounds)
+    return results
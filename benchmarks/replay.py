@@ -0,0 +1,312 @@
+"""
+Workload Replay
+
+Replays a workload log recorded by workload.WorkloadRecorder against a
+running server (Flask dev server or gunicorn) or, without a URL, against
+the app in-process through Flask's test client.
+
+The log holds request shapes, not content, so each upload is replaced by
+a generated resume of the same file type closest to the recorded size
+(PDFs: page count), and each JD by a generated JD of the recorded length.
+The same content reference always maps to the same stand-in, so repeated
+uploads in the original traffic stay repeated.
+
+Replays write to the target's stores like real traffic (bulk add_to_pool,
+talent-pool adds): point --url at a staging instance, not production.
+"""
+
+import io
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from benchmarks.corpus import FORMATS, SIZES, CorpusGenerator
+
+
+def load_workload(paths: Iterable[str], limit: Optional[int] = None) -> List[Dict]:
+    """
+    Entries of one or more workload logs, oldest first
+    
+    Args:
+        paths: Log files (pass rotated files oldest first: log.2, log.1, log)
+        limit: Stop after this many entries
+    """
+    entries = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash
+                    continue
+                if isinstance(entry, dict) and entry.get('path'):
+                    entries.append(entry)
+                    if limit and len(entries) >= limit:
+                        return entries
+    return entries
+
+
+class WorkloadSynthesizer:
+    """Stand-in documents matching recorded request shapes"""
+    
+    def __init__(self, seed: int = 42):
+        self.corpus = CorpusGenerator(seed)
+        self._files = {}
+        self._jds = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _index(ref: Optional[str], fallback: int) -> int:
+        return int(ref[:8], 16) if ref else fallback
+    
+    def _document(self, file_format: str, index: int, size: str) -> bytes:
+        with tempfile.TemporaryDirectory(prefix='ats_replay_') as directory:
+            path = self.corpus.write_resume(os.path.join(directory, f"resume.{file_format}"), index, size)
+            with open(path, 'rb') as f:
+                return f.read()
+    
+    def file(self, shape: Dict, fallback: int = 0) -> Tuple[bytes, str]:
+        """(content, filename) standing in for a recorded upload"""
+        file_type = shape.get('type', 'txt')
+        key = (shape.get('ref'), file_type, shape.get('bytes'), shape.get('pages'))
+        with self._lock:
+            cached = self._files.get(key)
+        if cached is not None:
+            return cached
+        index = self._index(shape.get('ref'), fallback)
+        filename = f"resume_{index:08x}.{file_type}"
+        if file_type not in FORMATS:
+            # Rejected by the app either way; keep the size
+            content = b'x' * int(shape.get('bytes') or 1)
+        else:
+            candidates = {size: self._document(file_type, index, size) for size in SIZES}
+            if file_type == 'pdf' and shape.get('pages'):
+                pages = {size: data.count(b'/Type /Page') - data.count(b'/Type /Pages') for size, data in candidates.items()}
+                target = min(candidates, key=lambda size: (abs(pages[size] - shape['pages']),
+                                                           abs(len(candidates[size]) - (shape.get('bytes') or 0))))
+            else:
+                target = min(candidates, key=lambda size: abs(len(candidates[size]) - (shape.get('bytes') or 0)))
+            content = candidates[target]
+        with self._lock:
+            self._files[key] = (content, filename)
+        return content, filename
+    
+    def jd(self, ref: Optional[str], chars: int, fallback: int = 0) -> str:
+        """Generated JD trimmed or extended to `chars` characters"""
+        if not chars:
+            return ''
+        key = (ref, chars)
+        with self._lock:
+            cached = self._jds.get(key)
+        if cached is not None:
+            return cached
+        index = self._index(ref, fallback)
+        text = self.corpus.jd_text(index)
+        extra = 1
+        while len(text) < chars:
+            text += '\n' + self.corpus.jd_text(index + extra).split('\n\n', 1)[-1]
+            extra += 1
+        text = text[:chars]
+        with self._lock:
+            self._jds[key] = text
+        return text
+    
+    def request(self, entry: Dict, position: int = 0) -> Dict:
+        """
+        Request to send for a workload entry
+        
+        Returns:
+            {'method', 'path', 'form', 'files': [(field, content, filename)], 'json'}
+        """
+        options = dict(entry.get('options') or {})
+        jd_text = self.jd(entry.get('jd_ref'), int(entry.get('jd_chars') or 0), position)
+        field = 'resume_file' if entry.get('endpoint') == 'analyze_resume' else 'resume_files'
+        files = [(field, *self.file(shape, position + offset)) for offset, shape in enumerate(entry.get('files') or [])]
+        values = dict(options)
+        if jd_text or entry.get('endpoint') in ('analyze_resume', 'bulk_analyze_resumes', 'search_talent_pool'):
+            values['jd_text'] = jd_text
+        if entry.get('content') == 'json':
+            return {'method': entry.get('method', 'POST'), 'path': entry['path'], 'form': None, 'files': [], 'json': values}
+        return {'method': entry.get('method', 'POST'), 'path': entry['path'], 'form': values, 'files': files, 'json': None}
+
+
+class _HTTPTarget:
+    """A running server, through requests"""
+    
+    def __init__(self, base_url: str, timeout: float):
+        try:
+            import requests
+        except ImportError:
+            raise RuntimeError("The requests package is required to replay against a URL. Install with: pip install requests")
+        self.requests = requests
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.local = threading.local()
+    
+    def send(self, spec: Dict) -> int:
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = self.requests.Session()
+        files = [(field, (filename, content)) for field, content, filename in spec['files']] or None
+        response = session.request(spec['method'], self.base_url + spec['path'], data=spec['form'],
+                                   files=files, json=spec['json'], timeout=self.timeout)
+        return response.status_code
+
+
+class _InProcessTarget:
+    """The app in this process, through Flask test clients (one per thread)"""
+    
+    def __init__(self):
+        from benchmarks.bulk import _load_app
+        self.app = _load_app(tempfile.mkdtemp(prefix='ats_replay_'))
+        self.local = threading.local()
+    
+    def send(self, spec: Dict) -> int:
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        if spec['json'] is not None:
+            response = client.open(spec['path'], method=spec['method'], json=spec['json'])
+        else:
+            data = dict(spec['form'])
+            for field, content, filename in spec['files']:
+                data.setdefault(field, []).append((io.BytesIO(content), filename))
+            response = client.open(spec['path'], method=spec['method'], data=data, content_type='multipart/form-data')
+        return response.status_code
+
+
+def _percentiles(samples: List[float]) -> Dict:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    
+    def percentile(fraction):
+        return round(ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))], 2)
+    
+    return {
+        'p50': percentile(0.50), 'p90': percentile(0.90), 'p95': percentile(0.95), 'p99': percentile(0.99),
+        'max': round(ordered[-1], 2), 'mean': round(statistics.fmean(ordered), 2),
+    }
+
+
+def replay(entries: List[Dict], url: Optional[str] = None, concurrency: int = 4, pace: bool = False,
+           speed: float = 1.0, timeout: float = 300.0, seed: int = 42,
+           progress: Optional[Callable[[str], None]] = None) -> Dict:
+    """
+    Send a workload and measure it
+    
+    Args:
+        entries: Workload entries (load_workload)
+        url: Base URL of a running server; None replays in-process
+        concurrency: Requests in flight at once
+        pace: Keep the recorded gaps between requests (divided by speed)
+            instead of sending as fast as the workers allow
+        speed: Pace multiplier (2.0 replays twice as fast)
+        timeout: Per-request timeout in seconds (URL targets)
+        seed: Seed of the stand-in documents
+        progress: Called with a message while stand-ins are generated
+    
+    Returns:
+        {'requests', 'errors', 'error_rate', 'elapsed_s', 'throughput_rps',
+        'latency_ms', 'status_codes', 'status_changed', 'by_endpoint'}
+    """
+    if not entries:
+        raise ValueError("The workload is empty")
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+    synthesizer = WorkloadSynthesizer(seed)
+    if progress:
+        progress(f"preparing {len(entries)} requests")
+    # Generate stand-ins before the clock starts
+    specs = [synthesizer.request(entry, position) for position, entry in enumerate(entries)]
+    target = _HTTPTarget(url, timeout) if url else _InProcessTarget()
+    
+    first_ts = entries[0].get('ts') or 0
+    outcomes = [None] * len(specs)
+    
+    def send(position: int):
+        if pace and entries[position].get('ts'):
+            delay = (entries[position]['ts'] - first_ts) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+        begin = time.perf_counter()
+        try:
+            status = target.send(specs[position])
+        except Exception as e:
+            status = None
+            error = f"{type(e).__name__}: {e}"
+        else:
+            error = None
+        outcomes[position] = (status, (time.perf_counter() - begin) * 1000, error)
+    
+    if progress:
+        progress(f"replaying at concurrency {concurrency}{' (paced)' if pace else ''}")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, range(len(specs))))
+    elapsed = time.perf_counter() - started
+    
+    status_codes = {}
+    by_endpoint = {}
+    errors = 0
+    status_changed = 0
+    for entry, (status, latency, error) in zip(entries, outcomes):
+        failed = status is None or status >= 500
+        errors += failed
+        key = str(status) if status is not None else 'exception'
+        status_codes[key] = status_codes.get(key, 0) + 1
+        if entry.get('status') is not None and status != entry['status']:
+            status_changed += 1
+        endpoint = by_endpoint.setdefault(entry.get('path'), {'requests': 0, 'errors': 0, 'latencies': []})
+        endpoint['requests'] += 1
+        endpoint['errors'] += failed
+        endpoint['latencies'].append(latency)
+    for endpoint in by_endpoint.values():
+        endpoint['latency_ms'] = _percentiles(endpoint.pop('latencies'))
+        endpoint['error_rate'] = round(endpoint['errors'] / endpoint['requests'], 4)
+    
+    return {
+        'target': url or 'in-process',
+        'concurrency': concurrency,
+        'requests': len(outcomes),
+        'errors': errors,
+        'error_rate': round(errors / len(outcomes), 4),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(outcomes) / elapsed, 2) if elapsed else None,
+        'latency_ms': _percentiles([latency for _, latency, _ in outcomes]),
+        'status_codes': dict(sorted(status_codes.items())),
+        'status_changed': status_changed,
+        'by_endpoint': by_endpoint,
+        'sample_errors': [error for _, _, error in outcomes if error][:5],
+    }
+
+
+def format_report(report: Dict) -> str:
+    """Replay report as text"""
+    latency = report['latency_ms']
+    lines = [
+        f"Target:       {report['target']} (concurrency {report['concurrency']})",
+        f"Requests:     {report['requests']} in {report['elapsed_s']:.2f}s = {report['throughput_rps']} req/s",
+        f"Errors:       {report['errors']} ({report['error_rate']:.2%}); status codes {report['status_codes']}",
+        f"Latency ms:   p50 {latency['p50']}  p90 {latency['p90']}  p95 {latency['p95']}  "
+        f"p99 {latency['p99']}  max {latency['max']}",
+    ]
+    if report['status_changed']:
+        lines.append(f"Note:         {report['status_changed']} requests got a different status than when recorded")
+    lines.append('')
+    lines.append(f"{'endpoint':<28} {'requests':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for path, row in report['by_endpoint'].items():
+        lines.append(f"{path:<28} {row['requests']:>9} {row['errors']:>7} {row['latency_ms']['p50']:>9} "
+                     f"{row['latency_ms']['p95']:>9} {row['latency_ms']['p99']:>9}")
+    for error in report['sample_errors']:
+        lines.append(f"  error: {error}")
+    return '\n'.join(lines)
@@ -0,0 +1,181 @@
+"""
+Corpus Statistics
+
+Document frequencies over the resumes and job descriptions seen so far,
+used by the BM25 keyword scoring mode of ATSEngine.
+
+The statistics are kept in memory and saved as a compact JSON artifact
+(data/corpus_stats.json by default, or CORPUS_STATS_FILE). Updates are
+incremental: new documents are counted in a pending delta which save()
+merges into whatever is on disk, so several worker processes can share
+one artifact without overwriting each other's counts.
+"""
+
+import atexit
+import json
+import math
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no cross-process locking, run a single worker there
+    fcntl = None
+
+
+class CorpusStatistics:
+    """Document frequencies, document count and total length of a corpus"""
+    
+    VERSION = 1
+    
+    # Pending documents / seconds after which add_document saves on its own
+    SAVE_EVERY = 100
+    SAVE_INTERVAL = 10.0
+    
+    def __init__(self, artifact_file: Optional[str] = None):
+        """
+        Load the statistics artifact (an empty corpus if it does not exist yet)
+        
+        Args:
+            artifact_file: JSON artifact path (defaults to CORPUS_STATS_FILE or data/corpus_stats.json)
+        """
+        if artifact_file is None:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            artifact_file = os.environ.get('CORPUS_STATS_FILE') or os.path.join(base_dir, 'data', 'corpus_stats.json')
+        self.artifact_file = artifact_file
+        os.makedirs(os.path.dirname(os.path.abspath(self.artifact_file)), exist_ok=True)
+        
+        self.documents = 0
+        self.total_length = 0
+        self.doc_freq = Counter()
+        self.seen_keys = set()
+        self._reset_pending()
+        self._load()
+        self._last_save = time.monotonic()
+        atexit.register(self.save)
+    
+    def _reset_pending(self):
+        self._pending_documents = 0
+        self._pending_length = 0
+        self._pending_freq = Counter()
+        self._pending_keys = set()
+    
+    def _read_artifact(self) -> Dict:
+        try:
+            with open(self.artifact_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Corpus statistics {self.artifact_file} are corrupt ({e}); delete the file to rebuild them")
+        if data.get('version') != self.VERSION:
+            print(f"Ignoring corpus statistics {self.artifact_file}: unsupported version {data.get('version')}")
+            return {}
+        return data
+    
+    def _load(self):
+        """Replace the in-memory statistics with the artifact plus this process's pending delta"""
+        data = self._read_artifact()
+        self.documents = data.get('documents', 0) + self._pending_documents
+        self.total_length = data.get('total_length', 0) + self._pending_length
+        self.doc_freq = Counter(data.get('doc_freq', {}))
+        self.doc_freq.update(self._pending_freq)
+        self.seen_keys = set(data.get('seen_keys', [])) | self._pending_keys
+    
+    def add_document(self, term_counts: Dict[str, int], key: Optional[str] = None) -> bool:
+        """
+        Count one document
+        
+        Args:
+            term_counts: Term frequencies of the document
+            key: Optional identity (e.g. a content hash); a document whose key
+                was already counted is skipped
+        
+        Returns:
+            True if the document was counted
+        """
+        if key is not None:
+            if key in self.seen_keys:
+                return False
+            self.seen_keys.add(key)
+            self._pending_keys.add(key)
+        
+        length = sum(term_counts.values())
+        self.documents += 1
+        self.total_length += length
+        self.doc_freq.update(term_counts.keys())
+        self._pending_documents += 1
+        self._pending_length += length
+        self._pending_freq.update(term_counts.keys())
+        
+        if (self._pending_documents >= self.SAVE_EVERY or
+                time.monotonic() - self._last_save >= self.SAVE_INTERVAL):
+            self.save()
+        return True
+    
+    def rebuild(self, documents: Iterable[Dict[str, int]]):
+        """Recount the corpus from scratch, e.g. from every resume in the talent pool"""
+        self._reset_pending()
+        self.documents = 0
+        self.total_length = 0
+        self.doc_freq = Counter()
+        self.seen_keys = set()
+        for term_counts in documents:
+            length = sum(term_counts.values())
+            self.documents += 1
+            self.total_length += length
+            self.doc_freq.update(term_counts.keys())
+        self._write(self._snapshot())
+        self._last_save = time.monotonic()
+    
+    def _snapshot(self) -> Dict:
+        return {
+            'version': self.VERSION,
+            'documents': self.documents,
+            'total_length': self.total_length,
+            'doc_freq': dict(self.doc_freq),
+            'seen_keys': sorted(self.seen_keys),
+        }
+    
+    def save(self):
+        """Merge this process's new documents into the artifact"""
+        if not self._pending_documents:
+            return
+        lock_fd = os.open(self.artifact_file + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            # Pick up what other processes saved since our last load
+            self._load()
+            self._write(self._snapshot())
+            self._reset_pending()
+        finally:
+            os.close(lock_fd)
+        self._last_save = time.monotonic()
+    
+    def _write(self, data: Dict):
+        """Write the artifact atomically (temp file + rename)"""
+        directory = os.path.dirname(os.path.abspath(self.artifact_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.corpus_stats.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.artifact_file)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency (never negative)"""
+        df = self.doc_freq.get(term, 0)
+        return math.log(1 + (self.documents - df + 0.5) / (df + 0.5))
+    
+    def average_length(self) -> float:
+        return self.total_length / self.documents if self.documents else 0.0
@@ -0,0 +1,162 @@
+"""
+Near-Duplicate Resume Detection
+
+Applicants resubmit the same resume and agencies send lightly edited
+copies. Each parsed resume gets a MinHash signature over word shingles of
+its normalized content (contact details are left out, so a copy with a
+different name or phone number still matches), and signatures are banded
+into an LSH index so likely duplicates are found without comparing every
+pair.
+
+A candidate pair only counts as a duplicate once its estimated Jaccard
+similarity reaches DUPLICATE_THRESHOLD.
+"""
+
+import hashlib
+import re
+import struct
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class MinHasher:
+    """MinHash signatures and LSH band keys for parsed resumes"""
+    
+    NUM_PERM = 128
+    
+    # 16 bands of 8 rows: pairs at 0.85 similarity share a band ~99% of the
+    # time, pairs at 0.5 only ~6%
+    BANDS = 16
+    ROWS = 8
+    
+    SHINGLE_SIZE = 3
+    DUPLICATE_THRESHOLD = 0.85
+    
+    # Fixed so signatures stored in the talent pool stay comparable
+    SEED = 20240611
+    
+    _PRIME = (1 << 61) - 1
+    _MAX_HASH = (1 << 32) - 1
+    _TOKEN = re.compile(r'[a-z0-9+#.]+')
+    
+    def __init__(self):
+        # Deterministic permutation parameters (a, b) below 2**32, from a hash chain
+        params = []
+        state = str(self.SEED).encode('ascii')
+        while len(params) < 2 * self.NUM_PERM:
+            state = hashlib.blake2b(state, digest_size=32).digest()
+            params.extend(struct.unpack('<8I', state))
+        self._a = [max(1, value) for value in params[:self.NUM_PERM]]
+        self._b = params[self.NUM_PERM:2 * self.NUM_PERM]
+        if np is not None:
+            self._a_np = np.array(self._a, dtype=np.uint64)
+            self._b_np = np.array(self._b, dtype=np.uint64)
+        self._format = f'<{self.NUM_PERM}I'
+    
+    @staticmethod
+    def shingle_text(resume_data) -> str:
+        """The resume content signatures are computed from (no contact details)"""
+        parts = [resume_data.get('summary', '')]
+        for exp in resume_data.get('experience', []):
+            parts.append(exp.get('header', ''))
+            parts.extend(exp.get('bullets', []))
+        for field in ('skills', 'education', 'certifications'):
+            parts.extend(resume_data.get(field, []))
+        for project in resume_data.get('projects', []):
+            parts.extend(str(value) for value in (project.values() if isinstance(project, dict) else [project]))
+        return '\n'.join(part for part in parts if part)
+    
+    def shingles(self, text: str) -> Set[int]:
+        """32-bit hashes of the word shingles of normalized text"""
+        tokens = [token.strip('.') for token in self._TOKEN.findall(text.lower())]
+        tokens = [token for token in tokens if token]
+        if not tokens:
+            return set()
+        size = min(self.SHINGLE_SIZE, len(tokens))
+        return {
+            int.from_bytes(hashlib.blake2b(' '.join(tokens[i:i + size]).encode('utf-8'), digest_size=4).digest(), 'little')
+            for i in range(len(tokens) - size + 1)
+        }
+    
+    def signature(self, resume_data) -> Optional[bytes]:
+        """
+        MinHash signature of a parsed resume
+        
+        Returns:
+            NUM_PERM packed 32-bit minima, or None for a resume without
+            content (never reported as a duplicate)
+        """
+        shingles = self.shingles(self.shingle_text(resume_data))
+        if not shingles:
+            return None
+        if np is not None:
+            values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+            # a, b, values < 2**32, so a * value + b fits in 64 bits
+            hashed = (np.outer(values, self._a_np) + self._b_np) % np.uint64(self._PRIME)
+            minima = (hashed & np.uint64(self._MAX_HASH)).min(axis=0)
+            return minima.astype('<u4').tobytes()
+        minima = [
+            min(((a * value + b) % self._PRIME) & self._MAX_HASH for value in shingles)
+            for a, b in zip(self._a, self._b)
+        ]
+        return struct.pack(self._format, *minima)
+    
+    def similarity(self, first: bytes, second: bytes) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        if np is not None:
+            return float(np.count_nonzero(np.frombuffer(first, dtype='<u4') == np.frombuffer(second, dtype='<u4'))) / self.NUM_PERM
+        return sum(x == y for x, y in zip(struct.unpack(self._format, first), struct.unpack(self._format, second))) / self.NUM_PERM
+    
+    def band_keys(self, signature: bytes) -> List[int]:
+        """One signed 64-bit bucket key per LSH band (the band number is part of the key)"""
+        width = self.ROWS * 4
+        return [
+            int.from_bytes(
+                hashlib.blake2b(bytes([band]) + signature[band * width:(band + 1) * width], digest_size=8).digest(),
+                'little', signed=True
+            )
+            for band in range(self.BANDS)
+        ]
+    
+    def group(self, signatures: List[Optional[bytes]]) -> List[Optional[Tuple[int, float]]]:
+        """
+        Group near-duplicates within a batch
+        
+        The first resume of each group is its representative; later ones are
+        compared against representatives only, so groups do not chain.
+        
+        Args:
+            signatures: Signatures in submission order
+        
+        Returns:
+            Per resume, (representative index, similarity) for a duplicate,
+            or None for a representative
+        """
+        buckets: Dict[int, List[int]] = {}
+        duplicate_of: List[Optional[Tuple[int, float]]] = []
+        for index, signature in enumerate(signatures):
+            if signature is None:
+                duplicate_of.append(None)
+                continue
+            keys = self.band_keys(signature)
+            
+            best = None
+            seen = set()
+            for key in keys:
+                for candidate in buckets.get(key, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    score = self.similarity(signature, signatures[candidate])
+                    if score >= self.DUPLICATE_THRESHOLD and (best is None or score > best[1]):
+                        best = (candidate, score)
+            
+            duplicate_of.append(best)
+            if best is None:
+                for key in keys:
+                    buckets.setdefault(key, []).append(index)
+        return duplicate_of
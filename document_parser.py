@@ -8,7 +8,89 @@ Handles parsing of resume files in multiple formats:
 """
 
 import os
-from typing import Optional
+import unicodedata
+from typing import Callable, List, Optional, Tuple
+
+from stage_timing import timed
+
+
+# Translation tables are built once at import time so normalization is a
+# single C-level pass per document instead of a chain of str.replace calls.
+_BULLET_CHARS = (
+    '\u00b7\u2022\u2023\u2027\u2043\u2219\u25a0\u25a1\u25aa\u25ab\u25b8\u25ba'
+    '\u25c6\u25c7\u25cb\u25cf\u25e6\u2713\u2714\u2756\u27a2\u27a4'
+    '\uf076\uf0a7\uf0b7\uf0d8'  # Symbol/Wingdings private-use bullets from Word
+)
+_DASH_CHARS = '\u2010\u2011\u2012\u2013\u2014\u2015\u2212\ufe58\ufe63\uff0d'
+_SPACE_CHARS = '\u00a0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u202f\u205f\u3000'
+_NEWLINE_CHARS = '\r\v\f\x85\u2028\u2029'
+_DROP_CHARS = '\u00ad\u200b\u200c\u200d\u2060\ufeff'
+
+_NORMALIZE_TABLE = str.maketrans({
+    **{ch: '\u2022' for ch in _BULLET_CHARS},
+    **{ch: '-' for ch in _DASH_CHARS},
+    **{ch: ' ' for ch in _SPACE_CHARS},
+    **{ch: '\n' for ch in _NEWLINE_CHARS},
+    **{ch: None for ch in _DROP_CHARS},
+    '\u2018': "'", '\u2019': "'", '\u201a': "'", '\u201b': "'", '\u2032': "'",
+    '\u201c': '"', '\u201d': '"', '\u201e': '"', '\u201f': '"', '\u2033': '"',
+})
+
+
+@timed('normalize_text')
+def normalize_text(text: str) -> str:
+    """
+    Canonicalize extracted text to a small, predictable alphabet
+    
+    Applies NFKC (ligatures, full-width forms, exotic spaces), then a single
+    translate pass that maps bullet glyphs to one bullet character, dashes to
+    hyphens, smart quotes to ASCII quotes, odd whitespace to plain spaces and
+    newlines, and drops soft hyphens and zero-width characters.
+    """
+    if not text:
+        return ''
+    text = text.replace('\r\n', '\n')
+    if text.isascii():
+        return text.translate(_NORMALIZE_TABLE)
+    return unicodedata.normalize('NFKC', text).translate(_NORMALIZE_TABLE)
+
+
+class ScreeningDocument:
+    """
+    Resume text whose first pages are extracted eagerly and the rest lazily
+    
+    `text` holds the screening pages. `full_text` extracts the remaining
+    pages on first access, so the source file must still exist at that point.
+    """
+    
+    def __init__(self, text: str, page_count: int, pages_loaded: int,
+                 load_remaining: Optional[Callable[[], str]] = None):
+        self.text = text
+        self.page_count = page_count
+        self.pages_loaded = pages_loaded
+        self._load_remaining = load_remaining
+        self._full_text = None if load_remaining else text
+    
+    @property
+    def is_complete(self) -> bool:
+        """True once every page has been extracted"""
+        return self._full_text is not None
+    
+    @property
+    def full_text(self) -> str:
+        """Text of the whole document, extracting unread pages if needed"""
+        if self._full_text is None:
+            remaining = normalize_text(self._load_remaining())
+            self._full_text = '\n'.join(t for t in (self.text, remaining) if t)
+            self._load_remaining = None
+            self.pages_loaded = self.page_count
+        return self._full_text
+    
+    def __str__(self) -> str:
+        return self.text
+    
+    def __len__(self) -> int:
+        return len(self.text)
 
 
 class DocumentParser:
@@ -17,6 +99,18 @@ class DocumentParser:
     def __init__(self):
         self.supported_formats = ['.pdf', '.docx', '.txt']
     
+    def _check_file(self, file_path: str) -> str:
+        """Validate the file and return its lowercase extension"""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        file_ext = os.path.splitext(file_path)[1].lower()
+        
+        if file_ext not in self.supported_formats:
+            raise ValueError(f"Unsupported file format: {file_ext}. Supported formats: {', '.join(self.supported_formats)}")
+        
+        return file_ext
+    
     def parse_file(self, file_path: str) -> str:
         """
         Parse a resume file and extract text
@@ -25,40 +119,76 @@ class DocumentParser:
             file_path: Path to the resume file
             
         Returns:
-            Extracted text content
+            Extracted text content, normalized with normalize_text
             
         Raises:
             ValueError: If file format is not supported
             FileNotFoundError: If file doesn't exist
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        file_ext = os.path.splitext(file_path)[1].lower()
-        
-        if file_ext not in self.supported_formats:
-            raise ValueError(f"Unsupported file format: {file_ext}. Supported formats: {', '.join(self.supported_formats)}")
+        file_ext = self._check_file(file_path)
         
         if file_ext == '.pdf':
-            return self._parse_pdf(file_path)
+            text = self._parse_pdf(file_path)
         elif file_ext == '.docx':
-            return self._parse_docx(file_path)
-        elif file_ext == '.txt':
-            return self._parse_txt(file_path)
+            text = self._parse_docx(file_path)
+        else:
+            text = self._parse_txt(file_path)
+        
+        return normalize_text(text)
+    
+    def parse_screening(self, file_path: str, pages: int = 2) -> ScreeningDocument:
+        """
+        Parse only the first pages of a resume for screening
+        
+        Contact details, summary and skills almost always sit on the first
+        page or two, so long PDFs are only read up to `pages`; the rest is
+        extracted when something asks for `full_text`. DOCX and TXT have no
+        cheap page boundary and are returned complete.
+        
+        Args:
+            file_path: Path to the resume file
+            pages: Number of pages to extract eagerly
+            
+        Returns:
+            ScreeningDocument
+        """
+        file_ext = self._check_file(file_path)
+        
+        if file_ext != '.pdf':
+            text = self.parse_file(file_path)
+            return ScreeningDocument(text, page_count=1, pages_loaded=1)
+        
+        head, page_count = self._extract_pdf_pages(file_path, 0, pages)
+        pages_loaded = min(pages, page_count)
+        load_remaining = None
+        if page_count > pages_loaded:
+            def load_remaining():
+                rest, _ = self._extract_pdf_pages(file_path, pages_loaded, None)
+                return '\n'.join(rest)
+        
+        return ScreeningDocument(normalize_text('\n'.join(head)), page_count, pages_loaded, load_remaining)
     
     def _parse_pdf(self, file_path: str) -> str:
         """Parse PDF file"""
+        text, _ = self._extract_pdf_pages(file_path)
+        return '\n'.join(text)
+    
+    @timed('extract_pdf')
+    def _extract_pdf_pages(self, file_path: str, start: int = 0,
+                           stop: Optional[int] = None) -> Tuple[List[str], int]:
+        """Extract text from pages[start:stop], returning (texts, total page count)"""
         try:
             import pdfplumber
             
             text = []
             with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
+                for page in pdf.pages[start:stop]:
                     extract = page.extract_text()
                     if extract:
                         text.append(extract)
+                page_count = len(pdf.pages)
             
-            return '\n'.join(text)
+            return text, page_count
         except ImportError:
             print("pdfplumber not installed/failed. Attempting PyPDF2...")
             try:
@@ -67,18 +197,20 @@ class DocumentParser:
                 text = []
                 with open(file_path, 'rb') as file:
                     pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
+                    for page in pdf_reader.pages[start:stop]:
                         extract = page.extract_text()
                         if extract:
                             text.append(extract)
+                    page_count = len(pdf_reader.pages)
                 
-                return '\n'.join(text)
+                return text, page_count
             except ImportError:
                 raise ImportError(
                     "PDF parsing requires pdfplumber or PyPDF2. "
                     "Install with: pip install pdfplumber PyPDF2"
                 )
     
+    @timed('extract_docx')
     def _parse_docx(self, file_path: str) -> str:
         """Parse DOCX file"""
         try:
@@ -104,6 +236,7 @@ class DocumentParser:
                 "Install with: pip install python-docx"
             )
     
+    @timed('extract_txt')
     def _parse_txt(self, file_path: str) -> str:
         """Parse TXT file"""
         try:
@@ -124,7 +257,7 @@ class DocumentParser:
         Returns:
             Cleaned text
         """
-        return text.strip()
+        return normalize_text(text).strip()
 
 
 def main():
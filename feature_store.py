@@ -0,0 +1,337 @@
+"""
+Feature Store
+
+Keeps the raw component scores and gate inputs of every (resume, JD) pair
+scored by a bulk analysis, grouped into a requisition. Hiring managers can
+then try different weights or visibility thresholds through
+ATSEngine.rerank without re-running the bulk pipeline.
+
+Requisitions also keep the analyzed JD and each parsed resume, so an
+edited JD can be applied with ATSEngine.rescore_features: only the
+components the edit affects are recomputed and the stored vectors are
+updated in place.
+
+Requisitions hold candidates' contact details and parsed resumes, so they
+expire after FEATURE_STORE_TTL_HOURS (default 720, i.e. 30 days); expired
+ones are deleted whenever a new one is saved. The database defaults to
+data/feature_store.db; override it with the FEATURE_STORE_DB environment
+variable.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import metrics
+from ats_engine import ATSEngine
+from profiles import to_plain
+
+try:
+    import numpy as np
+except ImportError:
+    # ATSEngine.rerank reports the missing dependency
+    np = None
+
+
+class FeatureStore:
+    """SQLite store of per-requisition feature vectors, with an in-memory cache"""
+    
+    COMPONENTS = ATSEngine.SCORE_COMPONENTS
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS requisitions (
+            id TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL,
+            job TEXT,
+            weights TEXT NOT NULL,
+            required TEXT NOT NULL,
+            candidate_count INTEGER NOT NULL,
+            jd_data TEXT
+        );
+        CREATE TABLE IF NOT EXISTS features (
+            requisition_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            candidate TEXT NOT NULL,
+            domain REAL NOT NULL,
+            keyword REAL NOT NULL,
+            formatting REAL NOT NULL,
+            skills REAL NOT NULL,
+            experience REAL NOT NULL,
+            education REAL NOT NULL,
+            certifications REAL NOT NULL,
+            has_all_mandatory INTEGER NOT NULL,
+            resume TEXT,
+            PRIMARY KEY (requisition_id, position)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_requisitions_created_at ON requisitions(created_at);
+    """
+    
+    # Requisitions whose vectors stay loaded as arrays
+    CACHE_SIZE = 16
+    
+    def __init__(self, db_file: Optional[str] = None, ttl_hours: Optional[float] = None):
+        if db_file is None:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            db_file = os.environ.get('FEATURE_STORE_DB') or os.path.join(base_dir, 'data', 'feature_store.db')
+        if ttl_hours is None:
+            ttl_hours = float(os.environ.get('FEATURE_STORE_TTL_HOURS', 720))
+        self.db_file = db_file
+        self.ttl = timedelta(hours=ttl_hours)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_file)), exist_ok=True)
+        
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._upgrade()
+        self._cache = OrderedDict()
+    
+    def _upgrade(self):
+        """Add the JD and resume columns to a store created before they existed"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for table, column in (('requisitions', 'jd_data'), ('features', 'resume')):
+                    columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+                    if column not in columns:
+                        self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+    
+    def _cutoff(self) -> str:
+        """created_at of the oldest unexpired requisition"""
+        return (datetime.now() - self.ttl).isoformat()
+    
+    def save(self, features: Dict, candidates: List[Dict], job: Optional[Dict] = None,
+             resumes: Optional[List[Dict]] = None, jd_data: Optional[Dict] = None) -> str:
+        """
+        Store the features of one scored batch as a new requisition (and drop expired ones)
+        
+        Args:
+            features: Features from ATSEngine.score_features
+            candidates: One summary per resume (name, email, filename...), same order
+            job: Optional JD summary kept with the requisition
+            resumes: Optional parsed resumes, same order; with jd_data they
+                let rescore() apply an edited JD
+            jd_data: Optional analyzed JD the features were computed for
+        
+        Returns:
+            The requisition id
+        """
+        if len(candidates) != len(features['has_all_mandatory']):
+            raise ValueError("One candidate summary is needed per feature vector")
+        if resumes is not None and len(resumes) != len(candidates):
+            raise ValueError("One parsed resume is needed per feature vector")
+        
+        now = datetime.now()
+        requisition_id = f"REQ-{now.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:12]}"
+        components = features['components']
+        rows = [
+            (requisition_id, position, json.dumps(candidate),
+             *(components[name][position] for name in self.COMPONENTS),
+             int(features['has_all_mandatory'][position]),
+             json.dumps(to_plain(resumes[position])) if resumes is not None else None)
+            for position, candidate in enumerate(candidates)
+        ]
+        
+        cutoff = self._cutoff()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "DELETE FROM features WHERE requisition_id IN (SELECT id FROM requisitions WHERE created_at < ?)",
+                    (cutoff,)
+                )
+                self.conn.execute("DELETE FROM requisitions WHERE created_at < ?", (cutoff,))
+                self.conn.execute(
+                    "INSERT INTO requisitions (id, created_at, job, weights, required, candidate_count, jd_data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (requisition_id, now.isoformat(), json.dumps(job), json.dumps(features['weights']),
+                     json.dumps(features['required']), len(candidates),
+                     json.dumps(to_plain(jd_data)) if jd_data is not None else None)
+                )
+                self.conn.executemany(
+                    f"INSERT INTO features (requisition_id, position, candidate, {', '.join(self.COMPONENTS)}, "
+                    f"has_all_mandatory, resume) VALUES ({', '.join('?' * (len(self.COMPONENTS) + 5))})",
+                    rows
+                )
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+            for cached_id in [key for key, cached in self._cache.items() if cached['created_at'] < cutoff]:
+                del self._cache[cached_id]
+        return requisition_id
+    
+    def load(self, requisition_id: str) -> Optional[Dict]:
+        """
+        Feature vectors of a requisition, as arrays ready for ATSEngine.rerank
+        
+        Returns:
+            {'id', 'created_at', 'job', 'candidates', 'features'} or None if unknown or expired
+        """
+        cutoff = self._cutoff()
+        with self.lock:
+            cached = self._cache.get(requisition_id)
+            if cached is not None and cached['created_at'] < cutoff:
+                del self._cache[requisition_id]
+            elif cached is not None:
+                self._cache.move_to_end(requisition_id)
+                metrics.CACHE_REQUESTS.inc(cache='feature_store', result='hit')
+                return self._cache[requisition_id]
+        metrics.CACHE_REQUESTS.inc(cache='feature_store', result='miss')
+        
+        meta = self.conn.execute(
+            "SELECT created_at, job, weights, required FROM requisitions WHERE id = ? AND created_at >= ?",
+            (requisition_id, cutoff)
+        ).fetchone()
+        if not meta:
+            return None
+        
+        rows = self.conn.execute(
+            f"SELECT candidate, {', '.join(self.COMPONENTS)}, has_all_mandatory "
+            f"FROM features WHERE requisition_id = ? ORDER BY position",
+            (requisition_id,)
+        ).fetchall()
+        columns = list(zip(*rows)) if rows else [()] * (len(self.COMPONENTS) + 2)
+        if np is not None:
+            vectors = [np.array(column, dtype=np.float64) for column in columns[1:-1]]
+            has_all_mandatory = np.array(columns[-1], dtype=bool)
+        else:
+            vectors = [list(column) for column in columns[1:-1]]
+            has_all_mandatory = [bool(value) for value in columns[-1]]
+        requisition = {
+            'id': requisition_id,
+            'created_at': meta[0],
+            'job': json.loads(meta[1]),
+            'candidates': [json.loads(candidate) for candidate in columns[0]],
+            'features': {
+                'weights': json.loads(meta[2]),
+                'required': json.loads(meta[3]),
+                'components': dict(zip(self.COMPONENTS, vectors)),
+                'has_all_mandatory': has_all_mandatory,
+            },
+        }
+        
+        with self.lock:
+            self._cache[requisition_id] = requisition
+            self._cache.move_to_end(requisition_id)
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return requisition
+    
+    def rerank(self, engine, requisition_id: str, weights: Dict = None, thresholds: Dict = None,
+               limit: Optional[int] = None) -> Optional[Dict]:
+        """
+        Rank a stored requisition under new weights / thresholds
+        
+        Returns:
+            {'requisition_id', 'weights', 'thresholds', 'total', 'candidates'}
+            with candidates best first, or None if the requisition is unknown
+        """
+        requisition = self.load(requisition_id)
+        if requisition is None:
+            return None
+        
+        ranking = engine.rerank(requisition['features'], weights=weights, thresholds=thresholds)
+        order = ranking['order'] if limit is None else ranking['order'][:max(0, int(limit))]
+        candidates = []
+        for rank, position in enumerate(order, start=1):
+            candidates.append({
+                **requisition['candidates'][position],
+                'rank': rank,
+                'total_score': ranking['total_score'][position],
+                'visibility_status': {
+                    'is_recruiter_visible': ranking['is_perfect_match'][position] or ranking['is_potential_match'][position],
+                    'is_limited_visibility': ranking['is_potential_match'][position],
+                    'is_hidden': ranking['is_hidden'][position],
+                    'contact_details_unlocked': ranking['is_perfect_match'][position],
+                },
+            })
+        
+        return {
+            'requisition_id': requisition_id,
+            'weights': ranking['weights'],
+            'thresholds': ranking['thresholds'],
+            'total': len(ranking['order']),
+            'candidates': candidates,
+        }
+    
+    def rescore(self, engine, requisition_id: str, jd_data: Dict, job: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Apply an edited JD to a stored requisition, in place
+        
+        Args:
+            engine: ATSEngine that scored the requisition
+            requisition_id: Requisition to update
+            jd_data: Analyzed edited job description
+            job: Optional new JD summary (the old one is kept otherwise)
+        
+        Returns:
+            {'requisition_id', 'recomputed'} with the names of the
+            recomputed components, or None if the requisition is unknown
+        """
+        requisition = self.load(requisition_id)
+        if requisition is None:
+            return None
+        
+        old_jd = self.conn.execute("SELECT jd_data FROM requisitions WHERE id = ?", (requisition_id,)).fetchone()[0]
+        rows = self.conn.execute(
+            "SELECT resume FROM features WHERE requisition_id = ? ORDER BY position", (requisition_id,)
+        ).fetchall()
+        if old_jd is None or any(row[0] is None for row in rows):
+            raise ValueError("This requisition was stored without its JD and resumes; run the bulk analysis again")
+        resumes = [json.loads(row[0]) for row in rows]
+        
+        features, recomputed = engine.rescore_features(resumes, json.loads(old_jd), jd_data, requisition['features'])
+        
+        # Only recomputed columns (and the mandatory-skill gate) are rewritten
+        old_required = requisition['features']['required']
+        columns = [name for name in self.COMPONENTS
+                   if name in recomputed or features['required'].get(name) != old_required.get(name)]
+        assignments = [f"{name} = ?" for name in columns] + ["has_all_mandatory = ?", "candidate = ?"]
+        
+        # Candidate summaries keep their missing mandatory skills current
+        mandatory = set(engine._normalize_skill(s) for s in jd_data['mandatory_skills'])
+        candidates = []
+        for candidate, resume_data in zip(requisition['candidates'], resumes):
+            resume_skills = set(engine._normalize_skill(s) for s in resume_data.get('skills', []))
+            candidates.append({**candidate, 'missing_skills': list(mandatory - resume_skills)})
+        
+        updates = [
+            (*(features['components'][name][position] for name in columns),
+             int(features['has_all_mandatory'][position]), json.dumps(candidates[position]),
+             requisition_id, position)
+            for position in range(len(resumes))
+        ]
+        
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "UPDATE requisitions SET weights = ?, required = ?, jd_data = ?, job = COALESCE(?, job) WHERE id = ?",
+                    (json.dumps(features['weights']), json.dumps(features['required']),
+                     json.dumps(to_plain(jd_data)), json.dumps(job) if job is not None else None, requisition_id)
+                )
+                self.conn.executemany(
+                    f"UPDATE features SET {', '.join(assignments)} WHERE requisition_id = ? AND position = ?",
+                    updates
+                )
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+            self._cache.pop(requisition_id, None)
+        
+        return {'requisition_id': requisition_id, 'recomputed': recomputed}
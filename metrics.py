@@ -0,0 +1,379 @@
+"""
+Metrics
+
+A small built-in metrics registry (counters and histograms) rendered in
+the Prometheus text exposition format by the /metrics endpoint.
+
+Under gunicorn every worker process keeps its own values. Set METRICS_DIR
+(or PROMETHEUS_MULTIPROC_DIR) to a directory shared by the workers: each
+process then saves a snapshot there every FLUSH_INTERVAL seconds and at
+exit, and whichever worker serves /metrics adds up all snapshots with its
+own live values. Snapshots are named by process ID and a per-process token,
+so a new worker that reuses an exited worker's PID never overwrites its
+counts. Snapshots of exited workers are folded into metrics_archive.json, so
+counters never go backwards and the directory does not grow with every
+worker restart; clear the directory when the whole server is restarted.
+"""
+
+import atexit
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: snapshots of exited workers are kept instead of folded
+    fcntl = None
+
+# Seconds; engine stages take milliseconds, bulk requests up to minutes
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# metrics_<pid>_<token>.json (metrics_<pid>.json from older versions)
+_SNAPSHOT_FILE = re.compile(r'^metrics_(\d+)(?:_[0-9a-f]+)?\.json$')
+ARCHIVE_FILE = 'metrics_archive.json'
+
+
+class _Metric:
+    """Named metric with a fixed set of labels; values are kept per label combination"""
+    
+    TYPE = None
+    
+    def __init__(self, registry, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.series = {}
+    
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {', '.join(self.labelnames) or '(none)'}")
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f"{self.name} expects labels {', '.join(self.labelnames)}, missing {e}")
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    
+    TYPE = 'counter'
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.registry._check_fork()
+            self.series[key] = self.series.get(key, 0) + amount
+        self.registry._flush_if_due()
+    
+    def _samples(self, series) -> List[Tuple[str, Tuple, float]]:
+        return [(self.name + '_total', key, value) for key, value in sorted(series.items())]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets, with sum and count"""
+    
+    TYPE = 'histogram'
+    
+    def __init__(self, registry, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(registry, name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.registry._check_fork()
+            # Per-bucket (non-cumulative) counts, then sum and count
+            entry = self.series.get(key)
+            if entry is None:
+                entry = self.series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            entry[bisect_left(self.buckets, value)] += 1
+            entry[-2] += value
+            entry[-1] += 1
+        self.registry._flush_if_due()
+    
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block, in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def _samples(self, series) -> List[Tuple[str, Tuple, float]]:
+        samples = []
+        for key, entry in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), entry):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                samples.append((self.name + '_bucket', key + (('le', le),), cumulative))
+            samples.append((self.name + '_sum', key, entry[-2]))
+            samples.append((self.name + '_count', key, entry[-1]))
+        return samples
+
+
+class MetricsRegistry:
+    """Metrics of this process, optionally shared with sibling processes through a directory"""
+    
+    # Seconds between snapshots written to the shared directory
+    FLUSH_INTERVAL = 5.0
+    
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Args:
+            directory: Shared snapshot directory (defaults to METRICS_DIR or
+                PROMETHEUS_MULTIPROC_DIR; None keeps metrics in memory only)
+        """
+        if directory is None:
+            directory = os.environ.get('METRICS_DIR') or os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+        self.directory = directory
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        self.metrics = {}
+        self.lock = threading.RLock()
+        self._pid = os.getpid()
+        self._token = uuid.uuid4().hex[:12]
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+    
+    def _register(self, metric: _Metric) -> _Metric:
+        with self.lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
+    
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(self, name, help_text, labelnames))
+    
+    def histogram(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, help_text, labelnames, buckets))
+    
+    def _check_fork(self):
+        # A worker forked from a process that already counted starts from zero
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._token = uuid.uuid4().hex[:12]
+            for metric in self.metrics.values():
+                metric.series = {}
+    
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.directory, f"metrics_{self._pid}_{self._token}.json")
+    
+    def _flush_if_due(self):
+        if self.directory and time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+    
+    def flush(self):
+        """Save this process's values to the shared directory, and fold in exited workers' snapshots"""
+        if not self.directory:
+            return
+        with self.lock:
+            self._check_fork()
+            data = {
+                name: {
+                    'type': metric.TYPE,
+                    'labelnames': list(metric.labelnames),
+                    'buckets': list(getattr(metric, 'buckets', ())),
+                    'series': [[list(key), value] for key, value in metric.series.items()],
+                }
+                for name, metric in self.metrics.items()
+            }
+            self._last_flush = time.monotonic()
+        self._write(self._snapshot_path(), data)
+        self._fold_exited()
+    
+    def _write(self, path: str, data: Dict):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.metrics.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _read(self, filename: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _running(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            # Exists but belongs to another user
+            return True
+        return True
+    
+    def _fold_exited(self):
+        """
+        Add the snapshots of exited processes to the archive and delete them
+        
+        The archive lists the files it has absorbed, so a snapshot that
+        outlives a crash between the two steps is not counted twice.
+        """
+        if fcntl is None:
+            return
+        lock_fd = os.open(os.path.join(self.directory, '.metrics.lock'), os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            filenames = os.listdir(self.directory)
+            exited = [name for name in filenames
+                      if _SNAPSHOT_FILE.match(name) and not self._running(int(_SNAPSHOT_FILE.match(name).group(1)))]
+            if not exited:
+                return
+            archive = self._read(ARCHIVE_FILE) or {'metrics': {}, 'folded': []}
+            folded = set(archive['folded'])
+            for filename in exited:
+                if filename in folded:
+                    continue
+                snapshot = self._read(filename)
+                if snapshot is None:
+                    continue
+                for name, data in snapshot.items():
+                    stored = archive['metrics'].get(name)
+                    if stored is None or stored['type'] != data.get('type') or stored['buckets'] != data.get('buckets'):
+                        archive['metrics'][name] = stored = dict(data, series=[])
+                    series = {tuple(key): value for key, value in stored['series']}
+                    _add_series(series, data.get('series', []))
+                    stored['series'] = [[list(key), value] for key, value in series.items()]
+                folded.add(filename)
+            # Only names whose files still exist need remembering
+            archive['folded'] = sorted(folded & set(filenames))
+            self._write(os.path.join(self.directory, ARCHIVE_FILE), archive)
+            for filename in exited:
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except FileNotFoundError:
+                    pass
+        finally:
+            os.close(lock_fd)
+    
+    def _collect(self) -> Dict[str, Dict]:
+        """Series of every metric: this process's live values plus other processes' snapshots"""
+        with self.lock:
+            self._check_fork()
+            merged = {name: {key: list(value) if isinstance(value, list) else value
+                             for key, value in metric.series.items()}
+                      for name, metric in self.metrics.items()}
+        if not self.directory:
+            return merged
+        
+        own = os.path.basename(self._snapshot_path())
+        # Read the archive first: a snapshot it absorbed may not be deleted yet
+        archive = self._read(ARCHIVE_FILE) or {'metrics': {}, 'folded': []}
+        snapshots = [archive['metrics']]
+        skip = set(archive['folded']) | {own}
+        for filename in os.listdir(self.directory):
+            if _SNAPSHOT_FILE.match(filename) and filename not in skip:
+                snapshot = self._read(filename)
+                if snapshot is not None:
+                    snapshots.append(snapshot)
+        
+        for snapshot in snapshots:
+            for name, data in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None or metric.TYPE != data.get('type'):
+                    continue
+                if metric.TYPE == 'histogram' and tuple(data.get('buckets', ())) != metric.buckets:
+                    continue
+                _add_series(merged.setdefault(name, {}), data.get('series', []))
+        return merged
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        collected = self._collect()
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {_escape_help(metric.help)}")
+            lines.append(f"# TYPE {name} {metric.TYPE}")
+            for sample_name, key, value in metric._samples(collected.get(name, {})):
+                labels = list(zip(metric.labelnames, key[:len(metric.labelnames)])) + list(key[len(metric.labelnames):])
+                label_text = ','.join(f'{label}="{_escape_label(val)}"' for label, val in labels)
+                lines.append(f"{sample_name}{{{label_text}}} {_format_value(value)}" if label_text
+                             else f"{sample_name} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _add_series(series: Dict, items):
+    """Add snapshot [key, value] items to series (histogram values are lists of counts)"""
+    for key, value in items:
+        key = tuple(key)
+        if isinstance(value, list):
+            entry = series.get(key)
+            if entry is None:
+                series[key] = list(value)
+            else:
+                for i, item in enumerate(value):
+                    entry[i] += item
+        else:
+            series[key] = series.get(key, 0) + value
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        if value == float('inf'):
+            return '+Inf'
+        return repr(value)
+    return str(value)
+
+
+# Process-wide registry used by the application
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'ats_http_requests', 'HTTP requests by route, method and status', ('route', 'method', 'status'))
+HTTP_LATENCY = REGISTRY.histogram(
+    'ats_http_request_duration_seconds', 'HTTP request latency by route', ('route', 'method'))
+STAGE_LATENCY = REGISTRY.histogram(
+    'ats_stage_duration_seconds', 'Duration of document parser and engine stages', ('stage',))
+BULK_BATCH_SIZE = REGISTRY.histogram(
+    'ats_bulk_batch_size', 'Resumes per bulk analysis', (),
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500))
+DOCUMENTS_PARSED = REGISTRY.counter(
+    'ats_documents_parsed', 'Uploaded resumes parsed successfully, by file type', ('file_type',))
+PARSE_FAILURES = REGISTRY.counter(
+    'ats_parse_failures', 'Uploaded resumes that failed to parse, by file type', ('file_type',))
+CACHE_REQUESTS = REGISTRY.counter(
+    'ats_cache_requests', 'Cache lookups by cache and result (hit or miss)', ('cache', 'result'))
+SHORTLIST_WRITE_LATENCY = REGISTRY.histogram(
+    'ats_shortlist_write_duration_seconds', 'Shortlist write latency (lock, transaction and sync)', ('backend',))
+
+
+def file_type(filename: str) -> str:
+    """Lowercase extension used as the file_type label ('none' without one)"""
+    extension = os.path.splitext(filename or '')[1].lower().lstrip('.')
+    return extension or 'none'
@@ -0,0 +1,170 @@
+"""
+Parsed Resume and Job Description Records
+
+Compact, slotted records returned by ATSEngine.parse_resume and
+ATSEngine.analyze_job_description. List fields are stored as tuples of
+interned strings, so the vocabulary shared by thousands of resumes in a
+bulk run (every keyword, skill and section word) is held once.
+
+The records still answer the read-only dictionary protocol
+(profile['skills'], profile.get('summary', '')) for code written against
+the old dicts, and to_dict() gives the plain JSON form the API returns.
+"""
+
+import sys
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Tuple
+
+
+def _strings(values) -> Tuple[str, ...]:
+    """Tuple of interned strings"""
+    return tuple(sys.intern(value) if isinstance(value, str) else value for value in values or ())
+
+
+def to_plain(value):
+    """Records, tuples and nested containers as JSON-ready dicts and lists"""
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    return value
+
+
+class _Record:
+    """Read-only mapping access over the record's fields"""
+    
+    __slots__ = ()
+    
+    # Fields left out of to_dict() and the mapping view while they are None
+    OPTIONAL = ()
+    
+    def _present(self, key) -> bool:
+        return key in self.FIELDS and not (key in self.OPTIONAL and getattr(self, key) is None)
+    
+    def __getitem__(self, key):
+        if not self._present(key):
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key, default=None):
+        return getattr(self, key) if self._present(key) else default
+    
+    def __contains__(self, key) -> bool:
+        return self._present(key)
+    
+    def keys(self):
+        return [name for name in self.FIELDS if self._present(name)]
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.keys()]
+    
+    def to_dict(self) -> Dict:
+        """Plain dict in the shape the engine used to return"""
+        return {name: to_plain(value) for name, value in self.items()}
+
+
+@dataclass(slots=True)
+class ExperienceEntry(_Record):
+    """One role from the experience section"""
+    
+    header: str
+    bullets: Tuple[str, ...] = ()
+    
+    @classmethod
+    def coerce(cls, data) -> 'ExperienceEntry':
+        if isinstance(data, cls):
+            return data
+        return cls(header=sys.intern(str(data.get('header', ''))), bullets=tuple(data.get('bullets', ())))
+
+
+@dataclass(slots=True)
+class ResumeProfile(_Record):
+    """Result of ATSEngine.parse_resume"""
+    
+    contact_info: Dict
+    summary: str
+    skills: Tuple[str, ...]
+    experience: Tuple[ExperienceEntry, ...]
+    education: Tuple[str, ...]
+    certifications: Tuple[str, ...]
+    projects: Tuple[Dict, ...]
+    keywords: Tuple[str, ...]
+    formatting_issues: Tuple[str, ...]
+    # Normalized term frequencies, only filled in BM25 keyword scoring mode
+    keyword_tf: Optional[Dict[str, int]] = None
+    
+    OPTIONAL = ('keyword_tf',)
+    
+    @classmethod
+    def coerce(cls, data) -> 'ResumeProfile':
+        """The record itself, or one built from a parse_resume-shaped dict (e.g. loaded from JSON)"""
+        if isinstance(data, cls):
+            return data
+        return cls(
+            contact_info=dict(data.get('contact_info', {})),
+            summary=data.get('summary', ''),
+            skills=_strings(data.get('skills')),
+            experience=tuple(ExperienceEntry.coerce(exp) for exp in data.get('experience', ())),
+            education=_strings(data.get('education')),
+            certifications=_strings(data.get('certifications')),
+            projects=tuple(data.get('projects', ())),
+            keywords=_strings(data.get('keywords')),
+            formatting_issues=_strings(data.get('formatting_issues')),
+            keyword_tf=data.get('keyword_tf'),
+        )
+
+
+@dataclass(slots=True)
+class JDProfile(_Record):
+    """Result of ATSEngine.analyze_job_description"""
+    
+    mandatory_skills: Tuple[str, ...]
+    preferred_skills: Tuple[str, ...]
+    tools_technologies: Tuple[str, ...]
+    experience_required: str
+    responsibilities: Tuple[str, ...]
+    domain_keywords: Tuple[str, ...]
+    required_certifications: Tuple[str, ...]
+    education_required: str
+    action_verbs: Tuple[str, ...]
+    weighted_keywords: Dict[str, float]
+    # BM25 keyword scoring mode only
+    keyword_idf: Optional[Dict[str, float]] = None
+    average_length: Optional[float] = None
+    # Never filled by analyze_job_description; callers that set it get
+    # certifications scored
+    certifications_required: Optional[Tuple[str, ...]] = None
+    
+    OPTIONAL = ('keyword_idf', 'average_length', 'certifications_required')
+    
+    @classmethod
+    def coerce(cls, data) -> 'JDProfile':
+        """The record itself, or one built from an analyze_job_description-shaped dict"""
+        if isinstance(data, cls):
+            return data
+        certifications_required = data.get('certifications_required')
+        return cls(
+            mandatory_skills=_strings(data.get('mandatory_skills')),
+            preferred_skills=_strings(data.get('preferred_skills')),
+            tools_technologies=_strings(data.get('tools_technologies')),
+            experience_required=data.get('experience_required', ''),
+            responsibilities=_strings(data.get('responsibilities')),
+            domain_keywords=_strings(data.get('domain_keywords')),
+            required_certifications=_strings(data.get('required_certifications')),
+            education_required=data.get('education_required', 'Not specified'),
+            action_verbs=_strings(data.get('action_verbs')),
+            weighted_keywords={sys.intern(k): v for k, v in data.get('weighted_keywords', {}).items()},
+            keyword_idf=data.get('keyword_idf'),
+            average_length=data.get('average_length'),
+            certifications_required=_strings(certifications_required) if certifications_required is not None else None,
+        )
+
+
+for _cls in (ExperienceEntry, ResumeProfile, JDProfile):
+    _cls.FIELDS = tuple(field.name for field in fields(_cls))
+del _cls
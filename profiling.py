@@ -0,0 +1,249 @@
+"""
+Request Profiling
+
+Opt-in cProfile capture of slow requests. A request is profiled when it
+carries an X-Profile-Token header matching the PROFILE_TOKEN environment
+variable (unset: nobody can ask), or when it is picked by
+PROFILE_SAMPLE_RATE (0-1, default 0).
+
+Each profile is saved under a server-generated profile ID in PROFILE_DIR
+(default data/profiles): <id>.pstats for `python -m pstats` or snakeviz, and
+<id>.json with the request ID, route, timing and the top functions by
+cumulative time. Uploaded files are described only by type, size and a
+keyed hash (PROFILE_HASH_KEY, or a key generated into the profile
+directory), so a slow resume can be matched later without its content
+ever being stored, and a known document cannot be checked against it.
+Retention is bounded by PROFILE_MAX_COUNT (default 200) and
+PROFILE_MAX_AGE_HOURS (default 72).
+"""
+
+import cProfile
+import hmac
+import io
+import json
+import os
+import pstats
+import random
+import re
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from workload import content_hasher, load_hash_key
+
+_ID = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+
+class ProfileStore:
+    """Profiles on disk, keyed by profile ID, oldest pruned first"""
+    
+    # Functions listed in each profile's JSON summary
+    TOP_FUNCTIONS = 30
+    
+    def __init__(self, directory: Optional[str] = None, max_count: Optional[int] = None,
+                 max_age_hours: Optional[float] = None):
+        if directory is None:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            directory = os.environ.get('PROFILE_DIR') or os.path.join(base_dir, 'data', 'profiles')
+        if max_count is None:
+            max_count = int(os.environ.get('PROFILE_MAX_COUNT', 200))
+        if max_age_hours is None:
+            max_age_hours = float(os.environ.get('PROFILE_MAX_AGE_HOURS', 72))
+        self.directory = directory
+        self.max_count = max_count
+        self.max_age = max_age_hours * 3600
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def valid_id(value: str) -> bool:
+        """Whether value is usable as a request or profile ID"""
+        return bool(value) and bool(_ID.match(value))
+    
+    @staticmethod
+    def new_id() -> str:
+        """Profile ID; generated here so a client can never overwrite a stored profile"""
+        return uuid.uuid4().hex
+    
+    def _path(self, profile_id: str, extension: str) -> str:
+        if not self.valid_id(profile_id):
+            raise ValueError(f"Invalid profile ID: {profile_id!r}")
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+    
+    def save(self, profile_id: str, profiler: cProfile.Profile, info: Dict) -> Dict:
+        """
+        Write a finished profile and prune old ones
+        
+        Args:
+            profile_id: Key of the profile (from new_id)
+            profiler: Disabled profiler
+            info: Request description (request ID, route, timings, file
+                references) - never the payload
+        
+        Returns:
+            The metadata written next to the profile
+        """
+        stats = pstats.Stats(profiler)
+        info = dict(info, profile_id=profile_id, created_at=time.time(),
+                    top_functions=self._top_functions(stats))
+        os.makedirs(self.directory, exist_ok=True)
+        with self.lock:
+            stats.dump_stats(self._path(profile_id, 'pstats'))
+            self._write_json(self._path(profile_id, 'json'), info)
+            self._prune()
+        return info
+    
+    def _write_json(self, path: str, data: Dict):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    
+    def _top_functions(self, stats: pstats.Stats) -> List[Dict]:
+        rows = []
+        for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({
+                'function': f"{os.path.basename(filename)}:{line}({function})",
+                'calls': calls,
+                'own_ms': round(own * 1000, 3),
+                'cumulative_ms': round(cumulative * 1000, 3),
+            })
+        rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+        return rows[:self.TOP_FUNCTIONS]
+    
+    def _prune(self):
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith('.json')]
+        except FileNotFoundError:
+            return
+        entries = sorted(
+            ((os.path.getmtime(os.path.join(self.directory, name)), name[:-5]) for name in names),
+            reverse=True
+        )
+        cutoff = time.time() - self.max_age
+        for index, (modified, profile_id) in enumerate(entries):
+            if index >= self.max_count or modified < cutoff:
+                self.delete(profile_id)
+    
+    def delete(self, profile_id: str):
+        for extension in ('pstats', 'json'):
+            try:
+                os.remove(self._path(profile_id, extension))
+            except FileNotFoundError:
+                pass
+    
+    def list(self) -> List[Dict]:
+        """Metadata of the stored profiles, newest first (without the function lists)"""
+        profiles = []
+        if not os.path.isdir(self.directory):
+            return profiles
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            info = self.get(name[:-5])
+            if info is not None:
+                info.pop('top_functions', None)
+                profiles.append(info)
+        profiles.sort(key=lambda info: info.get('created_at', 0), reverse=True)
+        return profiles
+    
+    def get(self, profile_id: str) -> Optional[Dict]:
+        """Metadata of one profile, or None"""
+        if not self.valid_id(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id, 'json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+    
+    def stats_path(self, profile_id: str) -> Optional[str]:
+        """Path of the .pstats file, or None"""
+        if not self.valid_id(profile_id):
+            return None
+        path = self._path(profile_id, 'pstats')
+        return path if os.path.exists(path) else None
+    
+    def report(self, profile_id: str, limit: int = 40, sort: str = 'cumulative') -> Optional[str]:
+        """pstats text report of one profile"""
+        path = self.stats_path(profile_id)
+        if path is None:
+            return None
+        output = io.StringIO()
+        pstats.Stats(path, stream=output).strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+
+class RequestProfiler:
+    """Decides which requests to profile and stores what was captured"""
+    
+    def __init__(self, store: Optional[ProfileStore] = None, token: Optional[str] = None,
+                 sample_rate: Optional[float] = None, hash_key: Optional[str] = None):
+        """
+        Args:
+            store: Where profiles go (default ProfileStore())
+            token: Secret that X-Profile-Token must match (default PROFILE_TOKEN)
+            sample_rate: Fraction of requests profiled without the header
+                (default PROFILE_SAMPLE_RATE, 0)
+            hash_key: Key of the upload references (default PROFILE_HASH_KEY,
+                else a key file in the profile directory, created when first needed)
+        """
+        self.store = store or ProfileStore()
+        self.token = token if token is not None else os.environ.get('PROFILE_TOKEN', '')
+        if sample_rate is None:
+            sample_rate = float(os.environ.get('PROFILE_SAMPLE_RATE', 0) or 0)
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self._hash_key = hash_key or os.environ.get('PROFILE_HASH_KEY') or None
+        self._key_lock = threading.Lock()
+    
+    def authorized(self, token: Optional[str]) -> bool:
+        """Whether a request's X-Profile-Token grants profiling and access to profiles"""
+        return bool(self.token) and bool(token) and hmac.compare_digest(token.encode(), self.token.encode())
+    
+    def should_profile(self, token: Optional[str]) -> Optional[str]:
+        """
+        Returns:
+            'requested' or 'sampled' when this request should be profiled, else None
+        """
+        if self.authorized(token):
+            return 'requested'
+        if self.sample_rate and random.random() < self.sample_rate:
+            return 'sampled'
+        return None
+    
+    @staticmethod
+    def start() -> Optional[cProfile.Profile]:
+        """A running profiler, or None if another profiler is already active"""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return None
+        return profiler
+    
+    def _key(self) -> bytes:
+        with self._key_lock:
+            if self._hash_key is None:
+                os.makedirs(self.store.directory, exist_ok=True)
+                self._hash_key = load_hash_key(os.path.join(self.store.directory, '.hash_key'))
+        return self._hash_key.encode('utf-8')
+    
+    def describe_upload(self, file_storage) -> Dict:
+        """
+        Type, size and keyed content reference of an uploaded file
+        
+        The file name can identify the candidate and a plain digest can be
+        checked against a known document, so neither is stored.
+        """
+        stream = file_storage.stream
+        position = stream.tell()
+        stream.seek(0)
+        hasher = content_hasher(self._key())
+        size = 0
+        for chunk in iter(lambda: stream.read(65536), b''):
+            hasher.update(chunk)
+            size += len(chunk)
+        stream.seek(position)
+        extension = os.path.splitext(file_storage.filename or '')[1].lower().lstrip('.')
+        return {'type': extension or 'none', 'bytes': size, 'ref': hasher.hexdigest()}
@@ -2,37 +2,1158 @@
 Shortlist Management System
 
 Stores and manages shortlisted candidates
+
+Two storage backends are available:
+- JSON file (default, fine for small installs)
+- SQLite database with indexed email/phone columns and row-level updates
+
+Select the backend with the `backend` argument or the SHORTLIST_BACKEND
+environment variable ('json' or 'sqlite'). The first time the SQLite
+backend opens an empty database it imports the existing JSON shortlist.
+
+JSON backend tuning: SHORTLIST_COMPACT_JSON=1 writes the snapshot without
+indentation, SHORTLIST_COMMIT_WINDOW_MS (default 2) is how long a write
+waits for others to share its fsync when writes are contending.
 """
 
+import base64
+import bisect
+import copy
 import json
+import math
 import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Tuple
+
+import metrics
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no cross-process locking, run a single worker there
+    fcntl = None
+
+
+def _valid_contact(value) -> bool:
+    """True if a contact field holds a real value (not empty / 'N/A')"""
+    return bool(value) and value != 'N/A'
+
+
+def _phone_digits(phone) -> str:
+    """Normalize phone (remove spaces/dashes) for comparison"""
+    if not _valid_contact(phone):
+        return ''
+    return ''.join(filter(str.isdigit, str(phone)))
+
+
+def _email_key(email) -> str:
+    """Normalize email for duplicate detection ('' if missing)"""
+    if not _valid_contact(email):
+        return ''
+    return str(email).strip().lower()
+
+
+def _score_bucket(score) -> Optional[int]:
+    """Integer bucket for name + score matching; scores < 1 apart land in adjacent buckets"""
+    if not isinstance(score, (int, float)):
+        return None
+    return math.floor(score)
+
+
+def _score_value(entry: Dict) -> float:
+    score = entry.get('total_score', 0)
+    return score if isinstance(score, (int, float)) else 0
+
+
+def _row_revision(entry: Dict) -> int:
+    """Revision of the last write to a row (0 for rows written before revisions existed)"""
+    revision = entry.get('revision', 0)
+    return revision if isinstance(revision, int) else 0
+
+
+def _tombstone(entry: Dict, revision: int) -> Dict:
+    """Change-feed record for a removed row"""
+    return {
+        'id': entry.get('id'),
+        'shortlisted_at': entry.get('shortlisted_at'),
+        'email': entry.get('email'),
+        'revision': revision
+    }
+
+
+# Sort keys accepted by ShortlistManager.get_shortlist_page. Every sort ends
+# with (shortlisted_at, id) so the order is total and cursors stay stable.
+SORT_FIELDS = ('shortlisted_at', 'total_score', 'candidate_name')
+
+
+def _sort_tuple(entry: Dict, sort: str) -> Tuple:
+    """Position of an entry under the given sort key"""
+    tail = (str(entry.get('shortlisted_at') or ''), str(entry.get('id') or ''))
+    if sort == 'total_score':
+        return (float(_score_value(entry)),) + tail
+    if sort == 'candidate_name':
+        return (str(entry.get('candidate_name') or ''),) + tail
+    return tail
+
+
+def _encode_cursor(sort: str, descending: bool, position: Tuple) -> str:
+    """Opaque keyset cursor pointing just past `position`"""
+    raw = json.dumps([sort, descending, list(position)])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def _decode_cursor(cursor: str, sort: str, descending: bool) -> Tuple:
+    try:
+        cursor_sort, cursor_descending, position = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if cursor_sort != sort or cursor_descending != descending:
+        raise ValueError('Cursor does not match the requested sort order')
+    template = _sort_tuple({}, sort)
+    if not isinstance(position, list) or len(position) != len(template):
+        raise ValueError('Invalid cursor')
+    for index, (value, expected) in enumerate(zip(position, template)):
+        if isinstance(expected, float):
+            # Tampered cursors must not reach the stores' comparisons
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError('Invalid cursor')
+            position[index] = float(value)
+        elif not isinstance(value, str):
+            raise ValueError('Invalid cursor')
+    return tuple(position)
+
+
+class ShortlistStatistics:
+    """
+    Running aggregates over the shortlist
+    
+    Stores adjust these by one row at a time (sign=+1 on insert, -1 on
+    removal, -1/+1 around an update), so reading them is O(1).
+    """
+    
+    # (group name, entry field, default when missing)
+    GROUPS = (
+        ('status', 'status', 'unknown'),
+        ('recruiter', 'recruiter_name', 'Unknown'),
+        ('job_title', 'job_title', 'Not specified'),
+    )
+    
+    # Bumped whenever the set of groups changes so stored aggregates get rebuilt
+    VERSION = 2
+    
+    # Separator for the composite recruiter/status key
+    KEY_SEP = '\x1f'
+    
+    def __init__(self):
+        self.total = 0
+        self.score_sum = 0.0
+        self.groups = {name: {} for name, _, _ in self.GROUPS}
+        self.groups['recruiter_status'] = {}
+    
+    @classmethod
+    def group_keys(cls, entry: Dict) -> Dict[str, str]:
+        """Normalized group values for one entry (also used as filter keys)"""
+        return {name: str(entry.get(field) or default) for name, field, default in cls.GROUPS}
+    
+    @classmethod
+    def deltas(cls, entry: Dict, sign: int = 1):
+        """(group, key, count delta, score delta) rows for one entry; group '' is the overall total"""
+        score = _score_value(entry) * sign
+        keys = cls.group_keys(entry)
+        yield ('', '', sign, score)
+        for name, key in keys.items():
+            yield (name, key, sign, score)
+        yield ('recruiter_status', keys['recruiter'] + cls.KEY_SEP + keys['status'], sign, score)
+    
+    def apply(self, entry: Dict, sign: int = 1):
+        for group, key, count, score in self.deltas(entry, sign):
+            self.add(group, key, count, score)
+    
+    def add(self, group: str, key: str, count: int, score: float):
+        if not group:
+            self.total += count
+            self.score_sum += score
+            return
+        bucket = self.groups[group].setdefault(key, [0, 0.0])
+        bucket[0] += count
+        bucket[1] += score
+        if bucket[0] <= 0:
+            del self.groups[group][key]
+    
+    def to_dict(self) -> Dict:
+        def breakdown(group):
+            return {
+                key: {'count': count, 'average_score': round(score / count, 2)}
+                for key, (count, score) in sorted(self.groups[group].items())
+            }
+        
+        recruiters = breakdown('recruiter')
+        for key, (count, _) in self.groups['recruiter_status'].items():
+            recruiter, status = key.rsplit(self.KEY_SEP, 1)
+            if recruiter in recruiters:
+                recruiters[recruiter].setdefault('status_breakdown', {})[status] = count
+        
+        return {
+            'total_shortlisted': self.total,
+            'status_breakdown': {key: count for key, (count, _) in self.groups['status'].items()},
+            'average_score': self.score_sum / self.total if self.total else 0,
+            'recruiter_breakdown': recruiters,
+            'job_title_breakdown': breakdown('job_title')
+        }
+
+
+class JSONShortlistStore:
+    """
+    Shortlist stored as a JSON snapshot plus an append-only operation journal
+    
+    Writes happen inside transaction(), under an exclusive fcntl lock, and
+    their journal lines are appended to `<file>.journal` in one write when
+    the transaction ends, so concurrent gunicorn workers never overwrite
+    each other's changes and a batch costs a single append. Readers replay only the journal bytes they haven't seen yet.
+    Once the journal grows past `compact_every` operations it is folded
+    into the snapshot and truncated. Statistics are derived from the same
+    replay, so the snapshot stays a plain JSON array.
+    
+    Snapshots are written to a temp file, fsynced and renamed into place,
+    so a crash leaves either the old or the new file. Journal appends are
+    made durable by sync(), which batches concurrent writers into one fsync
+    (group commit).
+    
+    Every operation carries a revision number and rows record the revision
+    of their last write. Removals are remembered as tombstones until the
+    next compaction, which starts the new journal with a revision line so
+    the counter keeps increasing.
+    
+    Rows live in an insertion-ordered dict keyed by (id, shortlisted_at),
+    with hash indexes on raw email, normalized email, phone digits,
+    (name, score bucket) and the status/recruiter/job title filter values
+    kept in step on every write, so lookups, duplicate checks and filtered
+    listings don't scan the shortlist.
+    """
+    
+    def __init__(self, storage_file: str, compact_every: int = 500,
+                 compact_json: bool = False, commit_window: float = 0.002):
+        self.storage_file = storage_file
+        self.journal_file = storage_file + '.journal'
+        self.lock_file = storage_file + '.lock'
+        self.compact_every = compact_every
+        self.compact_json = compact_json
+        self.commit_window = commit_window
+        
+        # Group commit bookkeeping: journal appends made by this process / known durable
+        self._appended = 0
+        self._synced = 0
+        self._sync_leader = False
+        self._sync_waiters = 0
+        self._sync_cond = threading.Condition()
+        
+        self._reset([])
+        self._snapshot_sig = None
+        self._journal_offset = 0
+        self._journal_ops = 0
+        self._pending = None
+        
+        os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
+        self._lock_fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        self._ensure_storage_exists()
+    
+    def _ensure_storage_exists(self):
+        """Create storage file if it doesn't exist"""
+        if fcntl:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            if not os.path.exists(self.storage_file):
+                self._save_shortlist([])
+        finally:
+            if fcntl:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+    
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Hold the cross-process lock and bring in-memory state up to date"""
+        if fcntl:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            self._refresh()
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+    
+    @contextmanager
+    def transaction(self):
+        """Exclusive section for read-modify-write operations; its writes reach the journal together"""
+        with self._file_lock(exclusive=True):
+            self._pending = []
+            try:
+                yield
+                if self._pending:
+                    self._write_journal(self._pending)
+            except BaseException:
+                # In-memory rows are ahead of the journal; reload from disk next time
+                self._snapshot_sig = None
+                raise
+            finally:
+                self._pending = None
+    
+    def all(self) -> List[Dict]:
+        with self._file_lock(exclusive=False):
+            return list(self._rows.values())
+    
+    def get_by_email(self, email: str) -> Optional[Dict]:
+        with self._file_lock(exclusive=False):
+            return self._first_by_email(email)
+    
+    def statistics(self) -> Dict:
+        with self._file_lock(exclusive=False):
+            return self._stats.to_dict()
+    
+    def revision(self) -> int:
+        with self._file_lock(exclusive=False):
+            return self._revision
+    
+    def changes(self, since: int) -> Dict:
+        with self._file_lock(exclusive=False):
+            if not self._tombstone_floor <= since <= self._revision:
+                # Removals before the last compaction are gone; caller reloads
+                return {'revision': self._revision, 'changed': [], 'removed': [], 'reset': True}
+            
+            changed = []
+            for key in reversed(self._by_rev):
+                entry = self._rows[key]
+                if _row_revision(entry) <= since:
+                    break
+                changed.append(entry)
+            changed.reverse()
+            removed = [stone for stone in self._tombstones if stone['revision'] > since]
+            return {'revision': self._revision, 'changed': changed, 'removed': removed, 'reset': False}
+    
+    def page(self, filters: Dict[str, str], min_score, max_score, sort: str,
+             descending: bool, after: Optional[Tuple], limit: Optional[int]) -> Tuple[List[Dict], int]:
+        """
+        Filtered, sorted slice of the shortlist
+        
+        Returns:
+            (up to limit + 1 rows after the `after` position, total matching rows)
+        """
+        with self._file_lock(exclusive=False):
+            buckets = sorted((self._by_field.get(item, {}) for item in filters.items()), key=len)
+            if buckets:
+                keys = [key for key in buckets[0] if all(key in bucket for bucket in buckets[1:])]
+            else:
+                keys = self._rows
+            rows = [self._rows[key] for key in keys]
+        
+        if min_score is not None:
+            rows = [entry for entry in rows if _score_value(entry) >= min_score]
+        if max_score is not None:
+            rows = [entry for entry in rows if _score_value(entry) <= max_score]
+        
+        rows.sort(key=lambda entry: _sort_tuple(entry, sort))
+        total = len(rows)
+        if after is not None:
+            positions = [_sort_tuple(entry, sort) for entry in rows]
+            if descending:
+                rows = rows[:bisect.bisect_left(positions, after)]
+            else:
+                rows = rows[bisect.bisect_right(positions, after):]
+        if descending:
+            rows.reverse()
+        if limit is not None:
+            rows = rows[:limit + 1]
+        return rows, total
+    
+    def find_duplicate(self, entry: Dict) -> Optional[Dict]:
+        """Return the first shortlisted row matching entry by email, phone or name + score"""
+        matches = []
+        
+        # Check Email (if valid)
+        email = _email_key(entry.get('email'))
+        if email:
+            matches.extend(self._by_email_key.get(email, ()))
+        
+        # Check Phone (if valid)
+        phone = _phone_digits(entry.get('phone'))
+        if phone:
+            matches.extend(self._by_phone.get(phone, ()))
+        
+        # Check Name + Score (Last resort if no contact info)
+        bucket = _score_bucket(entry.get('total_score', 0))
+        if not email and bucket is not None:
+            name = entry.get('candidate_name')
+            for b in (bucket - 1, bucket, bucket + 1):
+                for key in self._by_name_score.get((name, b), ()):
+                    if abs(self._rows[key].get('total_score', 0) - entry.get('total_score', 0)) < 1:
+                        matches.append(key)
+        
+        if not matches:
+            return None
+        return self._rows[min(matches, key=self._order.__getitem__)]
+    
+    def insert(self, entry: Dict):
+        self._commit({'op': 'insert', 'entry': entry})
+    
+    def delete_by_email(self, email: str) -> int:
+        removed = len(self._by_email.get(email, ()))
+        if removed:
+            self._commit({'op': 'delete', 'email': email})
+        return removed
+    
+    def update_by_email(self, email: str, mutate: Callable[[Dict], None]) -> Optional[Dict]:
+        current = self._first_by_email(email)
+        if current is None:
+            return None
+        candidate = copy.deepcopy(current)
+        mutate(candidate)
+        self._commit({'op': 'update', 'email': email, 'entry': candidate})
+        return candidate
+    
+    # ---- in-memory indexes ----
+    
+    @staticmethod
+    def _row_key(entry: Dict):
+        return (entry.get('id'), entry.get('shortlisted_at'))
+    
+    def _first_key_by_email(self, email: str):
+        keys = self._by_email.get(email)
+        return min(keys, key=self._order.__getitem__) if keys else None
+    
+    def _first_by_email(self, email: str) -> Optional[Dict]:
+        key = self._first_key_by_email(email)
+        return self._rows[key] if key is not None else None
+    
+    def _reset(self, rows: List[Dict]):
+        """Replace all rows and rebuild the indexes"""
+        self._rows = {}
+        self._order = {}
+        self._next_order = 0
+        self._by_email = {}
+        self._by_email_key = {}
+        self._by_phone = {}
+        self._by_name_score = {}
+        self._by_field = {}
+        self._by_rev = {}
+        self._stats = ShortlistStatistics()
+        for entry in rows:
+            self._add_row(entry)
+        
+        # Change feed walks rows newest-revision-first; later writes append to the end
+        self._by_rev = dict.fromkeys(sorted(self._rows, key=lambda key: _row_revision(self._rows[key])))
+        self._revision = max((_row_revision(entry) for entry in self._rows.values()), default=0)
+        self._tombstones = []
+        self._tombstone_floor = self._revision
+    
+    def _index_keys(self, entry: Dict):
+        """(index, value) pairs under which a row is filed"""
+        pairs = [(self._by_email, entry.get('email'))]
+        email = _email_key(entry.get('email'))
+        if email:
+            pairs.append((self._by_email_key, email))
+        else:
+            bucket = _score_bucket(entry.get('total_score', 0))
+            if bucket is not None:
+                pairs.append((self._by_name_score, (entry.get('candidate_name'), bucket)))
+        phone = _phone_digits(entry.get('phone'))
+        if phone:
+            pairs.append((self._by_phone, phone))
+        for item in ShortlistStatistics.group_keys(entry).items():
+            pairs.append((self._by_field, item))
+        return pairs
+    
+    def _index(self, key, entry: Dict):
+        self._stats.apply(entry, 1)
+        self._by_rev.pop(key, None)
+        self._by_rev[key] = None
+        for index, value in self._index_keys(entry):
+            index.setdefault(value, {})[key] = None
+    
+    def _unindex(self, key, entry: Dict):
+        self._stats.apply(entry, -1)
+        self._by_rev.pop(key, None)
+        for index, value in self._index_keys(entry):
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del index[value]
+    
+    def _add_row(self, entry: Dict):
+        key = self._row_key(entry)
+        if key in self._rows:
+            self._drop_row(key)
+        self._rows[key] = entry
+        self._order[key] = self._next_order
+        self._next_order += 1
+        self._index(key, entry)
+    
+    def _drop_row(self, key):
+        entry = self._rows.pop(key)
+        del self._order[key]
+        self._unindex(key, entry)
+    
+    def _replace_row(self, key, entry: Dict):
+        """Swap a row's contents in place, keeping its position"""
+        if self._row_key(entry) != key:
+            self._drop_row(key)
+            self._add_row(entry)
+            return
+        self._unindex(key, self._rows[key])
+        self._rows[key] = entry
+        self._index(key, entry)
+    
+    # ---- journal ----
+    
+    def _commit(self, op: Dict):
+        """Apply one operation and queue its journal line (caller is inside transaction())"""
+        if self._pending is None:
+            raise RuntimeError("Shortlist writes must run inside transaction()")
+        op['rev'] = self._revision + 1
+        if 'entry' in op:
+            op['entry']['revision'] = op['rev']
+        self._pending.append((json.dumps(op) + '\n').encode('utf-8'))
+        self._apply(op)
+    
+    def _write_journal(self, lines: List[bytes]):
+        """Append queued operations in one write, then compact if the journal is long enough"""
+        data = b''.join(lines)
+        fd = os.open(self.journal_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        self._journal_offset += len(data)
+        self._journal_ops += len(lines)
+        self._appended += 1
+        
+        if self._journal_ops >= self.compact_every:
+            try:
+                self._compact()
+            except OSError as e:
+                # The operations are already in the journal; the next write retries
+                print(f"Shortlist compaction failed: {e}")
+    
+    def sync(self):
+        """
+        Wait until this process's journal appends are on disk
+        
+        The first caller becomes the leader and one fsync covers every
+        append made before it. Callers arriving meanwhile wait for that
+        fsync instead of issuing their own. The leader waits
+        `commit_window` first only when there is something to batch:
+        another writer already waiting, or appends made since its own.
+        """
+        with self._sync_cond:
+            target = self._appended
+            while self._synced < target:
+                if self._sync_leader:
+                    self._sync_waiters += 1
+                    try:
+                        self._sync_cond.wait()
+                    finally:
+                        self._sync_waiters -= 1
+                    continue
+                
+                self._sync_leader = True
+                contended = self._sync_waiters > 0 or self._appended > target
+                self._sync_cond.release()
+                try:
+                    if self.commit_window and contended:
+                        time.sleep(self.commit_window)
+                    covered = self._appended
+                    self._fsync_path(self.journal_file)
+                finally:
+                    self._sync_cond.acquire()
+                    self._sync_leader = False
+                    self._sync_cond.notify_all()
+                self._synced = max(self._synced, covered)
+    
+    @staticmethod
+    def _fsync_path(path: str):
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+        except FileNotFoundError:
+            # Replaced by a compaction, which fsynced its own files
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def _replace_file(self, path: str, data: bytes):
+        """Write to a temp file, fsync it and atomically rename it over `path`"""
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, path)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        
+        # Make the rename itself durable (not supported on Windows)
+        try:
+            dir_fd = os.open(os.path.dirname(path) or '.', os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+    
+    def _apply(self, op: Dict):
+        """Apply a journal operation to in-memory rows (replay-safe)"""
+        kind = op.get('op')
+        # Journals written before revisions existed have no 'rev'
+        rev = op.get('rev') or self._revision + 1
+        self._revision = max(self._revision, rev)
+        if 'entry' in op:
+            op['entry'].setdefault('revision', rev)
+        
+        if kind == 'insert':
+            if self._row_key(op['entry']) in self._rows:
+                # Already folded into the snapshot by an interrupted compaction
+                return
+            self._add_row(op['entry'])
+        elif kind == 'delete':
+            for key in list(self._by_email.get(op['email'], ())):
+                self._tombstones.append(_tombstone(self._rows[key], rev))
+                self._drop_row(key)
+        elif kind == 'update':
+            key = self._first_key_by_email(op['email'])
+            if key is not None:
+                self._replace_row(key, op['entry'])
+        elif kind == 'revision':
+            # First line after a compaction: removals up to here are not in the journal
+            self._tombstone_floor = max(self._tombstone_floor, rev)
+    
+    def _snapshot_signature(self):
+        try:
+            st = os.stat(self.storage_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def _refresh(self):
+        """Reload the snapshot if another process compacted, then replay new journal lines"""
+        sig = self._snapshot_signature()
+        try:
+            journal_size = os.path.getsize(self.journal_file)
+        except FileNotFoundError:
+            journal_size = 0
+        
+        if sig != self._snapshot_sig or journal_size < self._journal_offset:
+            self._reset(self._load_shortlist())
+            self._snapshot_sig = sig
+            self._journal_offset = 0
+            self._journal_ops = 0
+        
+        if journal_size == self._journal_offset:
+            return
+        
+        with open(self.journal_file, 'rb') as f:
+            f.seek(self._journal_offset)
+            data = f.read(journal_size - self._journal_offset)
+        
+        # Ignore a trailing partial line (writer crashed mid-append)
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+                self._journal_ops += 1
+        self._journal_offset += end
+    
+    def _compact(self):
+        """Fold the journal into the snapshot (caller holds the exclusive lock)"""
+        self._save_shortlist(list(self._rows.values()))
+        
+        # The new journal starts with the current revision so it survives the fold
+        header = (json.dumps({'op': 'revision', 'rev': self._revision}) + '\n').encode('utf-8')
+        self._replace_file(self.journal_file, header)
+        
+        self._snapshot_sig = self._snapshot_signature()
+        self._journal_offset = len(header)
+        self._journal_ops = 0
+        self._tombstones = []
+        self._tombstone_floor = self._revision
+    
+    def _load_shortlist(self) -> List[Dict]:
+        """Load shortlist from file"""
+        try:
+            with open(self.storage_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except json.JSONDecodeError as e:
+            # Never treat a damaged store as empty: the next compaction would overwrite it
+            raise RuntimeError(f"Shortlist file {self.storage_file} is corrupt ({e}); restore it from a backup") from e
+    
+    def _save_shortlist(self, shortlist: List[Dict]):
+        """Save shortlist to file (atomically)"""
+        if self.compact_json:
+            data = json.dumps(shortlist, separators=(',', ':'))
+        else:
+            data = json.dumps(shortlist, indent=2)
+        self._replace_file(self.storage_file, data.encode('utf-8'))
+
+
+class SQLiteShortlistStore:
+    """
+    Shortlist stored in SQLite, one row per candidate
+    
+    The full entry is kept as JSON in `data`; the columns used for lookups
+    (email, normalized phone, name, score) and for filtered, sorted listings
+    (status, recruiter, job title, sort keys) are denormalized and indexed
+    so a status click touches one row instead of rewriting the whole store.
+    
+    The revision counter lives in `meta`; removed rows are recorded in
+    `removed` for the change feed.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS candidates (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL,
+            email TEXT,
+            phone_digits TEXT,
+            candidate_name TEXT,
+            total_score REAL,
+            status_key TEXT,
+            recruiter_key TEXT,
+            job_title_key TEXT,
+            shortlisted_at TEXT,
+            sort_score REAL,
+            sort_name TEXT,
+            revision INTEGER,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS removed (
+            revision INTEGER NOT NULL,
+            id TEXT,
+            shortlisted_at TEXT,
+            email TEXT
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS stats (
+            grp TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            score_sum REAL NOT NULL,
+            PRIMARY KEY (grp, key)
+        );
+    """
+    
+    # Created after _ensure_columns so older databases have the columns first
+    INDEXES = """
+        CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates(email);
+        CREATE INDEX IF NOT EXISTS idx_candidates_email_key ON candidates(lower(trim(email)));
+        CREATE INDEX IF NOT EXISTS idx_candidates_phone ON candidates(phone_digits);
+        CREATE INDEX IF NOT EXISTS idx_candidates_name ON candidates(candidate_name);
+        CREATE INDEX IF NOT EXISTS idx_candidates_status ON candidates(status_key, shortlisted_at, id);
+        CREATE INDEX IF NOT EXISTS idx_candidates_recruiter ON candidates(recruiter_key, shortlisted_at, id);
+        CREATE INDEX IF NOT EXISTS idx_candidates_job_title ON candidates(job_title_key, shortlisted_at, id);
+        CREATE INDEX IF NOT EXISTS idx_candidates_shortlisted_at ON candidates(shortlisted_at, id);
+        CREATE INDEX IF NOT EXISTS idx_candidates_sort_score ON candidates(sort_score, shortlisted_at, id);
+        CREATE INDEX IF NOT EXISTS idx_candidates_sort_name ON candidates(sort_name, shortlisted_at, id);
+        CREATE INDEX IF NOT EXISTS idx_candidates_revision ON candidates(revision);
+        CREATE INDEX IF NOT EXISTS idx_removed_revision ON removed(revision);
+    """
+    
+    # Columns added after the first release of this store
+    ADDED_COLUMNS = (
+        ('status_key', 'TEXT'),
+        ('recruiter_key', 'TEXT'),
+        ('job_title_key', 'TEXT'),
+        ('shortlisted_at', 'TEXT'),
+        ('sort_score', 'REAL'),
+        ('sort_name', 'TEXT'),
+        ('revision', 'INTEGER'),
+    )
+    
+    FILTER_COLUMNS = {'status': 'status_key', 'recruiter': 'recruiter_key', 'job_title': 'job_title_key'}
+    
+    SORT_COLUMNS = {
+        'shortlisted_at': ('shortlisted_at', 'id'),
+        'total_score': ('sort_score', 'shortlisted_at', 'id'),
+        'candidate_name': ('sort_name', 'shortlisted_at', 'id'),
+    }
+    
+    def __init__(self, db_file: str, legacy_json_file: Optional[str] = None):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
+        # In-process access is serialized by ShortlistManager.lock; other
+        # worker processes are kept out by BEGIN IMMEDIATE in transaction().
+        self.conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # FULL: in WAL mode NORMAL skips the fsync on COMMIT, so acknowledged
+        # writes could be lost on power failure
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(self.SCHEMA)
+        self._ensure_columns()
+        self.conn.executescript(self.INDEXES)
+        if legacy_json_file:
+            self._migrate_from_json(legacy_json_file)
+        self._ensure_stats()
+    
+    def sync(self):
+        """Nothing to do: with synchronous=FULL, COMMIT fsyncs the WAL before returning"""
+    
+    @contextmanager
+    def transaction(self):
+        """Exclusive write transaction for read-modify-write operations"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        else:
+            self.conn.execute("COMMIT")
+    
+    def _migrate_from_json(self, json_file: str):
+        """One-time import of an existing JSON shortlist"""
+        with self.transaction():
+            done = self.conn.execute("SELECT value FROM meta WHERE key = 'migrated_from_json'").fetchone()
+            if done:
+                return
+            
+            rows = []
+            if os.path.exists(json_file):
+                # Read through the JSON store so un-compacted journal entries come along
+                rows = JSONShortlistStore(json_file).all()
+            
+            for entry in rows:
+                self._insert_row(entry)
+            self._set_meta('revision', max((_row_revision(entry) for entry in rows), default=0))
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                (json.dumps({'source': json_file, 'rows': len(rows), 'at': datetime.now().isoformat()}),)
+            )
+        if rows:
+            print(f"Migrated {len(rows)} shortlisted candidates from {json_file} to {self.db_file}")
+    
+    def _ensure_columns(self):
+        """Add and backfill the filter/sort columns on databases created before they existed"""
+        with self.transaction():
+            existing = {row[1] for row in self.conn.execute("PRAGMA table_info(candidates)")}
+            missing = [(name, kind) for name, kind in self.ADDED_COLUMNS if name not in existing]
+            if not missing:
+                return
+            for name, kind in missing:
+                self.conn.execute(f"ALTER TABLE candidates ADD COLUMN {name} {kind}")
+            for seq, data in self.conn.execute("SELECT seq, data FROM candidates").fetchall():
+                self._update_row(seq, json.loads(data))
+    
+    def _ensure_stats(self):
+        """(Re)build the stats table when it is missing or from an older ShortlistStatistics"""
+        version = str(ShortlistStatistics.VERSION)
+        with self.transaction():
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'stats_version'").fetchone()
+            if row and row[0] == version:
+                return
+            self.conn.execute("DELETE FROM stats")
+            for entry in self.all():
+                self._apply_stats(entry, 1)
+            self.conn.execute("DELETE FROM meta WHERE key = 'stats_built'")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('stats_version', ?)", (version,))
+    
+    def _apply_stats(self, entry: Dict, sign: int):
+        self.conn.executemany(
+            "INSERT INTO stats (grp, key, count, score_sum) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (grp, key) DO UPDATE SET count = count + excluded.count, "
+            "score_sum = score_sum + excluded.score_sum",
+            list(ShortlistStatistics.deltas(entry, sign))
+        )
+        if sign < 0:
+            self.conn.execute("DELETE FROM stats WHERE count <= 0 AND grp != ''")
+    
+    def statistics(self) -> Dict:
+        stats = ShortlistStatistics()
+        for row in self.conn.execute("SELECT grp, key, count, score_sum FROM stats"):
+            stats.add(*row)
+        return stats.to_dict()
+    
+    def _set_meta(self, key: str, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+    
+    def revision(self) -> int:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return int(row[0]) if row else 0
+    
+    def _next_revision(self) -> int:
+        """Bump the revision counter (caller holds the write transaction)"""
+        revision = self.revision() + 1
+        self._set_meta('revision', revision)
+        return revision
+    
+    def changes(self, since: int) -> Dict:
+        # Read the revision first: rows written meanwhile show up again next time, never get lost
+        revision = self.revision()
+        if not 0 <= since <= revision:
+            return {'revision': revision, 'changed': [], 'removed': [], 'reset': True}
+        
+        changed = [
+            json.loads(data)
+            for (data,) in self.conn.execute(
+                "SELECT data FROM candidates WHERE revision > ? ORDER BY revision", (since,)
+            )
+        ]
+        removed = [
+            {'id': row_id, 'shortlisted_at': shortlisted_at, 'email': email, 'revision': rev}
+            for rev, row_id, shortlisted_at, email in self.conn.execute(
+                "SELECT revision, id, shortlisted_at, email FROM removed WHERE revision > ? ORDER BY revision", (since,)
+            )
+        ]
+        return {'revision': revision, 'changed': changed, 'removed': removed, 'reset': False}
+    
+    @staticmethod
+    def _row_columns(entry: Dict) -> Dict:
+        """Column values for one entry (everything except seq)"""
+        score = entry.get('total_score', 0)
+        keys = ShortlistStatistics.group_keys(entry)
+        return {
+            'id': entry.get('id', ''),
+            'email': entry.get('email'),
+            'phone_digits': _phone_digits(entry.get('phone')) or None,
+            'candidate_name': entry.get('candidate_name'),
+            'total_score': score if isinstance(score, (int, float)) else None,
+            'status_key': keys['status'],
+            'recruiter_key': keys['recruiter'],
+            'job_title_key': keys['job_title'],
+            'shortlisted_at': _sort_tuple(entry, 'shortlisted_at')[0],
+            'sort_score': _sort_tuple(entry, 'total_score')[0],
+            'sort_name': _sort_tuple(entry, 'candidate_name')[0],
+            'revision': _row_revision(entry),
+            'data': json.dumps(entry),
+        }
+    
+    def _insert_row(self, entry: Dict):
+        self._apply_stats(entry, 1)
+        columns = self._row_columns(entry)
+        self.conn.execute(
+            f"INSERT INTO candidates ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + name for name in columns)})",
+            columns
+        )
+    
+    def _update_row(self, seq: int, entry: Dict):
+        columns = self._row_columns(entry)
+        self.conn.execute(
+            f"UPDATE candidates SET {', '.join(f'{name} = :{name}' for name in columns)} WHERE seq = :seq",
+            dict(columns, seq=seq)
+        )
+    
+    def all(self) -> List[Dict]:
+        rows = self.conn.execute("SELECT data FROM candidates ORDER BY seq").fetchall()
+        return [json.loads(data) for (data,) in rows]
+    
+    def get_by_email(self, email: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT data FROM candidates WHERE email = ? ORDER BY seq LIMIT 1", (email,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def page(self, filters: Dict[str, str], min_score, max_score, sort: str,
+             descending: bool, after: Optional[Tuple], limit: Optional[int]) -> Tuple[List[Dict], int]:
+        """
+        Filtered, sorted slice of the shortlist
+        
+        Returns:
+            (up to limit + 1 rows after the `after` position, total matching rows)
+        """
+        where, params = [], []
+        for group, value in filters.items():
+            where.append(f"{self.FILTER_COLUMNS[group]} = ?")
+            params.append(value)
+        if min_score is not None:
+            where.append("sort_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            where.append("sort_score <= ?")
+            params.append(max_score)
+        
+        total = self.conn.execute(
+            "SELECT COUNT(*) FROM candidates" + (" WHERE " + " AND ".join(where) if where else ""), params
+        ).fetchone()[0]
+        
+        columns = self.SORT_COLUMNS[sort]
+        if after is not None:
+            # Row-value comparison lets SQLite seek straight to the cursor in the sort index
+            where.append(f"({', '.join(columns)}) {'<' if descending else '>'} ({', '.join('?' * len(columns))})")
+            params.extend(after)
+        direction = ' DESC' if descending else ''
+        sql = "SELECT data FROM candidates" + (" WHERE " + " AND ".join(where) if where else "")
+        sql += " ORDER BY " + ", ".join(column + direction for column in columns)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        rows = [json.loads(data) for (data,) in self.conn.execute(sql, params)]
+        return rows, total
+    
+    def find_duplicate(self, entry: Dict) -> Optional[Dict]:
+        """Return the first shortlisted row matching entry by email, phone or name + score"""
+        email = _email_key(entry.get('email')) or None
+        phone = _phone_digits(entry.get('phone')) or None
+        name = None
+        if email is None:
+            name = entry.get('candidate_name')
+        
+        row = self.conn.execute(
+            "SELECT data FROM candidates "
+            "WHERE lower(trim(email)) = :email "
+            "   OR phone_digits = :phone "
+            "   OR (candidate_name = :name AND (email IS NULL OR email IN ('', 'N/A')) "
+            "       AND ABS(total_score - :score) < 1) "
+            "ORDER BY seq LIMIT 1",
+            {'email': email, 'phone': phone, 'name': name, 'score': entry.get('total_score', 0)}
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def insert(self, entry: Dict):
+        entry['revision'] = self._next_revision()
+        self._insert_row(entry)
+    
+    def delete_by_email(self, email: str) -> int:
+        rows = self.conn.execute("SELECT data FROM candidates WHERE email = ?", (email,)).fetchall()
+        if not rows:
+            return 0
+        revision = self._next_revision()
+        for (data,) in rows:
+            entry = json.loads(data)
+            self._apply_stats(entry, -1)
+            stone = _tombstone(entry, revision)
+            self.conn.execute(
+                "INSERT INTO removed (revision, id, shortlisted_at, email) VALUES (?, ?, ?, ?)",
+                (revision, stone['id'], stone['shortlisted_at'], stone['email'])
+            )
+        return self.conn.execute("DELETE FROM candidates WHERE email = ?", (email,)).rowcount
+    
+    def update_by_email(self, email: str, mutate: Callable[[Dict], None]) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT seq, data FROM candidates WHERE email = ? ORDER BY seq LIMIT 1", (email,)
+        ).fetchone()
+        if not row:
+            return None
+        seq, data = row
+        candidate = json.loads(data)
+        self._apply_stats(candidate, -1)
+        mutate(candidate)
+        candidate['revision'] = self._next_revision()
+        self._apply_stats(candidate, 1)
+        self._update_row(seq, candidate)
+        return candidate
 
 
 class ShortlistManager:
     """Manages candidate shortlisting with persistent storage"""
     
-    def __init__(self, storage_file=None):
-        """Initialize shortlist manager with absolute path"""
+    # Largest page get_shortlist_page returns in one call
+    MAX_PAGE_SIZE = 200
+    
+    # Most operations accepted by one batch call
+    MAX_BATCH_SIZE = 500
+    
+    def __init__(self, storage_file=None, backend=None):
+        """
+        Initialize shortlist manager with absolute path
+        
+        Args:
+            storage_file: JSON file or SQLite database path (defaults under data/)
+            backend: 'json' or 'sqlite'; defaults to SHORTLIST_BACKEND, or is
+                inferred from a .db/.sqlite storage_file
+        """
         import threading
         self.lock = threading.Lock()
         
-        if storage_file:
-            self.storage_file = storage_file
+        # Use absolute path relative to this file
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        json_file = os.path.join(base_dir, 'data', 'shortlisted_candidates.json')
+        
+        if backend is None:
+            if storage_file and storage_file.endswith(('.db', '.sqlite', '.sqlite3')):
+                backend = 'sqlite'
+            else:
+                backend = os.environ.get('SHORTLIST_BACKEND', 'json')
+        self.backend = backend.lower()
+        
+        if self.backend == 'sqlite':
+            # The database sits next to the JSON file it migrates from
+            root = os.path.splitext(storage_file or json_file)[0]
+            if storage_file and not storage_file.endswith('.json'):
+                self.storage_file = storage_file
+            else:
+                self.storage_file = root + '.db'
+            self.store = SQLiteShortlistStore(self.storage_file, legacy_json_file=root + '.json')
+        elif self.backend == 'json':
+            self.storage_file = storage_file or json_file
+            self.store = JSONShortlistStore(
+                self.storage_file,
+                compact_json=os.environ.get('SHORTLIST_COMPACT_JSON', '').lower() in ('1', 'true', 'yes'),
+                commit_window=float(os.environ.get('SHORTLIST_COMMIT_WINDOW_MS', 2)) / 1000
+            )
         else:
-            # Use absolute path relative to this file
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            self.storage_file = os.path.join(base_dir, 'data', 'shortlisted_candidates.json')
-            
-        self._ensure_storage_exists()
+            raise ValueError(f"Unsupported shortlist backend: {backend}. Use 'json' or 'sqlite'")
     
-    def _ensure_storage_exists(self):
-        """Create storage file if it doesn't exist"""
-        os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
-        if not os.path.exists(self.storage_file):
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump([], f)
+    @contextmanager
+    def _write(self):
+        """Lock and run a store transaction, then wait outside the lock until it is durable"""
+        with metrics.SHORTLIST_WRITE_LATENCY.time(backend=self.backend):
+            with self.lock, self.store.transaction():
+                yield
+            # Other threads can append while this one waits, so their fsyncs are shared
+            self.store.sync()
+    
+    def _check_batch(self, items) -> List:
+        if not isinstance(items, list):
+            raise ValueError("Batch must be a list")
+        if len(items) > self.MAX_BATCH_SIZE:
+            raise ValueError(f"Batch too large: {len(items)} items (max {self.MAX_BATCH_SIZE})")
+        return items
+    
+    @staticmethod
+    def _new_entry(candidate_data: Dict) -> Dict:
+        """Create a shortlist entry; the random suffix keeps ids unique within the same second"""
+        now = datetime.now()
+        return {
+            'id': f"SL-{now.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:12]}",
+            'shortlisted_at': now.isoformat(),
+            'candidate_name': candidate_data.get('candidate_name', 'Unknown'),
+            'email': candidate_data.get('email', 'N/A'),
+            'phone': candidate_data.get('phone', 'N/A'),
+            'total_score': candidate_data.get('total_score', 0),
+            'verdict': "Recruiter Selected ✅" if any(x in candidate_data.get('verdict', '') for x in ['Not Visible', 'Low Match', 'Rejected']) else candidate_data.get('verdict', ''),
+            'matched_skills': candidate_data.get('matched_skills', []),
+            'missing_skills': candidate_data.get('missing_skills', []),
+            'education_match': candidate_data.get('education_match', False),
+            'matched_certifications': candidate_data.get('matched_certifications', []),
+            'job_title': candidate_data.get('job_title', 'Not specified'),
+            'notes': candidate_data.get('notes', []),
+            'status': 'shortlisted',
+            'recruiter_name': candidate_data.get('recruiter_name', 'Unknown')
+        }
+    
+    def _add_entry(self, entry: Dict) -> Dict:
+        """Insert unless already shortlisted (caller holds the lock and a transaction)"""
+        # Check if already shortlisted (Robust Duplicate Check)
+        existing_entry = self.store.find_duplicate(entry)
+        if existing_entry:
+            return {'success': False, 'message': 'Candidate already shortlisted', 'entry': existing_entry}
+        
+        self.store.insert(entry)
+        return {'success': True, 'message': 'Candidate shortlisted successfully', 'entry': entry}
     
     def add_candidate(self, candidate_data: Dict) -> Dict:
         """
@@ -40,68 +1161,36 @@ class ShortlistManager:
         
         Args:
             candidate_data: Dictionary containing candidate information
-            
+        
         Returns:
             Updated candidate data with shortlist info
         """
-        with self.lock:
-            shortlist = self._load_shortlist()
-            
-            # Create shortlist entry
-            entry = {
-                'id': f"SL-{datetime.now().strftime('%Y%m%d%H%M%S')}",
-                'shortlisted_at': datetime.now().isoformat(),
-                'candidate_name': candidate_data.get('candidate_name', 'Unknown'),
-                'email': candidate_data.get('email', 'N/A'),
-                'phone': candidate_data.get('phone', 'N/A'),
-                'total_score': candidate_data.get('total_score', 0),
-                'verdict': "Recruiter Selected ✅" if any(x in candidate_data.get('verdict', '') for x in ['Not Visible', 'Low Match', 'Rejected']) else candidate_data.get('verdict', ''),
-                'matched_skills': candidate_data.get('matched_skills', []),
-                'missing_skills': candidate_data.get('missing_skills', []),
-                'education_match': candidate_data.get('education_match', False),
-                'matched_certifications': candidate_data.get('matched_certifications', []),
-                'job_title': candidate_data.get('job_title', 'Not specified'),
-                'notes': candidate_data.get('notes', []),
-                'status': 'shortlisted',
-                'recruiter_name': candidate_data.get('recruiter_name', 'Unknown')
-            }
-            
-            # Check if already shortlisted (Robust Duplicate Check)
-            is_dup = False
-            existing_entry = None
-            
-            for c in shortlist:
-                # Check Email (if valid)
-                if c.get('email') and c.get('email') != 'N/A' and entry.get('email') and entry.get('email') != 'N/A':
-                    if c['email'] == entry['email']:
-                        is_dup = True
-                        existing_entry = c
-                        break
-                
-                # Check Phone (if valid)
-                if c.get('phone') and c.get('phone') != 'N/A' and entry.get('phone') and entry.get('phone') != 'N/A':
-                    # Normalize phone (remove spaces/dashes) for comparison
-                    p1 = ''.join(filter(str.isdigit, str(c['phone'])))
-                    p2 = ''.join(filter(str.isdigit, str(entry['phone'])))
-                    if p1 and p2 and p1 == p2:
-                        is_dup = True
-                        existing_entry = c
-                        break
-                        
-                # Check Name + Score (Last resort if no contact info)
-                if (not c.get('email') or c.get('email') == 'N/A') and (not entry.get('email') or entry.get('email') == 'N/A'):
-                     if c['candidate_name'] == entry['candidate_name'] and abs(c.get('total_score', 0) - entry.get('total_score', 0)) < 1:
-                        is_dup = True
-                        existing_entry = c
-                        break
-
-            if is_dup:
-                return {'success': False, 'message': 'Candidate already shortlisted', 'entry': existing_entry}
-            
-            shortlist.append(entry)
-            self._save_shortlist(shortlist)
-            
-            return {'success': True, 'message': 'Candidate shortlisted successfully', 'entry': entry}
+        entry = self._new_entry(candidate_data)
+        with self._write():
+            return self._add_entry(entry)
+    
+    def add_candidates(self, candidates: List[Dict]) -> List[Dict]:
+        """
+        Add several candidates under one lock and one storage write
+        
+        Args:
+            candidates: List of candidate dictionaries (as for add_candidate)
+        
+        Returns:
+            One add_candidate-style result per candidate, in order
+        """
+        entries = [self._new_entry(c) if isinstance(c, dict) else None for c in self._check_batch(candidates)]
+        with self._write():
+            return [
+                self._add_entry(entry) if entry else {'success': False, 'message': 'Invalid candidate data'}
+                for entry in entries
+            ]
+    
+    def _remove(self, candidate_email: str) -> Dict:
+        if not self.store.delete_by_email(candidate_email):
+            return {'success': False, 'message': 'Candidate not found in shortlist'}
+        
+        return {'success': True, 'message': 'Candidate removed from shortlist'}
     
     def remove_candidate(self, candidate_email: str) -> Dict:
         """
@@ -109,33 +1198,97 @@ class ShortlistManager:
         
         Args:
             candidate_email: Email of the candidate to remove
-            
+        
         Returns:
             Success status
         """
-        with self.lock:
-            shortlist = self._load_shortlist()
-            original_length = len(shortlist)
-            
-            shortlist = [c for c in shortlist if c['email'] != candidate_email]
-            
-            if len(shortlist) == original_length:
-                return {'success': False, 'message': 'Candidate not found in shortlist'}
-            
-            self._save_shortlist(shortlist)
-            return {'success': True, 'message': 'Candidate removed from shortlist'}
+        with self._write():
+            return self._remove(candidate_email)
+    
+    def remove_candidates(self, candidate_emails: List[str]) -> List[Dict]:
+        """
+        Remove several candidates in one transaction
+        
+        Args:
+            candidate_emails: Emails of the candidates to remove
+        
+        Returns:
+            One result per email, in order
+        """
+        with self._write():
+            results = []
+            for email in self._check_batch(candidate_emails):
+                if not isinstance(email, str) or not email:
+                    results.append({'success': False, 'message': 'email is required'})
+                    continue
+                results.append(dict(self._remove(email), email=email))
+            return results
     
-    def get_all_shortlisted(self) -> List[Dict]:
-        """Get all shortlisted candidates"""
+    def get_all_shortlisted(self, **query) -> List[Dict]:
+        """
+        Get shortlisted candidates
+        
+        Args:
+            **query: Filters and sort accepted by get_shortlist_page; with no
+                arguments every candidate is returned, oldest first
+        
+        Returns:
+            List of candidate entries
+        """
+        return self.get_shortlist_page(**query)['candidates']
+    
+    def get_shortlist_page(self, status: str = None, recruiter: str = None, job_title: str = None,
+                           min_score: float = None, max_score: float = None,
+                           sort: str = 'shortlisted_at', cursor: str = None, limit: int = None) -> Dict:
+        """
+        Get one page of shortlisted candidates using the store's indexes
+        
+        Args:
+            status: Only candidates with this status
+            recruiter: Only candidates added by this recruiter
+            job_title: Only candidates for this job title
+            min_score: Lowest total_score to include
+            max_score: Highest total_score to include
+            sort: 'shortlisted_at', 'total_score' or 'candidate_name'; prefix '-' for descending
+            cursor: next_cursor returned with the previous page
+            limit: Page size (at most MAX_PAGE_SIZE); None returns every match
+        
+        Returns:
+            Dictionary with candidates, total (matches across all pages) and next_cursor
+        """
+        descending = sort.startswith('-')
+        field = sort[1:] if descending else sort
+        if field not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort: {sort}. Use one of {', '.join(SORT_FIELDS)}")
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except (TypeError, ValueError):
+                raise ValueError("limit must be a positive integer")
+            if limit < 1:
+                raise ValueError("limit must be a positive integer")
+            limit = min(limit, self.MAX_PAGE_SIZE)
+        after = _decode_cursor(cursor, field, descending) if cursor else None
+        filters = {
+            group: value
+            for group, value in (('status', status), ('recruiter', recruiter), ('job_title', job_title))
+            if value is not None
+        }
+        
         # Read operations don't strictly need lock if atomic, but good practice for consistency
         with self.lock:
-             return self._load_shortlist()
+            rows, total = self.store.page(filters, min_score, max_score, field, descending, after, limit)
+        
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(field, descending, _sort_tuple(rows[-1], field))
+        return {'candidates': rows, 'total': total, 'next_cursor': next_cursor}
     
     def get_by_email(self, email: str) -> Dict:
         """Get a specific candidate by email"""
         with self.lock:
-            shortlist = self._load_shortlist()
-            candidate = next((c for c in shortlist if c.get('email') == email), None)
+            candidate = self.store.get_by_email(email)
             return candidate if candidate else {}
     
     def update_status(self, candidate_email: str, new_status: str) -> Dict:
@@ -145,21 +1298,41 @@ class ShortlistManager:
         Args:
             candidate_email: Email of the candidate
             new_status: New status (e.g., 'interviewed', 'offered', 'hired', 'rejected')
-            
+        
         Returns:
             Success status
         """
-        with self.lock:
-            shortlist = self._load_shortlist()
-            
-            for candidate in shortlist:
-                if candidate['email'] == candidate_email:
-                    candidate['status'] = new_status
-                    candidate['status_updated_at'] = datetime.now().isoformat()
-                    self._save_shortlist(shortlist)
-                    return {'success': True, 'message': f'Status updated to {new_status}'}
-            
+        with self._write():
+            return self._set_status(candidate_email, new_status)
+    
+    def update_statuses(self, updates: List[Dict]) -> List[Dict]:
+        """
+        Update several candidate statuses in one transaction
+        
+        Args:
+            updates: List of {'email': ..., 'status': ...}
+        
+        Returns:
+            One result per update, in order
+        """
+        with self._write():
+            results = []
+            for item in self._check_batch(updates):
+                if not isinstance(item, dict) or not item.get('email') or not item.get('status'):
+                    results.append({'success': False, 'message': 'email and status are required'})
+                    continue
+                results.append(dict(self._set_status(item['email'], item['status']), email=item['email']))
+            return results
+    
+    def _set_status(self, candidate_email: str, new_status: str) -> Dict:
+        def apply(candidate):
+            candidate['status'] = new_status
+            candidate['status_updated_at'] = datetime.now().isoformat()
+        
+        if self.store.update_by_email(candidate_email, apply) is None:
             return {'success': False, 'message': 'Candidate not found'}
+        
+        return {'success': True, 'message': f'Status updated to {new_status}'}
     
     def add_note(self, candidate_email: str, note: str) -> Dict:
         """
@@ -168,52 +1341,69 @@ class ShortlistManager:
         Args:
             candidate_email: Email of the candidate
             note: Note to add
-            
+        
         Returns:
             Success status
         """
-        with self.lock:
-            shortlist = self._load_shortlist()
-            
-            for candidate in shortlist:
-                if candidate['email'] == candidate_email:
-                    if 'notes' not in candidate or not isinstance(candidate['notes'], list):
-                        candidate['notes'] = [] # Ensure notes is a list
-                    
-                    candidate['notes'].append({
-                        'text': note,
-                        'added_at': datetime.now().isoformat()
-                    })
-                    
-                    self._save_shortlist(shortlist)
-                    return {'success': True, 'message': 'Note added successfully'}
+        with self._write():
+            return self._append_note(candidate_email, note)
+    
+    def add_notes(self, notes: List[Dict]) -> List[Dict]:
+        """
+        Add several notes in one transaction
+        
+        Args:
+            notes: List of {'email': ..., 'note': ...}
+        
+        Returns:
+            One result per note, in order
+        """
+        with self._write():
+            results = []
+            for item in self._check_batch(notes):
+                if not isinstance(item, dict) or not item.get('email') or not item.get('note'):
+                    results.append({'success': False, 'message': 'email and note are required'})
+                    continue
+                results.append(dict(self._append_note(item['email'], item['note']), email=item['email']))
+            return results
+    
+    def _append_note(self, candidate_email: str, note: str) -> Dict:
+        def apply(candidate):
+            if 'notes' not in candidate or not isinstance(candidate['notes'], list):
+                candidate['notes'] = [] # Ensure notes is a list
             
+            candidate['notes'].append({
+                'text': note,
+                'added_at': datetime.now().isoformat()
+            })
+        
+        if self.store.update_by_email(candidate_email, apply) is None:
             return {'success': False, 'message': 'Candidate not found'}
+        
+        return {'success': True, 'message': 'Note added successfully'}
     
-    def get_statistics(self) -> Dict:
-        """Get shortlist statistics"""
-        shortlist = self._load_shortlist()
+    def get_revision(self) -> int:
+        """Current shortlist revision; it goes up on every add, update and removal"""
+        with self.lock:
+            return self.store.revision()
+    
+    def get_changes(self, since: int) -> Dict:
+        """
+        Get rows written and removed after a given revision
         
-        status_counts = {}
-        for candidate in shortlist:
-            status = candidate.get('status', 'unknown')
-            status_counts[status] = status_counts.get(status, 0) + 1
+        Args:
+            since: Revision the caller last saw (from get_revision or a previous call)
         
-        return {
-            'total_shortlisted': len(shortlist),
-            'status_breakdown': status_counts,
-            'average_score': sum(c.get('total_score', 0) for c in shortlist) / len(shortlist) if shortlist else 0
-        }
-    
-    def _load_shortlist(self) -> List[Dict]:
-        """Load shortlist from file"""
-        try:
-            with open(self.storage_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        Returns:
+            Dictionary with revision, changed (added/updated rows), removed
+            (id, shortlisted_at, email, revision) and reset, which is True when
+            the changes since that revision are no longer known and the caller
+            should reload everything
+        """
+        with self.lock:
+            return self.store.changes(since)
     
-    def _save_shortlist(self, shortlist: List[Dict]):
-        """Save shortlist to file"""
-        with open(self.storage_file, 'w') as f:
-            json.dump(shortlist, f, indent=2)
+    def get_statistics(self) -> Dict:
+        """Get shortlist statistics (maintained incrementally by the store)"""
+        with self.lock:
+            return self.store.statistics()
@@ -0,0 +1,133 @@
+"""
+Stage Timing
+
+Lightweight timers for the stages of a request: text extraction,
+parse_resume, JD analysis, scoring, improvements, optimize_resume...
+DocumentParser and ATSEngine methods are wrapped with @timed('<stage>').
+They only measure while a StageTimer is active in the current context, so
+with timing off each call costs a single context-variable lookup.
+
+A timer accumulates the total duration and call count per stage, so a
+bulk job reports e.g. parse_resume summed over every uploaded resume.
+
+An observer registered with set_stage_observer (the /metrics histograms)
+receives every stage duration, whether or not a timer is active.
+"""
+
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+_active_timer = contextvars.ContextVar('stage_timer', default=None)
+_observer = None
+
+
+class StageTimer:
+    """Total duration and call count per stage while active"""
+    
+    def __init__(self):
+        self.stages = {}
+        self.started = None
+        self.elapsed = 0.0
+        self._token = None
+    
+    def start(self) -> 'StageTimer':
+        """Make this the active timer of the current context"""
+        self._token = _active_timer.set(self)
+        self.started = time.perf_counter()
+        return self
+    
+    def stop(self):
+        """Stop collecting (safe to call more than once)"""
+        if self._token is not None:
+            self.elapsed = time.perf_counter() - self.started
+            _active_timer.reset(self._token)
+            self._token = None
+    
+    def __enter__(self) -> 'StageTimer':
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def add(self, stage: str, seconds: float):
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+    
+    def summary(self) -> Dict:
+        """{stage: {'ms', 'count'}} in the order stages first ran, plus 'total'"""
+        result = {stage: {'ms': round(seconds * 1000, 2), 'count': count}
+                  for stage, (seconds, count) in self.stages.items()}
+        result['total'] = {'ms': round(self.elapsed * 1000, 2), 'count': 1}
+        return result
+    
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. 'parse_resume;dur=12.41, total;dur=40.2'"""
+        metrics = []
+        for stage, (seconds, count) in self.stages.items():
+            metric = f"{stage};dur={seconds * 1000:.2f}"
+            if count > 1:
+                metric += f';desc="{count} calls"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={self.elapsed * 1000:.2f}")
+        return ', '.join(metrics)
+
+
+def active_timer():
+    """The StageTimer of the current context, or None when timing is off"""
+    return _active_timer.get()
+
+
+def set_stage_observer(observer: Optional[Callable[[str, float], None]]):
+    """
+    Register a callback receiving (stage, seconds) for every timed stage
+    
+    Args:
+        observer: Callback, or None to remove it
+    """
+    global _observer
+    _observer = observer
+
+
+def _record(timer, stage: str, seconds: float):
+    if timer is not None:
+        timer.add(stage, seconds)
+    if _observer is not None:
+        _observer(stage, seconds)
+
+
+def timed(stage: str):
+    """Decorator: add the call's duration to the active timer under `stage`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timer = _active_timer.get()
+            if timer is None and _observer is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(timer, stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block of code under `name` (no-op when timing is off)"""
+    timer = _active_timer.get()
+    if timer is None and _observer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(timer, name, time.perf_counter() - start)
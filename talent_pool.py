@@ -0,0 +1,400 @@
+"""
+Talent Pool
+
+Persistent store of parsed resumes, so a new requisition can be matched
+against every resume seen before instead of re-uploading and re-parsing.
+
+Each parse_resume() result is stored once (identical resumes are
+deduplicated by content hash) together with an inverted index from
+canonical skills and keywords to resume ids. Searching for a JD reads the
+posting lists of its mandatory skills, and only the resumes that share
+enough of them are loaded and scored with ATSEngine.score_batch.
+
+Every stored resume also keeps its MinHash signature, banded into an LSH
+table, so a new upload can be matched against lightly edited copies
+already in the pool (see dedupe.py).
+
+The database defaults to data/talent_pool.db; override it with the
+TALENT_POOL_DB environment variable.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from dedupe import MinHasher
+from profiles import to_plain
+
+
+def _canonical(value):
+    """value with every list of strings sorted (see TalentPool.content_hash)"""
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [_canonical(item) for item in value]
+        return sorted(items) if all(isinstance(item, str) for item in items) else items
+    return value
+
+
+class TalentPool:
+    """SQLite-backed resume store with an inverted skill/keyword index"""
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS resumes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_hash TEXT NOT NULL UNIQUE,
+            candidate_name TEXT,
+            email TEXT,
+            source TEXT,
+            added_at TEXT NOT NULL,
+            data TEXT NOT NULL,
+            minhash BLOB
+        );
+        CREATE TABLE IF NOT EXISTS postings (
+            kind TEXT NOT NULL,
+            term TEXT NOT NULL,
+            resume_id INTEGER NOT NULL,
+            PRIMARY KEY (kind, term, resume_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS lsh_bands (
+            bucket INTEGER NOT NULL,
+            resume_id INTEGER NOT NULL,
+            PRIMARY KEY (bucket, resume_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_lsh_bands_resume ON lsh_bands(resume_id);
+        CREATE INDEX IF NOT EXISTS idx_resumes_email ON resumes(lower(trim(email)));
+    """
+    
+    # Posting kinds: canonical skills (from the skills section) and keywords (whole text)
+    SKILL = 'skill'
+    KEYWORD = 'keyword'
+    
+    # Resumes loaded from the database and scored per score_batch call
+    SCORE_CHUNK = 1000
+    
+    # Largest result list search() returns
+    MAX_RESULTS = 500
+    
+    # Stored resumes signed per transaction when an older pool is upgraded
+    BACKFILL_CHUNK = 500
+    
+    # PRAGMA user_version once stored content hashes use content_hash's canonical form
+    HASH_VERSION = 1
+    
+    def __init__(self, engine, db_file: Optional[str] = None):
+        """
+        Open (or create) the talent pool
+        
+        Args:
+            engine: ATSEngine used to normalize terms and score resumes
+            db_file: SQLite database path (defaults to TALENT_POOL_DB or data/talent_pool.db)
+        """
+        self.engine = engine
+        self.minhasher = MinHasher()
+        if db_file is None:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            db_file = os.environ.get('TALENT_POOL_DB') or os.path.join(base_dir, 'data', 'talent_pool.db')
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_file)), exist_ok=True)
+        
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._upgrade()
+    
+    def _upgrade(self):
+        """Add near-duplicate signatures to a pool created before they existed, and rehash older pools"""
+        self._rehash()
+        
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(resumes)")]
+        if 'minhash' not in columns:
+            with self.transaction():
+                columns = [row[1] for row in self.conn.execute("PRAGMA table_info(resumes)")]
+                if 'minhash' not in columns:
+                    self.conn.execute("ALTER TABLE resumes ADD COLUMN minhash BLOB")
+        
+        last_id = 0
+        while True:
+            rows = self.conn.execute(
+                "SELECT id, data FROM resumes WHERE minhash IS NULL AND id > ? ORDER BY id LIMIT ?",
+                (last_id, self.BACKFILL_CHUNK)
+            ).fetchall()
+            if not rows:
+                break
+            with self.transaction():
+                for resume_id, data in rows:
+                    self._store_signature(resume_id, self.minhasher.signature(json.loads(data)))
+            last_id = rows[-1][0]
+    
+    def _rehash(self):
+        """
+        Recompute content hashes stored before they were canonical, merging the
+        copies of a resume that the old hash let in (the oldest one is kept)
+        """
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= self.HASH_VERSION:
+            return
+        duplicates = []
+        with self.transaction():
+            if self.conn.execute("PRAGMA user_version").fetchone()[0] >= self.HASH_VERSION:
+                return
+            kept = {}
+            for resume_id, data in self.conn.execute("SELECT id, data FROM resumes ORDER BY id").fetchall():
+                digest = self.content_hash(json.loads(data))
+                if digest in kept:
+                    duplicates.append(resume_id)
+                else:
+                    kept[digest] = resume_id
+            for resume_id in duplicates:
+                self.conn.execute("DELETE FROM postings WHERE resume_id = ?", (resume_id,))
+                self.conn.execute("DELETE FROM lsh_bands WHERE resume_id = ?", (resume_id,))
+                self.conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+            self.conn.executemany("UPDATE resumes SET content_hash = ? WHERE id = ?",
+                                  [(digest, resume_id) for digest, resume_id in kept.items()])
+            self.conn.execute(f"PRAGMA user_version = {self.HASH_VERSION}")
+        if duplicates:
+            print(f"Talent pool: merged {len(duplicates)} duplicate resumes")
+            # The duplicates were counted in the BM25 corpus too
+            if self.engine.corpus_stats is not None:
+                self.rebuild_corpus_stats(self.engine.corpus_stats)
+    
+    def _store_signature(self, resume_id: int, signature: Optional[bytes]):
+        # Resumes without content get an empty signature so they are not backfilled again
+        self.conn.execute("UPDATE resumes SET minhash = ? WHERE id = ?", (signature or b'', resume_id))
+        if signature:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO lsh_bands (bucket, resume_id) VALUES (?, ?)",
+                [(key, resume_id) for key in self.minhasher.band_keys(signature)]
+            )
+    
+    @contextmanager
+    def transaction(self):
+        """Exclusive write transaction (other worker processes wait on BEGIN IMMEDIATE)"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+    
+    @staticmethod
+    def content_hash(resume_data: Dict) -> str:
+        """
+        Stable hash of a parsed resume, used to skip resumes already in the pool
+        
+        Lists of strings are hashed sorted: some (keywords) are built from sets,
+        so their order changes with PYTHONHASHSEED, i.e. between worker
+        processes and restarts.
+        """
+        canonical = json.dumps(_canonical(to_plain(resume_data)), sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def index_terms(self, resume_data: Dict) -> Dict[str, Set[str]]:
+        """Canonical terms a resume is indexed under, by posting kind"""
+        normalize = self.engine._normalize_skill
+        return {
+            self.SKILL: set(normalize(s) for s in resume_data.get('skills', [])),
+            self.KEYWORD: set(normalize(k) for k in resume_data.get('keywords', [])),
+        }
+    
+    def add(self, resume_data: Dict, source: Optional[str] = None) -> Dict:
+        """
+        Store a parsed resume and index it
+        
+        Args:
+            resume_data: Result of ATSEngine.parse_resume
+            source: Where it came from (e.g. the uploaded filename)
+        
+        Returns:
+            {'id': resume id, 'added': False if the same resume was already stored}
+        """
+        return self.add_many([(resume_data, source)])[0]
+    
+    def add_many(self, items: Iterable) -> List[Dict]:
+        """Store several (resume_data, source) pairs in one transaction"""
+        results = []
+        with self.transaction():
+            for resume_data, source in items:
+                results.append(self._insert(resume_data, source))
+        return results
+    
+    def _insert(self, resume_data: Dict, source: Optional[str]) -> Dict:
+        digest = self.content_hash(resume_data)
+        row = self.conn.execute("SELECT id FROM resumes WHERE content_hash = ?", (digest,)).fetchone()
+        if row:
+            return {'id': row[0], 'added': False}
+        
+        contact = resume_data.get('contact_info', {})
+        cursor = self.conn.execute(
+            "INSERT INTO resumes (content_hash, candidate_name, email, source, added_at, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (digest, contact.get('name'), contact.get('email'), source,
+             datetime.now().isoformat(), json.dumps(to_plain(resume_data)))
+        )
+        resume_id = cursor.lastrowid
+        postings = [(kind, term, resume_id)
+                    for kind, terms in self.index_terms(resume_data).items()
+                    for term in terms if term]
+        self.conn.executemany("INSERT OR IGNORE INTO postings (kind, term, resume_id) VALUES (?, ?, ?)", postings)
+        self._store_signature(resume_id, self.minhasher.signature(resume_data))
+        
+        # Stored resumes are the corpus BM25 keyword scoring learns IDF from
+        if self.engine.corpus_stats is not None:
+            self.engine.corpus_stats.add_document(self._term_counts(resume_data))
+        return {'id': resume_id, 'added': True}
+    
+    def _term_counts(self, resume_data: Dict) -> Dict[str, int]:
+        """Cached term frequencies, or keyword presence for resumes parsed without them"""
+        if 'keyword_tf' in resume_data:
+            return resume_data['keyword_tf']
+        return {term: 1 for term in self.index_terms(resume_data)[self.KEYWORD] if term}
+    
+    def rebuild_corpus_stats(self, corpus_stats):
+        """Recount corpus statistics from every stored resume"""
+        rows = self.conn.execute("SELECT data FROM resumes ORDER BY id")
+        corpus_stats.rebuild(self._term_counts(json.loads(row[0])) for row in rows)
+    
+    def remove(self, resume_id: int) -> bool:
+        """Delete a resume, its postings and its LSH buckets"""
+        with self.transaction():
+            self.conn.execute("DELETE FROM postings WHERE resume_id = ?", (resume_id,))
+            self.conn.execute("DELETE FROM lsh_bands WHERE resume_id = ?", (resume_id,))
+            cursor = self.conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+        return cursor.rowcount > 0
+    
+    def get(self, resume_id: int) -> Optional[Dict]:
+        """Stored parse_resume result for a resume id"""
+        row = self.conn.execute("SELECT data FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+    
+    def find_near_duplicate(self, signature: Optional[bytes]) -> Optional[Dict]:
+        """
+        Closest stored resume to a MinHash signature
+        
+        Args:
+            signature: MinHasher.signature of a parsed resume
+        
+        Returns:
+            {'pool_id', 'candidate_name', 'email', 'similarity'} of the most
+            similar stored resume at or above MinHasher.DUPLICATE_THRESHOLD,
+            or None
+        """
+        if not signature:
+            return None
+        keys = self.minhasher.band_keys(signature)
+        rows = self.conn.execute(
+            f"SELECT id, candidate_name, email, minhash FROM resumes WHERE id IN "
+            f"(SELECT resume_id FROM lsh_bands WHERE bucket IN ({', '.join('?' * len(keys))}))",
+            keys
+        ).fetchall()
+        
+        best = None
+        for resume_id, candidate_name, email, stored in rows:
+            if not stored:
+                continue
+            similarity = self.minhasher.similarity(signature, stored)
+            # Ties keep the older resume
+            if similarity >= self.minhasher.DUPLICATE_THRESHOLD and (best is None or (similarity, -resume_id) > (best['similarity'], -best['pool_id'])):
+                best = {'pool_id': resume_id, 'candidate_name': candidate_name, 'email': email, 'similarity': similarity}
+        return best
+    
+    def candidate_ids(self, jd_data: Dict, min_matched: int = 1) -> Dict[int, int]:
+        """
+        Resumes worth scoring for a JD, from the posting lists alone
+        
+        Resumes are matched on the JD's mandatory skills; a JD without
+        mandatory skills falls back to its weighted keywords.
+        
+        Args:
+            jd_data: Analyzed job description
+            min_matched: How many of those terms a resume must share
+        
+        Returns:
+            {resume id: number of terms matched}
+        """
+        normalize = self.engine._normalize_skill
+        terms = set(normalize(s) for s in jd_data.get('mandatory_skills', []))
+        kind = self.SKILL
+        if not terms:
+            terms = set(normalize(k) for k in jd_data.get('weighted_keywords', {}))
+            kind = self.KEYWORD
+        terms.discard('')
+        if not terms:
+            return {}
+        
+        min_matched = max(1, min(int(min_matched), len(terms)))
+        placeholders = ', '.join('?' * len(terms))
+        rows = self.conn.execute(
+            f"SELECT resume_id, COUNT(*) FROM postings WHERE kind = ? AND term IN ({placeholders}) "
+            f"GROUP BY resume_id HAVING COUNT(*) >= ?",
+            (kind, *sorted(terms), min_matched)
+        )
+        return dict(rows.fetchall())
+    
+    def search(self, jd_data: Dict, limit: int = 50, min_matched: int = 1) -> Dict:
+        """
+        Score the pool against a JD
+        
+        Args:
+            jd_data: Analyzed job description
+            limit: Number of top candidates to return (max MAX_RESULTS)
+            min_matched: Mandatory skills a resume must share to be scored
+        
+        Returns:
+            {'pool_size', 'scored', 'candidates'} with candidates ranked by total score
+        """
+        limit = max(1, min(int(limit), self.MAX_RESULTS))
+        matches = self.candidate_ids(jd_data, min_matched)
+        ids = sorted(matches)
+        
+        top = []
+        for start in range(0, len(ids), self.SCORE_CHUNK):
+            chunk = ids[start:start + self.SCORE_CHUNK]
+            placeholders = ', '.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT id, source, added_at, data FROM resumes WHERE id IN ({placeholders}) ORDER BY id",
+                chunk
+            ).fetchall()
+            resumes = [json.loads(row[3]) for row in rows]
+            for row, resume_data, score_data in zip(rows, resumes, self.engine.score_batch(resumes, jd_data)):
+                # Ties keep the older resume first
+                item = (score_data['total_score'], -row[0], row, resume_data, score_data)
+                if len(top) < limit:
+                    heapq.heappush(top, item)
+                elif item[:2] > top[0][:2]:
+                    heapq.heapreplace(top, item)
+        
+        candidates = []
+        for total_score, _, row, resume_data, score_data in sorted(top, key=lambda item: item[:2], reverse=True):
+            contact = resume_data.get('contact_info', {})
+            candidates.append({
+                'pool_id': row[0],
+                'candidate_name': contact.get('name'),
+                'email': contact.get('email'),
+                'phone': contact.get('phone'),
+                'source': row[1],
+                'added_at': row[2],
+                'total_score': total_score,
+                'visibility_status': score_data['visibility_status'],
+                'matched_terms': matches[row[0]],
+                'breakdown': score_data['breakdown'],
+            })
+        
+        return {
+            'pool_size': self.count(),
+            'scored': len(ids),
+            'candidates': candidates,
+        }
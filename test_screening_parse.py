@@ -0,0 +1,76 @@
+"""
+Test script for screening parses (DocumentParser.parse_screening)
+
+A section that starts on the screening pages and continues on a later page
+must be read in full, so page limits never shorten a candidate's history.
+"""
+
+import os
+import tempfile
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from ats_engine import ATSEngine
+from document_parser import DocumentParser
+
+PAGES = [
+    ["Jane Example", "jane@example.com", "", "SUMMARY", "Backend engineer building data platforms.",
+     "", "SKILLS", "Python, SQL, Docker, Kubernetes"],
+    ["EXPERIENCE", "Senior Engineer, Acme Corp 2019 - 2024", "- Led the payments platform rewrite",
+     "- Cut batch latency by 40%", "Engineer, Globex 2015 - 2019", "- Built ETL pipelines in Python"],
+    ["Developer, Initech 2011 - 2015", "- Maintained billing services", "Intern, Hooli 2010 - 2011",
+     "- Wrote test automation", "", "EDUCATION", "B.S. Computer Science, State University 2010"],
+]
+
+
+def write_pdf(path, pages):
+    pdf = canvas.Canvas(path, pagesize=letter)
+    for lines in pages:
+        y = 720
+        for line in lines:
+            pdf.drawString(72, y, line)
+            y -= 18
+        pdf.showPage()
+    pdf.save()
+
+
+def test_experience_spanning_screening_boundary():
+    engine = ATSEngine()
+    parser = DocumentParser()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'resume.pdf')
+        write_pdf(path, PAGES)
+        full = engine.parse_resume(parser.parse_file(path))
+        screening = parser.parse_screening(path, pages=2)
+        assert not screening.is_complete
+        screened = engine.parse_resume(screening)
+    
+    headers = [job['header'] for job in screened['experience']]
+    assert len(headers) == 4, headers
+    assert any('Initech' in header for header in headers), headers
+    assert any('Hooli' in header for header in headers), headers
+    assert screened['experience'] == full['experience']
+    assert screened['education'] == full['education']
+
+
+def test_closed_section_stays_on_screening_pages():
+    engine = ATSEngine()
+    parser = DocumentParser()
+    pages = [PAGES[0] + ["", "EXPERIENCE", "Engineer, Acme Corp 2019 - 2024", "- Built APIs",
+                         "", "EDUCATION", "B.S. Computer Science 2019"],
+             ["PROJECTS", "Side project", "- A small tool"],
+             ["Another project", "- More detail"]]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'resume.pdf')
+        write_pdf(path, pages)
+        screening = parser.parse_screening(path, pages=1)
+        engine._extract_from_document(engine._extract_experience, screening.text, screening, 'experience')
+        # Experience closed on page 1 (EDUCATION follows), so page 2+ is not read for it
+        assert not screening.is_complete
+
+
+if __name__ == '__main__':
+    test_experience_spanning_screening_boundary()
+    test_closed_section_stays_on_screening_pages()
+    print("✅ Screening parse tests passed")
@@ -0,0 +1,99 @@
+"""
+Test script for the talent pool's content hash
+
+The same resume must hash the same in every worker process and after a
+restart, whatever PYTHONHASHSEED each process runs with; otherwise
+re-uploads are stored again.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+RESUME = """Jane Example
+jane@example.com
+
+SUMMARY
+Backend engineer building data platforms with Python, Go and PostgreSQL.
+
+SKILLS
+Python, Go, SQL, PostgreSQL, Docker, Kubernetes, AWS, Terraform, Kafka
+
+EXPERIENCE
+Senior Engineer, Acme Corp 2019 - 2024
+- Led the payments platform rewrite, cutting batch latency by 40%
+- Designed event pipelines on Kafka and Kubernetes
+
+EDUCATION
+B.S. Computer Science, State University 2015
+"""
+
+HASH_SCRIPT = """
+import sys
+from ats_engine import ATSEngine
+from talent_pool import TalentPool
+print(TalentPool.content_hash(ATSEngine().parse_resume(sys.stdin.read())))
+"""
+
+ADD_SCRIPT = """
+import sys
+from ats_engine import ATSEngine
+from talent_pool import TalentPool
+pool = TalentPool(ATSEngine(), sys.argv[1])
+pool.add(ATSEngine().parse_resume(sys.stdin.read()), source='resume.txt')
+print(pool.count())
+"""
+
+
+def run_with_seed(script, seed, *args):
+    env = dict(os.environ, PYTHONHASHSEED=str(seed))
+    result = subprocess.run([sys.executable, '-c', script] + list(args), input=RESUME, env=env,
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+def test_content_hash_ignores_hash_seed():
+    hashes = {run_with_seed(HASH_SCRIPT, seed) for seed in (1, 2)}
+    assert len(hashes) == 1, hashes
+
+
+def test_readding_from_another_process_is_deduplicated():
+    with tempfile.TemporaryDirectory() as directory:
+        db_file = os.path.join(directory, 'pool.db')
+        counts = [run_with_seed(ADD_SCRIPT, seed, db_file) for seed in (1, 2)]
+    assert counts == ['1', '1'], counts
+
+
+def test_older_pool_is_rehashed_and_merged():
+    from ats_engine import ATSEngine
+    from talent_pool import TalentPool
+    
+    engine = ATSEngine()
+    resume = engine.parse_resume(RESUME)
+    with tempfile.TemporaryDirectory() as directory:
+        db_file = os.path.join(directory, 'pool.db')
+        pool = TalentPool(engine, db_file)
+        pool.add(resume)
+        # Simulate a copy stored by a worker whose old hash disagreed
+        data = json.loads(pool.conn.execute("SELECT data FROM resumes").fetchone()[0])
+        data['keywords'] = list(reversed(data['keywords']))
+        pool.conn.execute("INSERT INTO resumes (content_hash, added_at, data) VALUES ('old', '', ?)",
+                          (json.dumps(data),))
+        pool.conn.execute("PRAGMA user_version = 0")
+        pool.conn.close()
+        
+        pool = TalentPool(engine, db_file)
+        assert pool.count() == 1
+        assert pool.add(resume)['added'] is False
+        pool.conn.close()
+
+
+if __name__ == '__main__':
+    test_content_hash_ignores_hash_seed()
+    test_readding_from_another_process_is_deduplicated()
+    test_older_pool_is_rehashed_and_merged()
+    print("✅ Talent pool tests passed")
@@ -0,0 +1,179 @@
+"""
+Workload Capture
+
+Optionally records the shape of each analysis request to a JSONL workload
+log, so load tests can replay realistic traffic (python -m benchmarks
+replay). Nothing a candidate or recruiter typed or uploaded is stored:
+an entry holds the endpoint, status, latency, each file's type, size and
+PDF page count, the JD length, a few non-identifying options (stages,
+screening_pages, limit...) and keyed hashes of the file and JD contents,
+so repeated uploads of the same document can be recognized without the
+hash revealing it.
+
+Enable it with WORKLOAD_LOG=<path> (or WORKLOAD_LOG=1 for
+data/workload/workload.jsonl). The log rotates at WORKLOAD_LOG_MAX_MB
+(default 20) keeping WORKLOAD_LOG_BACKUPS old files (default 5). The hash
+key is read from WORKLOAD_HASH_KEY, or generated once into a .key file
+next to the log.
+"""
+
+import hashlib
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: rotation is not coordinated between processes
+    fcntl = None
+
+# Endpoint -> options worth replaying (never free text)
+CAPTURED_ENDPOINTS = {
+    'analyze_resume': ('stages',),
+    'bulk_analyze_resumes': ('screening_pages', 'add_to_pool', 'dedupe'),
+    'search_talent_pool': ('limit', 'min_matched'),
+    'add_to_talent_pool': (),
+}
+
+_PDF_PAGE = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+
+
+def load_hash_key(key_file: str) -> str:
+    """Key stored in key_file, created on first use and shared by every worker"""
+    try:
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        for _ in range(50):
+            with open(key_file, 'r', encoding='utf-8') as f:
+                key = f.read().strip()
+            if key:
+                return key
+            # Another worker created the file and is writing it
+            time.sleep(0.01)
+        raise RuntimeError(f"Hash key file {key_file} is empty")
+    key = secrets.token_hex(32)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(key)
+    return key
+
+
+def content_hasher(key: bytes):
+    """Keyed BLAKE2b for content references: equal for equal content, useless without the key"""
+    return hashlib.blake2b(key=key[:64], digest_size=12)
+
+
+class WorkloadRecorder:
+    """Appends anonymized request shapes to a rotating JSONL log"""
+    
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None, backups: Optional[int] = None,
+                 hash_key: Optional[str] = None):
+        """
+        Args:
+            path: Log file; defaults to WORKLOAD_LOG (None: recording is off)
+            max_bytes: Size at which the log rotates
+            backups: Rotated files kept (<path>.1 is the newest)
+            hash_key: Key for content hashes (default WORKLOAD_HASH_KEY or a key file)
+        """
+        if path is None:
+            path = os.environ.get('WORKLOAD_LOG', '')
+            if path.lower() in ('1', 'true', 'yes'):
+                base_dir = os.path.dirname(os.path.abspath(__file__))
+                path = os.path.join(base_dir, 'data', 'workload', 'workload.jsonl')
+        self.path = path or None
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('WORKLOAD_LOG_MAX_MB', 20)) * 1024 * 1024)
+        if backups is None:
+            backups = int(os.environ.get('WORKLOAD_LOG_BACKUPS', 5))
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.lock = threading.Lock()
+        self._key = None
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._key = (hash_key or os.environ.get('WORKLOAD_HASH_KEY') or load_hash_key(self.path + '.key')).encode('utf-8')
+    
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+    
+    def content_ref(self, data: bytes) -> str:
+        """Keyed hash of content: equal for equal content, useless without the key"""
+        hasher = content_hasher(self._key)
+        hasher.update(data)
+        return hasher.hexdigest()
+    
+    def describe_file(self, file_storage) -> Dict:
+        """Type, size, page count (PDF) and content reference of an upload"""
+        stream = file_storage.stream
+        position = stream.tell()
+        stream.seek(0)
+        data = stream.read()
+        stream.seek(position)
+        extension = os.path.splitext(file_storage.filename or '')[1].lower().lstrip('.')
+        return {
+            'type': extension or 'none',
+            'bytes': len(data),
+            'pages': len(_PDF_PAGE.findall(data)) if extension == 'pdf' else None,
+            'ref': self.content_ref(data),
+        }
+    
+    def describe_request(self, request, endpoint: str) -> Dict:
+        """Shape of a Flask request to one of CAPTURED_ENDPOINTS"""
+        data = request.get_json(silent=True) if request.is_json else None
+        values = data if isinstance(data, dict) else request.form
+        jd_text = str(values.get('jd_text', '') or '')
+        entry = {
+            'endpoint': endpoint,
+            'path': request.url_rule.rule if request.url_rule is not None else request.path,
+            'method': request.method,
+            'content': 'json' if data is not None else 'form',
+            'files': [self.describe_file(f) for f in request.files.getlist(
+                'resume_files' if 'resume_files' in request.files else 'resume_file') if f.filename],
+            'jd_chars': len(jd_text),
+            'jd_ref': self.content_ref(jd_text.encode('utf-8')) if jd_text else None,
+            'options': {key: str(values[key]) for key in CAPTURED_ENDPOINTS[endpoint] if key in values},
+        }
+        return entry
+    
+    def record(self, entry: Dict):
+        """Append one entry, rotating the log when it is full"""
+        if not self.enabled:
+            return
+        line = (json.dumps(entry, separators=(',', ':'), sort_keys=True) + '\n').encode('utf-8')
+        with self.lock:
+            # O_APPEND writes of one short line do not interleave between workers
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+            if size >= self.max_bytes:
+                self._rotate()
+    
+    def _rotate(self):
+        lock_fd = os.open(self.path + '.lock', os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            try:
+                # Another process may have rotated while this one waited
+                if os.path.getsize(self.path) < self.max_bytes:
+                    return
+            except FileNotFoundError:
+                return
+            if self.backups <= 0:
+                os.remove(self.path)
+                return
+            for index in range(self.backups - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, self.path + '.1')
+        finally:
+            os.close(lock_fd)